@@ -14,6 +14,7 @@ Tables:
 - tests: Test progress (migrated from JSON)
 - events: Event bus messages
 - subscriptions: Event subscriptions
+- subscription_event_types: Event types per subscription
 - file_locks: File locking for conflict prevention
 - wait_graph: Deadlock detection graph
 - knowledge: Cross-agent knowledge base
@@ -35,6 +36,9 @@ from .init_db import (
     verify_schema,
     get_connection,
     transaction,
+    fetch_all,
+    fetch_one,
+    close_readonly_connection,
     execute_with_retry,
     DatabaseConnection,
     ensure_initialized,
@@ -75,6 +79,7 @@ from .models import (
 from .queries import (
     generate_id,
     now_iso,
+    clear_query_cache,
     LoopQueries,
     TestQueries,
     EventQueries,
@@ -92,6 +97,9 @@ __all__ = [
     "verify_schema",
     "get_connection",
     "transaction",
+    "fetch_all",
+    "fetch_one",
+    "close_readonly_connection",
     "execute_with_retry",
     "DatabaseConnection",
     "ensure_initialized",
@@ -125,6 +133,7 @@ __all__ = [
     # Queries
     "generate_id",
     "now_iso",
+    "clear_query_cache",
     "LoopQueries",
     "TestQueries",
     "EventQueries",
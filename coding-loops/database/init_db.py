@@ -15,6 +15,7 @@ Usage:
         cursor = conn.execute("SELECT * FROM loops")
 """
 
+import re
 import sqlite3
 from contextlib import contextmanager
 from pathlib import Path
@@ -33,6 +34,11 @@ _local = threading.local()
 # Schema file path
 SCHEMA_PATH = Path(__file__).parent / "schema.sql"
 
+# Per-connection prepared statement cache. Long-lived connections (the
+# per-thread readers, DatabaseConnection) see every hot query; the sqlite3
+# default of 128 can evict them once dynamic filter shapes are mixed in.
+CACHED_STATEMENTS = 512
+
 
 def get_db_path() -> Path:
     """Get the database path, respecting environment overrides."""
@@ -44,6 +50,27 @@ def get_db_path() -> Path:
     return DEFAULT_DB_PATH
 
 
+def _sql_trace_enabled() -> bool:
+    """Whether COORDINATION_DB_TRACE asks for every SQL statement to be logged."""
+    import os
+
+    return os.environ.get("COORDINATION_DB_TRACE", "").lower() in ("1", "true", "yes")
+
+
+def _configure_connection(conn: sqlite3.Connection) -> None:
+    """Apply the per-connection settings shared by every connection helper."""
+    conn.row_factory = sqlite3.Row  # Return rows as dict-like objects
+    conn.execute("PRAGMA foreign_keys = ON")
+    # Under WAL, NORMAL only syncs at checkpoints: commits skip the fsync
+    # but stay durable across application crashes.
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    if _sql_trace_enabled():
+        # Logs each statement as executed; handy for checking that hot
+        # queries reuse a small, fixed set of SQL strings.
+        conn.set_trace_callback(lambda sql: logger.debug("SQL: %s", sql))
+
+
 def init_database(db_path: Optional[Path] = None, force: bool = False) -> None:
     """
     Initialize the database schema.
@@ -83,6 +110,7 @@ def init_database(db_path: Optional[Path] = None, force: bool = False) -> None:
         # Read and execute schema
         schema_sql = schema_path.read_text()
         conn.executescript(schema_sql)
+        conn.execute("ANALYZE")
         conn.commit()
 
         # Verify tables exist
@@ -109,7 +137,8 @@ def verify_schema(db_path: Optional[Path] = None) -> dict:
         return {"valid": False, "tables": [], "error": "Database file does not exist"}
 
     expected_tables = {
-        "loops", "tests", "events", "subscriptions", "file_locks",
+        "loops", "tests", "events", "subscriptions",
+        "subscription_event_types", "file_locks",
         "wait_graph", "knowledge", "resources", "change_requests",
         "migrations", "checkpoints", "passing_tests", "decisions",
         "usage", "component_health", "alerts", "transaction_log"
@@ -135,8 +164,36 @@ def verify_schema(db_path: Optional[Path] = None) -> dict:
         conn.close()
 
 
+def _connect(
+    db_path: Path,
+    isolation_level: Optional[str] = None,
+    readonly: bool = False
+) -> sqlite3.Connection:
+    """Open and configure a connection (see get_connection for readonly)."""
+    if readonly:
+        conn = sqlite3.connect(
+            f"{Path(db_path).resolve().as_uri()}?mode=ro",
+            isolation_level=isolation_level,
+            cached_statements=CACHED_STATEMENTS,
+            uri=True
+        )
+        conn.execute("PRAGMA query_only = 1")
+    else:
+        conn = sqlite3.connect(
+            str(db_path),
+            isolation_level=isolation_level,
+            cached_statements=CACHED_STATEMENTS
+        )
+    _configure_connection(conn)
+    return conn
+
+
 @contextmanager
-def get_connection(db_path: Optional[Path] = None, isolation_level: Optional[str] = None):
+def get_connection(
+    db_path: Optional[Path] = None,
+    isolation_level: Optional[str] = None,
+    readonly: bool = False
+):
     """
     Get a database connection with proper configuration.
 
@@ -145,6 +202,9 @@ def get_connection(db_path: Optional[Path] = None, isolation_level: Optional[str
     Args:
         db_path: Path to the database file. If None, uses default.
         isolation_level: SQLite isolation level. None for autocommit.
+        readonly: Open the file with mode=ro and PRAGMA query_only so the
+            connection can never take the write lock. Under WAL such
+            readers do not block, and are not blocked by, the writer.
 
     Yields:
         sqlite3.Connection object
@@ -155,13 +215,7 @@ def get_connection(db_path: Optional[Path] = None, isolation_level: Optional[str
             conn.commit()
     """
     db_path = db_path or get_db_path()
-
-    # Create connection
-    conn = sqlite3.connect(str(db_path), isolation_level=isolation_level)
-    conn.row_factory = sqlite3.Row  # Return rows as dict-like objects
-
-    # Configure connection
-    conn.execute("PRAGMA foreign_keys = ON")
+    conn = _connect(db_path, isolation_level, readonly)
 
     try:
         yield conn
@@ -187,8 +241,7 @@ def transaction(db_path: Optional[Path] = None):
     db_path = db_path or get_db_path()
 
     conn = sqlite3.connect(str(db_path), isolation_level="IMMEDIATE")
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
+    _configure_connection(conn)
 
     try:
         yield conn
@@ -200,6 +253,54 @@ def transaction(db_path: Optional[Path] = None):
         conn.close()
 
 
+def _thread_readonly_connection(db_path: Optional[Path]) -> sqlite3.Connection:
+    """
+    Get this thread's persistent read-only connection for db_path.
+
+    Each thread keeps at most one such connection; asking for a different
+    database closes the previous one.
+    """
+    db_path = Path(db_path or get_db_path())
+    conn = getattr(_local, "readonly_conn", None)
+    if conn is not None and _local.readonly_path == db_path:
+        return conn
+    close_readonly_connection()
+    _local.readonly_conn = _connect(db_path, readonly=True)
+    _local.readonly_path = db_path
+    return _local.readonly_conn
+
+
+def close_readonly_connection() -> None:
+    """Close the calling thread's persistent read-only connection, if any."""
+    conn = getattr(_local, "readonly_conn", None)
+    if conn is not None:
+        conn.close()
+    _local.readonly_conn = None
+    _local.readonly_path = None
+
+
+def fetch_all(query: str, params: tuple = (), db_path: Optional[Path] = None) -> list:
+    """
+    Run a single read-only statement and return all rows.
+
+    Reuses a per-thread read-only connection instead of opening one per
+    call, for hot single-statement reads. Use get_connection/transaction
+    when several statements must run together.
+    """
+    return _thread_readonly_connection(db_path).execute(query, params).fetchall()
+
+
+def fetch_one(query: str, params: tuple = (), db_path: Optional[Path] = None):
+    """Run a single read-only statement and return its first row or None."""
+    cursor = _thread_readonly_connection(db_path).execute(query, params)
+    try:
+        return cursor.fetchone()
+    finally:
+        # Reset the statement so the connection does not hold a read
+        # snapshot open between calls.
+        cursor.close()
+
+
 def execute_with_retry(
     query: str,
     params: tuple = (),
@@ -262,9 +363,11 @@ class DatabaseConnection:
     def _get_conn(self) -> sqlite3.Connection:
         """Get or create connection."""
         if self._conn is None:
-            self._conn = sqlite3.connect(str(self.db_path))
-            self._conn.row_factory = sqlite3.Row
-            self._conn.execute("PRAGMA foreign_keys = ON")
+            self._conn = sqlite3.connect(
+                str(self.db_path),
+                    cached_statements=CACHED_STATEMENTS
+            )
+            _configure_connection(self._conn)
         return self._conn
 
     def query(self, sql: str, params: tuple = ()) -> list:
@@ -329,9 +432,77 @@ def ensure_initialized(db_path: Optional[Path] = None) -> bool:
         init_database(db_path)
         return False
 
+    _ensure_wal(db_path)
+    _ensure_schema_objects(db_path)
     return True
 
 
+# Index and trigger statements in schema.sql, with the object name in
+# group 1 (indexes, drops) or group 2 (triggers, whose bodies contain ';').
+_SCHEMA_OBJECT_DDL = re.compile(
+    r"^(?:CREATE INDEX IF NOT EXISTS|DROP (?:INDEX|TRIGGER) IF EXISTS) (\w+)[^;]*;"
+    r"|^CREATE TRIGGER IF NOT EXISTS (\w+).*?^END;",
+    re.MULTILINE | re.DOTALL
+)
+
+
+def _ensure_schema_objects(db_path: Path) -> None:
+    """
+    Bring an existing database's indexes and triggers in line with schema.sql.
+
+    The tables of an already-valid database are left alone, but indexes
+    and triggers added to (or dropped from) the schema since the
+    file was created are applied here, followed by ANALYZE so the planner
+    has statistics for new indexes. Nothing is written when they already
+    match.
+    """
+    conn = sqlite3.connect(str(db_path), isolation_level=None)
+    try:
+        existing = {
+            row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger')"
+            )
+        }
+        pending = [
+            m.group(0)
+            for m in _SCHEMA_OBJECT_DDL.finditer(SCHEMA_PATH.read_text())
+            if ((m.group(1) or m.group(2)) in existing) == m.group(0).startswith("DROP")
+        ]
+        if not pending:
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for statement in pending:
+                conn.execute(statement)
+            conn.execute("ANALYZE")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        logger.info(f"Applied {len(pending)} index/trigger changes to {db_path}")
+    finally:
+        conn.close()
+
+
+def _ensure_wal(db_path: Path) -> None:
+    """
+    Switch an existing database to WAL if it is not already.
+
+    init_database sets WAL on the databases it creates; this covers files
+    created by other tools. journal_mode is persistent, so it only has to
+    change once per file.
+    """
+    conn = sqlite3.connect(str(db_path))
+    try:
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        if mode != "wal":
+            conn.execute("PRAGMA journal_mode = WAL")
+            logger.info(f"Switched {db_path} from {mode} to WAL journaling")
+    finally:
+        conn.close()
+
+
 if __name__ == "__main__":
     # CLI for database initialization
     import sys
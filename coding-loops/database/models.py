@@ -17,6 +17,25 @@ from typing import Optional, List
 from enum import Enum
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_dumps(obj) -> str:
+    """Serialize a JSON column value, with orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj)
+
+
+def json_loads(data):
+    """Parse a JSON column value (str or bytes), with orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class LoopStatus(str, Enum):
     """Valid statuses for a loop."""
@@ -143,10 +162,11 @@ class Test:
     @classmethod
     def from_row(cls, row: dict) -> "Test":
         """Create from database row."""
-        row_copy = dict(row)
-        if "automatable" in row_copy:
-            row_copy["automatable"] = bool(row_copy["automatable"])
-        return cls(**{k: v for k, v in row_copy.items() if k in cls.__dataclass_fields__})
+        fields = cls.__dataclass_fields__
+        kwargs = {k: v for k, v in row.items() if k in fields}
+        if "automatable" in kwargs:
+            kwargs["automatable"] = bool(kwargs["automatable"])
+        return cls(**kwargs)
 
 
 @dataclass
@@ -166,19 +186,21 @@ class Event:
     def to_dict(self) -> dict:
         """Convert to dictionary for database insertion."""
         d = asdict(self)
-        d["payload"] = json.dumps(self.payload)
+        d["payload"] = json_dumps(self.payload)
         d["acknowledged"] = 1 if self.acknowledged else 0
         return {k: v for k, v in d.items() if v is not None}
 
     @classmethod
     def from_row(cls, row: dict) -> "Event":
         """Create from database row."""
-        row_copy = dict(row)
-        if "payload" in row_copy and isinstance(row_copy["payload"], str):
-            row_copy["payload"] = json.loads(row_copy["payload"])
-        if "acknowledged" in row_copy:
-            row_copy["acknowledged"] = bool(row_copy["acknowledged"])
-        return cls(**{k: v for k, v in row_copy.items() if k in cls.__dataclass_fields__})
+        fields = cls.__dataclass_fields__
+        kwargs = {k: v for k, v in row.items() if k in fields}
+        payload = kwargs.get("payload")
+        if isinstance(payload, str):
+            kwargs["payload"] = json_loads(payload)
+        if "acknowledged" in kwargs:
+            kwargs["acknowledged"] = bool(kwargs["acknowledged"])
+        return cls(**kwargs)
 
 
 @dataclass
@@ -210,7 +232,7 @@ class Subscription:
         row_copy = dict(row)
         if "event_types" in row_copy and isinstance(row_copy["event_types"], str):
             row_copy["event_types"] = json.loads(row_copy["event_types"])
-        if "filter_sources" in row_copy and row_copy["filter_sources"]:
+        if row_copy.get("filter_sources") and isinstance(row_copy["filter_sources"], str):
             row_copy["filter_sources"] = json.loads(row_copy["filter_sources"])
         if "active" in row_copy:
             row_copy["active"] = bool(row_copy["active"])
@@ -272,7 +294,7 @@ class Knowledge:
     def from_row(cls, row: dict) -> "Knowledge":
         """Create from database row."""
         row_copy = dict(row)
-        if "affected_areas" in row_copy and row_copy["affected_areas"]:
+        if row_copy.get("affected_areas") and isinstance(row_copy["affected_areas"], str):
             row_copy["affected_areas"] = json.loads(row_copy["affected_areas"])
         return cls(**{k: v for k, v in row_copy.items() if k in cls.__dataclass_fields__})
 
@@ -373,7 +395,7 @@ class Decision:
         row_copy = dict(row)
         if "options" in row_copy and isinstance(row_copy["options"], str):
             row_copy["options"] = json.loads(row_copy["options"])
-        if "context" in row_copy and row_copy["context"]:
+        if row_copy.get("context") and isinstance(row_copy["context"], str):
             row_copy["context"] = json.loads(row_copy["context"])
         return cls(**{k: v for k, v in row_copy.items() if k in cls.__dataclass_fields__})
 
@@ -400,7 +422,7 @@ class Usage:
     def from_row(cls, row: dict) -> "Usage":
         """Create from database row."""
         row_copy = dict(row)
-        if "files_modified" in row_copy and row_copy["files_modified"]:
+        if row_copy.get("files_modified") and isinstance(row_copy["files_modified"], str):
             row_copy["files_modified"] = json.loads(row_copy["files_modified"])
         return cls(**{k: v for k, v in row_copy.items() if k in cls.__dataclass_fields__})
 
@@ -424,7 +446,7 @@ class ComponentHealth:
     def from_row(cls, row: dict) -> "ComponentHealth":
         """Create from database row."""
         row_copy = dict(row)
-        if "metadata" in row_copy and row_copy["metadata"]:
+        if row_copy.get("metadata") and isinstance(row_copy["metadata"], str):
             row_copy["metadata"] = json.loads(row_copy["metadata"])
         return cls(**{k: v for k, v in row_copy.items() if k in cls.__dataclass_fields__})
 
@@ -455,7 +477,7 @@ class Alert:
     def from_row(cls, row: dict) -> "Alert":
         """Create from database row."""
         row_copy = dict(row)
-        if "context" in row_copy and row_copy["context"]:
+        if row_copy.get("context") and isinstance(row_copy["context"], str):
             row_copy["context"] = json.loads(row_copy["context"])
         if "acknowledged" in row_copy:
             row_copy["acknowledged"] = bool(row_copy["acknowledged"])
@@ -14,29 +14,332 @@ Usage:
     test = TestQueries.get_next_for_loop("loop-1")
 """
 
-from datetime import datetime, timedelta, timezone
+from datetime import datetime
 from pathlib import Path
-from typing import Optional, List
+from typing import Any, Dict, Hashable, Optional, List, Tuple
+from contextlib import nullcontext
+from dataclasses import fields
+import atexit
+import copy
+import functools
+import threading
+import time
 import uuid
 import json
+import logging
+import sqlite3
 
-from .init_db import get_connection, transaction, get_db_path
+from .init_db import get_connection, transaction, get_db_path, fetch_one, fetch_all
 from .models import (
     Loop, Test, Event, Subscription, FileLock,
     Knowledge, Resource, ChangeRequest, Checkpoint,
     Decision, Usage, ComponentHealth, Alert, Migration,
-    LoopStatus, TestStatus
+    LoopStatus, TestStatus, json_dumps
 )
 
+logger = logging.getLogger(__name__)
 
-def now_iso() -> str:
-    """Get current UTC time in ISO format."""
-    return datetime.now(timezone.utc).isoformat()
+
+# (second, "YYYY-MM-DDTHH:MM:SS") of the last timestamp formatted
+_last_second = (-1, "")
+
+
+def now_iso(offset_seconds: float = 0, suffix: str = "+00:00") -> str:
+    """
+    Get current UTC time in ISO format, optionally shifted by
+    ``offset_seconds`` (e.g. a lock's expiry or a cleanup cutoff).
+
+    Matches datetime.now(timezone.utc).isoformat(), except microseconds
+    are always present so timestamps compare correctly as strings; use it
+    for every timestamp that is compared with one it wrote. The date and
+    time part is only formatted once per second. Pass ``suffix="Z"`` for
+    the ``...Z`` form used by the observability tables.
+    """
+    global _last_second
+    seconds, nanos = divmod(
+        time.time_ns() + round(offset_seconds * 1_000_000_000), 1_000_000_000
+    )
+    second, prefix = _last_second
+    if seconds != second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+        _last_second = (seconds, prefix)
+    return f"{prefix}.{nanos // 1000:06d}{suffix}"
 
 
 def generate_id() -> str:
-    """Generate a UUID for database records."""
-    return str(uuid.uuid4())
+    """
+    Generate a UUID for database records.
+
+    Uses the 32-character hex form (no dashes) to keep TEXT primary keys
+    and their indexes compact; uuid.UUID(value) still parses it.
+    """
+    return uuid.uuid4().hex
+
+
+class _TTLCache:
+    """
+    Small thread-safe cache whose entries expire after a fixed TTL.
+
+    Used to absorb repeated ID lookups within a single scheduler tick.
+    Writers in this module invalidate affected keys after they commit;
+    writes made outside these query classes become visible once the
+    TTL lapses.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, ttl_seconds: float = 0.5):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value, or _TTLCache._MISSING if absent/expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return self._MISSING
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return self._MISSING
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value for the configured TTL."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """Drop the given keys if present."""
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+_row_cache = _TTLCache(ttl_seconds=0.5)
+
+
+def _cache_key(table: str, db_path: Optional[Path], key: Hashable) -> tuple:
+    """Build a cache key scoped to the resolved database file."""
+    return (table, str(db_path or get_db_path()), key)
+
+
+def clear_query_cache() -> None:
+    """Clear the in-process lookup cache used by the query classes."""
+    _row_cache.clear()
+
+
+def _upsert_sql(table: str, columns: List[str], key: str, keep: Tuple[str, ...] = ()) -> str:
+    """
+    Build an INSERT ... ON CONFLICT DO UPDATE statement for a table.
+
+    Unlike INSERT OR REPLACE, the existing row is updated in place, so
+    its rowid, foreign-key children and any columns listed in keep are
+    left untouched.
+    """
+    updates = ", ".join(
+        f"{col} = excluded.{col}" for col in columns if col != key and col not in keep
+    )
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' * len(columns))}) "
+        f"ON CONFLICT({key}) DO UPDATE SET {updates}"
+    )
+
+
+# Lists longer than this are bound as a single JSON array parameter so the
+# number of distinct SQL strings (and statement cache entries) stays small.
+_MAX_INLINE_IN_PARAMS = 8
+
+
+def _in_list_params(values: Optional[List[str]], params: list) -> int:
+    """
+    Append an IN-list filter's parameters and return its shape.
+
+    Returns 0 for no filter, the list length for inline placeholders, or
+    -1 when the values were bound as one JSON array.
+    """
+    if not values:
+        return 0
+    if len(values) > _MAX_INLINE_IN_PARAMS:
+        params.append(json.dumps(list(values)))
+        return -1
+    params.extend(values)
+    return len(values)
+
+
+def _in_list_sql(column: str, shape: int) -> str:
+    """Render the IN-list predicate for a shape from _in_list_params."""
+    if shape == -1:
+        return f"{column} IN (SELECT value FROM json_each(?))"
+    return f"{column} IN ({', '.join('?' * shape)})"
+
+
+@functools.lru_cache(maxsize=64)
+def _timeline_sql(has_since: bool, has_until: bool, n_sources: int, n_types: int) -> str:
+    """Build (once per filter shape) the SQL for EventQueries.get_timeline."""
+    predicates = []
+    if has_since:
+        predicates.append("timestamp >= ?")
+    if has_until:
+        predicates.append("timestamp <= ?")
+    if n_sources:
+        predicates.append(_in_list_sql("source", n_sources))
+    if n_types:
+        predicates.append(_in_list_sql("event_type", n_types))
+
+    query = "SELECT * FROM events"
+    if predicates:
+        query += " WHERE " + " AND ".join(predicates)
+    return query + " ORDER BY timestamp DESC LIMIT ?"
+
+
+@functools.lru_cache(maxsize=16)
+def _poll_sql(n_types: int) -> str:
+    """Build (once per filter shape) the SQL for EventQueries.poll."""
+    type_filter = f"AND {_in_list_sql('e.event_type', n_types)}" if n_types else ""
+    return f"""SELECT e.* FROM events e
+               WHERE e.acknowledged = 0
+                 {type_filter}
+                 AND EXISTS (
+                     SELECT 1
+                     FROM subscriptions s
+                     JOIN subscription_event_types t ON t.subscription_id = s.id
+                     WHERE s.subscriber = ?
+                       AND s.active = 1
+                       AND t.event_type = e.event_type
+                       AND (s.filter_sources IS NULL
+                            OR EXISTS (SELECT 1 FROM json_each(s.filter_sources)
+                                       WHERE value = e.source))
+                 )
+               ORDER BY e.priority, e.timestamp
+               LIMIT ?"""
+
+
+@functools.lru_cache(maxsize=8)
+def _knowledge_sql(has_topic: bool, has_item_type: bool, has_loop_id: bool) -> str:
+    """Build (once per filter shape) the SQL for KnowledgeQueries.query."""
+    predicates = ["superseded_by IS NULL"]
+    if has_topic:
+        predicates.append("topic = ?")
+    if has_item_type:
+        predicates.append("item_type = ?")
+    if has_loop_id:
+        predicates.append("loop_id = ?")
+    return (
+        "SELECT * FROM knowledge WHERE " + " AND ".join(predicates)
+        + " ORDER BY created_at DESC LIMIT ?"
+    )
+
+
+# Fixed-shape hot queries, kept as constants so every call reuses the
+# same statement text.
+_SQL_TESTS_BY_STATUS = "SELECT * FROM tests WHERE status = ?"
+_SQL_TESTS_BY_STATUS_AND_LOOP = "SELECT * FROM tests WHERE status = ? AND loop_id = ?"
+_SQL_STALE_COMPONENTS = "SELECT * FROM component_health WHERE last_heartbeat < ?"
+_SQL_ACKNOWLEDGE_EVENT = (
+    "UPDATE events SET acknowledged = 1, acknowledged_by = ?, acknowledged_at = ? "
+    "WHERE id = ?"
+)
+
+_LOOP_COLUMNS = [f.name for f in fields(Loop)]
+_TEST_COLUMNS = [f.name for f in fields(Test)]
+_LOOP_UPSERT_SQL = _upsert_sql("loops", _LOOP_COLUMNS, "id", keep=("created_at",))
+_TEST_UPSERT_SQL = _upsert_sql("tests", _TEST_COLUMNS, "id", keep=("created_at",))
+
+# Columns a new event is written with; acknowledgement fields keep their
+# schema defaults. Fixed so single and batch publishes share one statement.
+_EVENT_INSERT_COLUMNS = (
+    "id", "timestamp", "source", "event_type", "payload", "correlation_id", "priority"
+)
+_EVENT_INSERT_SQL = (
+    f"INSERT INTO events ({', '.join(_EVENT_INSERT_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(_EVENT_INSERT_COLUMNS))})"
+)
+
+
+def _new_event_row(
+    source: str,
+    event_type: str,
+    payload: dict,
+    priority: int = 5,
+    correlation_id: Optional[str] = None,
+    timestamp: Optional[str] = None
+) -> tuple:
+    """Build the _EVENT_INSERT_COLUMNS row for a new event."""
+    return (
+        generate_id(), timestamp or now_iso(), source, event_type,
+        json_dumps(payload), correlation_id, priority
+    )
+
+
+class _PollTimeBatcher:
+    """
+    Collects subscription last_poll_at updates and writes them in batches.
+
+    Each poll records its timestamp in memory; once flush_interval has
+    passed since a database was last flushed, the pending timestamps for
+    that database are written with a single executemany. Anything still
+    pending at interpreter exit is flushed by an atexit hook.
+    """
+
+    def __init__(self, flush_interval: float = 5.0):
+        self.flush_interval = flush_interval
+        self._pending: Dict[str, Dict[str, str]] = {}
+        self._last_flush: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, db_path: Path, subscriber: str, polled_at: str) -> Dict[str, Dict[str, str]]:
+        """Record a poll. Returns pending updates that are due for writing."""
+        key = str(db_path)
+        now = time.monotonic()
+        with self._lock:
+            self._pending.setdefault(key, {})[subscriber] = polled_at
+            if now - self._last_flush.get(key, 0.0) < self.flush_interval:
+                return {}
+            self._last_flush[key] = now
+            return {key: self._pending.pop(key)}
+
+    def take(self, db_path: Optional[Path] = None) -> Dict[str, Dict[str, str]]:
+        """Remove and return pending updates for one database, or all."""
+        with self._lock:
+            if db_path is None:
+                taken, self._pending = self._pending, {}
+                return taken
+            key = str(db_path)
+            return {key: self._pending.pop(key)} if key in self._pending else {}
+
+    @staticmethod
+    def flush(pending: Dict[str, Dict[str, str]]) -> int:
+        """Write taken updates. Returns the number of subscribers updated."""
+        count = 0
+        for key, updates in pending.items():
+            if not Path(key).exists():
+                continue
+            with transaction(Path(key)) as conn:
+                conn.executemany(
+                    "UPDATE subscriptions SET last_poll_at = ? WHERE subscriber = ?",
+                    [(polled_at, subscriber) for subscriber, polled_at in updates.items()]
+                )
+            count += len(updates)
+        return count
+
+
+_poll_times = _PollTimeBatcher()
+
+
+@atexit.register
+def _flush_poll_times_at_exit() -> None:
+    """Best-effort flush of pending last_poll_at updates on shutdown."""
+    try:
+        _poll_times.flush(_poll_times.take())
+    except sqlite3.Error as e:
+        logger.warning(f"Failed to flush subscription poll times: {e}")
 
 
 class LoopQueries:
@@ -45,42 +348,62 @@ class LoopQueries:
     @staticmethod
     def get_all(db_path: Optional[Path] = None) -> List[Loop]:
         """Get all registered loops."""
-        with get_connection(db_path) as conn:
+        with get_connection(db_path, readonly=True) as conn:
             rows = conn.execute("SELECT * FROM loops ORDER BY priority").fetchall()
             return [Loop.from_row(dict(r)) for r in rows]
 
     @staticmethod
     def get_by_id(loop_id: str, db_path: Optional[Path] = None) -> Optional[Loop]:
-        """Get a loop by ID."""
-        with get_connection(db_path) as conn:
-            row = conn.execute(
-                "SELECT * FROM loops WHERE id = ?", (loop_id,)
-            ).fetchone()
-            return Loop.from_row(dict(row)) if row else None
+        """Get a loop by ID (cached briefly, see _TTLCache)."""
+        key = _cache_key("loops", db_path, loop_id)
+        cached = _row_cache.get(key)
+        if cached is not _TTLCache._MISSING:
+            return copy.copy(cached)
+
+        row = fetch_one("SELECT * FROM loops WHERE id = ?", (loop_id,), db_path)
+        loop = Loop.from_row(dict(row)) if row else None
+
+        _row_cache.set(key, loop)
+        return copy.copy(loop)
 
     @staticmethod
     def get_running(db_path: Optional[Path] = None) -> List[Loop]:
-        """Get all running loops."""
-        with get_connection(db_path) as conn:
-            rows = conn.execute(
-                "SELECT * FROM loops WHERE status = ? ORDER BY priority",
-                (LoopStatus.RUNNING.value,)
-            ).fetchall()
-            return [Loop.from_row(dict(r)) for r in rows]
+        """Get all running loops (cached briefly, see _TTLCache)."""
+        key = _cache_key("loops", db_path, "running")
+        cached = _row_cache.get(key)
+        if cached is not _TTLCache._MISSING:
+            return [copy.copy(loop) for loop in cached]
+
+        rows = fetch_all(
+            "SELECT * FROM loops WHERE status = ? ORDER BY priority",
+            (LoopStatus.RUNNING.value,),
+            db_path
+        )
+        loops = [Loop.from_row(dict(r)) for r in rows]
+
+        _row_cache.set(key, loops)
+        return [copy.copy(loop) for loop in loops]
+
+    @staticmethod
+    def _invalidate(loop_id: str, db_path: Optional[Path]) -> None:
+        """Drop cached lookups affected by a write to one loop."""
+        _row_cache.invalidate(
+            _cache_key("loops", db_path, loop_id),
+            _cache_key("loops", db_path, "running"),
+        )
 
     @staticmethod
     def register(loop: Loop, db_path: Optional[Path] = None) -> None:
-        """Register a new loop."""
+        """Register a loop, updating it in place if it already exists."""
         with transaction(db_path) as conn:
             data = loop.to_dict()
             data["created_at"] = now_iso()
             data["updated_at"] = now_iso()
-            columns = ", ".join(data.keys())
-            placeholders = ", ".join("?" * len(data))
             conn.execute(
-                f"INSERT OR REPLACE INTO loops ({columns}) VALUES ({placeholders})",
-                tuple(data.values())
+                _LOOP_UPSERT_SQL,
+                tuple(data.get(col) for col in _LOOP_COLUMNS)
             )
+        LoopQueries._invalidate(loop.id, db_path)
 
     @staticmethod
     def update_status(
@@ -98,6 +421,7 @@ class LoopQueries:
                    WHERE id = ?""",
                 (status, current_test_id, pid, now_iso(), loop_id)
             )
+        LoopQueries._invalidate(loop_id, db_path)
 
     @staticmethod
     def set_branch(loop_id: str, branch: str, db_path: Optional[Path] = None) -> None:
@@ -107,6 +431,7 @@ class LoopQueries:
                 "UPDATE loops SET branch = ?, updated_at = ? WHERE id = ?",
                 (branch, now_iso(), loop_id)
             )
+        LoopQueries._invalidate(loop_id, db_path)
 
 
 class TestQueries:
@@ -115,7 +440,7 @@ class TestQueries:
     @staticmethod
     def get_all_for_loop(loop_id: str, db_path: Optional[Path] = None) -> List[Test]:
         """Get all tests for a loop."""
-        with get_connection(db_path) as conn:
+        with get_connection(db_path, readonly=True) as conn:
             rows = conn.execute(
                 "SELECT * FROM tests WHERE loop_id = ? ORDER BY id",
                 (loop_id,)
@@ -124,12 +449,22 @@ class TestQueries:
 
     @staticmethod
     def get_by_id(test_id: str, db_path: Optional[Path] = None) -> Optional[Test]:
-        """Get a test by ID."""
-        with get_connection(db_path) as conn:
-            row = conn.execute(
-                "SELECT * FROM tests WHERE id = ?", (test_id,)
-            ).fetchone()
-            return Test.from_row(dict(row)) if row else None
+        """Get a test by ID (cached briefly, see _TTLCache)."""
+        key = _cache_key("tests", db_path, test_id)
+        cached = _row_cache.get(key)
+        if cached is not _TTLCache._MISSING:
+            return copy.copy(cached)
+
+        row = fetch_one("SELECT * FROM tests WHERE id = ?", (test_id,), db_path)
+        test = Test.from_row(dict(row)) if row else None
+
+        _row_cache.set(key, test)
+        return copy.copy(test)
+
+    @staticmethod
+    def _invalidate(test_id: str, db_path: Optional[Path]) -> None:
+        """Drop the cached lookup for one test."""
+        _row_cache.invalidate(_cache_key("tests", db_path, test_id))
 
     @staticmethod
     def get_next_for_loop(loop_id: str, db_path: Optional[Path] = None) -> Optional[Test]:
@@ -140,19 +475,19 @@ class TestQueries:
         - It has no depends_on, OR
         - The depends_on test has status 'passed'
         """
-        with get_connection(db_path) as conn:
-            row = conn.execute(
-                """SELECT t.*
-                   FROM tests t
-                   LEFT JOIN tests dep ON t.depends_on = dep.id
-                   WHERE t.loop_id = ?
-                     AND t.status = 'pending'
-                     AND (t.depends_on IS NULL OR dep.status = 'passed')
-                   ORDER BY t.id
-                   LIMIT 1""",
-                (loop_id,)
-            ).fetchone()
-            return Test.from_row(dict(row)) if row else None
+        row = fetch_one(
+            """SELECT t.*
+               FROM tests t
+               LEFT JOIN tests dep ON t.depends_on = dep.id
+               WHERE t.loop_id = ?
+                 AND t.status = 'pending'
+                 AND (t.depends_on IS NULL OR dep.status = 'passed')
+               ORDER BY t.id
+               LIMIT 1""",
+            (loop_id,),
+            db_path
+        )
+        return Test.from_row(dict(row)) if row else None
 
     @staticmethod
     def get_by_status(
@@ -161,31 +496,24 @@ class TestQueries:
         db_path: Optional[Path] = None
     ) -> List[Test]:
         """Get tests by status, optionally filtered by loop."""
-        with get_connection(db_path) as conn:
-            if loop_id:
-                rows = conn.execute(
-                    "SELECT * FROM tests WHERE status = ? AND loop_id = ?",
-                    (status, loop_id)
-                ).fetchall()
-            else:
-                rows = conn.execute(
-                    "SELECT * FROM tests WHERE status = ?",
-                    (status,)
-                ).fetchall()
-            return [Test.from_row(dict(r)) for r in rows]
+        if loop_id:
+            query, params = _SQL_TESTS_BY_STATUS_AND_LOOP, (status, loop_id)
+        else:
+            query, params = _SQL_TESTS_BY_STATUS, (status,)
+        rows = fetch_all(query, params, db_path)
+        return [Test.from_row(dict(r)) for r in rows]
 
     @staticmethod
     def register(test: Test, db_path: Optional[Path] = None) -> None:
-        """Register a new test."""
+        """Register a test, updating it in place if it already exists."""
         with transaction(db_path) as conn:
             data = test.to_dict()
             data["created_at"] = now_iso()
-            columns = ", ".join(data.keys())
-            placeholders = ", ".join("?" * len(data))
             conn.execute(
-                f"INSERT OR REPLACE INTO tests ({columns}) VALUES ({placeholders})",
-                tuple(data.values())
+                _TEST_UPSERT_SQL,
+                tuple(data.get(col) for col in _TEST_COLUMNS)
             )
+        TestQueries._invalidate(test.id, db_path)
 
     @staticmethod
     def update_status(
@@ -212,19 +540,20 @@ class TestQueries:
                 f"UPDATE tests SET {', '.join(updates)} WHERE id = ?",
                 tuple(values)
             )
+        TestQueries._invalidate(test_id, db_path)
 
     @staticmethod
     def increment_attempts(test_id: str, db_path: Optional[Path] = None) -> int:
         """Increment attempt count and return new value."""
         with transaction(db_path) as conn:
-            conn.execute(
-                "UPDATE tests SET attempts = attempts + 1, last_attempt_at = ? WHERE id = ?",
-                (now_iso(), test_id)
-            )
             row = conn.execute(
-                "SELECT attempts FROM tests WHERE id = ?", (test_id,)
+                """UPDATE tests SET attempts = attempts + 1, last_attempt_at = ?
+                   WHERE id = ?
+                   RETURNING attempts""",
+                (now_iso(), test_id)
             ).fetchone()
-            return row[0] if row else 0
+        TestQueries._invalidate(test_id, db_path)
+        return row[0] if row else 0
 
     @staticmethod
     def mark_verified(test_id: str, db_path: Optional[Path] = None) -> None:
@@ -234,23 +563,61 @@ class TestQueries:
                 "UPDATE tests SET verified_at = ? WHERE id = ?",
                 (now_iso(), test_id)
             )
+        TestQueries._invalidate(test_id, db_path)
 
     @staticmethod
     def get_summary(loop_id: Optional[str] = None, db_path: Optional[Path] = None) -> dict:
-        """Get test summary counts."""
-        with get_connection(db_path) as conn:
-            base_query = "SELECT status, COUNT(*) as count FROM tests"
+        """Get test summary counts, including a 'total' computed by SQLite."""
+        with get_connection(db_path, readonly=True) as conn:
             if loop_id:
                 rows = conn.execute(
-                    f"{base_query} WHERE loop_id = ? GROUP BY status",
-                    (loop_id,)
+                    """SELECT status, COUNT(*) AS count FROM tests
+                       WHERE loop_id = ? GROUP BY status
+                       UNION ALL
+                       SELECT 'total', COUNT(*) FROM tests WHERE loop_id = ?""",
+                    (loop_id, loop_id)
                 ).fetchall()
             else:
-                rows = conn.execute(f"{base_query} GROUP BY status").fetchall()
+                rows = conn.execute(
+                    """SELECT status, COUNT(*) AS count FROM tests GROUP BY status
+                       UNION ALL
+                       SELECT 'total', COUNT(*) FROM tests"""
+                ).fetchall()
+
+            return {r["status"]: r["count"] for r in rows}
+
+    @staticmethod
+    def get_summary_all_loops(db_path: Optional[Path] = None) -> Dict[str, Dict[str, int]]:
+        """
+        Get test summary counts for every loop in one query.
+
+        Returns:
+            Dict mapping loop_id to the same shape get_summary returns
+        """
+        with get_connection(db_path, readonly=True) as conn:
+            rows = conn.execute(
+                """SELECT loop_id, status, COUNT(*) AS count,
+                          SUM(COUNT(*)) OVER (PARTITION BY loop_id) AS total
+                   FROM tests
+                   GROUP BY loop_id, status"""
+            ).fetchall()
+
+        summaries: Dict[str, Dict[str, int]] = {}
+        for r in rows:
+            summary = summaries.setdefault(r["loop_id"], {"total": r["total"]})
+            summary[r["status"]] = r["count"]
+        return summaries
+
 
-            summary = {r["status"]: r["count"] for r in rows}
-            summary["total"] = sum(summary.values())
-            return summary
+def _writer(db_path: Optional[Path], conn: Optional[sqlite3.Connection]):
+    """
+    Context for a write: the caller's connection if one is given, else a
+    fresh transaction. A borrowed connection is neither committed nor
+    closed here, so several queries can share one enclosing transaction.
+    """
+    if conn is not None:
+        return nullcontext(conn)
+    return transaction(db_path)
 
 
 class EventQueries:
@@ -263,85 +630,110 @@ class EventQueries:
         payload: dict,
         priority: int = 5,
         correlation_id: Optional[str] = None,
-        db_path: Optional[Path] = None
+        db_path: Optional[Path] = None,
+        conn: Optional[sqlite3.Connection] = None
     ) -> str:
-        """Publish an event. Returns event ID."""
-        event = Event(
-            id=generate_id(),
-            timestamp=now_iso(),
-            source=source,
-            event_type=event_type,
-            payload=payload,
-            priority=priority,
-            correlation_id=correlation_id
-        )
-        with transaction(db_path) as conn:
-            data = event.to_dict()
-            columns = ", ".join(data.keys())
-            placeholders = ", ".join("?" * len(data))
-            conn.execute(
-                f"INSERT INTO events ({columns}) VALUES ({placeholders})",
-                tuple(data.values())
+        """
+        Publish an event. Returns event ID.
+
+        Pass ``conn`` to write inside an enclosing transaction.
+        """
+        row = _new_event_row(source, event_type, payload, priority, correlation_id)
+        with _writer(db_path, conn) as conn:
+            conn.execute(_EVENT_INSERT_SQL, row)
+        return row[0]
+
+    @staticmethod
+    def publish_batch(
+        events: List[Dict[str, Any]],
+        db_path: Optional[Path] = None,
+        conn: Optional[sqlite3.Connection] = None
+    ) -> List[str]:
+        """
+        Publish several events with one executemany. Returns event IDs.
+
+        Each dict needs source, event_type and payload, and may carry
+        priority and correlation_id. The whole batch shares one timestamp;
+        within it, insertion order is kept by rowid.
+        """
+        timestamp = now_iso()
+        rows = [
+            _new_event_row(
+                e["source"], e["event_type"], e["payload"],
+                e.get("priority", 5), e.get("correlation_id"), timestamp
             )
-        return event.id
+            for e in events
+        ]
+        with _writer(db_path, conn) as conn:
+            conn.executemany(_EVENT_INSERT_SQL, rows)
+        return [row[0] for row in rows]
 
     @staticmethod
     def poll(
         subscriber: str,
         limit: int = 10,
-        db_path: Optional[Path] = None
+        db_path: Optional[Path] = None,
+        event_types: Optional[List[str]] = None
     ) -> List[Event]:
-        """Poll for unacknowledged events for a subscriber."""
-        with get_connection(db_path) as conn:
-            # First, get subscriber's subscriptions
-            sub_rows = conn.execute(
-                """SELECT event_types, filter_sources
-                   FROM subscriptions
-                   WHERE subscriber = ? AND active = 1""",
-                (subscriber,)
-            ).fetchall()
+        """
+        Poll for unacknowledged events for a subscriber.
 
-            if not sub_rows:
-                return []
-
-            # Build event type and source filters
-            all_types = set()
-            filter_sources = None
-            for row in sub_rows:
-                types = json.loads(row["event_types"])
-                all_types.update(types)
-                if row["filter_sources"]:
-                    sources = json.loads(row["filter_sources"])
-                    filter_sources = sources if filter_sources is None else filter_sources
-
-            # Query events
-            type_placeholders = ", ".join("?" * len(all_types))
-            query = f"""SELECT * FROM events
-                        WHERE event_type IN ({type_placeholders})
-                          AND acknowledged = 0
-                        ORDER BY priority, timestamp
-                        LIMIT ?"""
-
-            params = list(all_types) + [limit]
-            rows = conn.execute(query, params).fetchall()
+        An event matches when any active subscription of the subscriber
+        lists its event type and either has no source filter or includes
+        the event's source. event_types further narrows the result, and
+        limit applies after that filter.
+        """
+        params: list = []
+        n_types = _in_list_params(event_types, params)
+        params += [subscriber, limit]
+        rows = fetch_all(_poll_sql(n_types), tuple(params), db_path)
+        events = [Event.from_row(dict(r)) for r in rows]
 
-            # Update last_poll_at
-            conn.execute(
-                "UPDATE subscriptions SET last_poll_at = ? WHERE subscriber = ?",
-                (now_iso(), subscriber)
-            )
+        # last_poll_at is bookkeeping only; record it in memory and write
+        # it out in batches rather than taking the write lock every poll.
+        due = _poll_times.record(db_path or get_db_path(), subscriber, now_iso())
+        if due:
+            _poll_times.flush(due)
 
-            return [Event.from_row(dict(r)) for r in rows]
+        return events
 
     @staticmethod
-    def acknowledge(event_id: str, subscriber: str, db_path: Optional[Path] = None) -> None:
+    def flush_poll_times(db_path: Optional[Path] = None) -> int:
+        """
+        Write any pending last_poll_at updates immediately.
+
+        Args:
+            db_path: Only flush this database. If None, flush all.
+
+        Returns:
+            Number of subscribers updated
+        """
+        return _poll_times.flush(_poll_times.take(db_path))
+
+    @staticmethod
+    def acknowledge(
+        event_id: str,
+        subscriber: str,
+        db_path: Optional[Path] = None,
+        conn: Optional[sqlite3.Connection] = None
+    ) -> None:
         """Acknowledge an event."""
-        with transaction(db_path) as conn:
-            conn.execute(
-                """UPDATE events
-                   SET acknowledged = 1, acknowledged_by = ?, acknowledged_at = ?
-                   WHERE id = ?""",
-                (subscriber, now_iso(), event_id)
+        with _writer(db_path, conn) as conn:
+            conn.execute(_SQL_ACKNOWLEDGE_EVENT, (subscriber, now_iso(), event_id))
+
+    @staticmethod
+    def acknowledge_batch(
+        event_ids: List[str],
+        subscriber: str,
+        db_path: Optional[Path] = None,
+        conn: Optional[sqlite3.Connection] = None
+    ) -> None:
+        """Acknowledge several events with one executemany and one timestamp."""
+        acknowledged_at = now_iso()
+        with _writer(db_path, conn) as conn:
+            conn.executemany(
+                _SQL_ACKNOWLEDGE_EVENT,
+                [(subscriber, acknowledged_at, event_id) for event_id in event_ids]
             )
 
     @staticmethod
@@ -354,31 +746,17 @@ class EventQueries:
         db_path: Optional[Path] = None
     ) -> List[Event]:
         """Query event timeline."""
-        with get_connection(db_path) as conn:
-            query = "SELECT * FROM events WHERE 1=1"
-            params = []
-
-            if since:
-                query += " AND timestamp >= ?"
-                params.append(since.isoformat())
-
-            if until:
-                query += " AND timestamp <= ?"
-                params.append(until.isoformat())
-
-            if sources:
-                placeholders = ", ".join("?" * len(sources))
-                query += f" AND source IN ({placeholders})"
-                params.extend(sources)
-
-            if types:
-                placeholders = ", ".join("?" * len(types))
-                query += f" AND event_type IN ({placeholders})"
-                params.extend(types)
-
-            query += " ORDER BY timestamp DESC LIMIT ?"
-            params.append(limit)
-
+        params: list = []
+        if since:
+            params.append(since.isoformat())
+        if until:
+            params.append(until.isoformat())
+        n_sources = _in_list_params(sources, params)
+        n_types = _in_list_params(types, params)
+        params.append(limit)
+
+        query = _timeline_sql(bool(since), bool(until), n_sources, n_types)
+        with get_connection(db_path, readonly=True) as conn:
             rows = conn.execute(query, params).fetchall()
             return [Event.from_row(dict(r)) for r in rows]
 
@@ -409,6 +787,11 @@ class SubscriptionQueries:
                 f"INSERT INTO subscriptions ({columns}) VALUES ({placeholders})",
                 tuple(data.values())
             )
+            conn.executemany(
+                """INSERT OR IGNORE INTO subscription_event_types
+                   (subscription_id, event_type) VALUES (?, ?)""",
+                [(sub_id, event_type) for event_type in event_types]
+            )
         return sub_id
 
     @staticmethod
@@ -431,57 +814,51 @@ class FileLockQueries:
         reason: Optional[str] = None,
         ttl_seconds: int = 300,
         test_id: Optional[str] = None,
-        db_path: Optional[Path] = None
+        db_path: Optional[Path] = None,
+        conn: Optional[sqlite3.Connection] = None
     ) -> bool:
-        """Attempt to acquire a lock. Returns True if acquired."""
-        import sqlite3
+        """
+        Attempt to acquire a lock. Returns True if acquired.
 
-        try:
-            with transaction(db_path) as conn:
-                # Check for existing lock
-                row = conn.execute(
-                    "SELECT * FROM file_locks WHERE file_path = ?",
-                    (file_path,)
-                ).fetchone()
-
-                if row:
-                    lock = FileLock.from_row(dict(row))
-                    if not lock.is_expired() and lock.locked_by != locked_by:
-                        return False
-                    # Expired or same owner - delete and reacquire
-                    conn.execute(
-                        "DELETE FROM file_locks WHERE file_path = ?",
-                        (file_path,)
-                    )
-
-                expires_at = (
-                    datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)
-                ).isoformat()
-
-                lock = FileLock(
-                    file_path=file_path,
-                    locked_by=locked_by,
-                    locked_at=now_iso(),
-                    lock_reason=reason,
-                    expires_at=expires_at,
-                    test_id=test_id
-                )
-                data = lock.to_dict()
-                columns = ", ".join(data.keys())
-                placeholders = ", ".join("?" * len(data))
-                conn.execute(
-                    f"INSERT INTO file_locks ({columns}) VALUES ({placeholders})",
-                    tuple(data.values())
-                )
-                return True
-        except sqlite3.IntegrityError:
-            # Race condition - another thread acquired the lock
-            return False
+        A single statement takes the lock when the path is free, already
+        held by the same owner, or held by an expired lock, replacing any
+        existing row. A live lock held by someone else selects nothing to
+        insert, so no row is returned.
+
+        Every successful acquire, whoever calls it, publishes a file_locked
+        event in the same transaction: the event is written by the
+        file_locks insert trigger in schema.sql.
+        """
+        now = now_iso()
+        expires_at = now_iso(ttl_seconds)
+
+        with _writer(db_path, conn) as conn:
+            # REPLACE rather than an UPSERT so a renewal or takeover is an
+            # insert, and fires the same trigger as a new lock
+            row = conn.execute(
+                """INSERT OR REPLACE INTO file_locks
+                   (file_path, locked_by, locked_at, lock_reason, expires_at, test_id)
+                   SELECT ?1, ?2, ?3, ?4, ?5, ?6
+                   WHERE NOT EXISTS (
+                       SELECT 1 FROM file_locks
+                       WHERE file_path = ?1
+                         AND locked_by != ?2
+                         AND (expires_at IS NULL OR expires_at >= ?3)
+                   )
+                   RETURNING locked_by""",
+                (file_path, locked_by, now, reason, expires_at, test_id)
+            ).fetchone()
+            return row is not None and row[0] == locked_by
 
     @staticmethod
-    def release(file_path: str, locked_by: str, db_path: Optional[Path] = None) -> bool:
+    def release(
+        file_path: str,
+        locked_by: str,
+        db_path: Optional[Path] = None,
+        conn: Optional[sqlite3.Connection] = None
+    ) -> bool:
         """Release a lock. Returns True if released."""
-        with transaction(db_path) as conn:
+        with _writer(db_path, conn) as conn:
             result = conn.execute(
                 "DELETE FROM file_locks WHERE file_path = ? AND locked_by = ?",
                 (file_path, locked_by)
@@ -491,30 +868,33 @@ class FileLockQueries:
     @staticmethod
     def check(file_path: str, db_path: Optional[Path] = None) -> Optional[FileLock]:
         """Check lock status. Returns lock info or None."""
-        with get_connection(db_path) as conn:
-            row = conn.execute(
-                "SELECT * FROM file_locks WHERE file_path = ?",
-                (file_path,)
-            ).fetchone()
-
-            if not row:
-                return None
+        row = fetch_one(
+            "SELECT * FROM file_locks WHERE file_path = ?",
+            (file_path,),
+            db_path
+        )
+        if not row:
+            return None
 
-            lock = FileLock.from_row(dict(row))
-            if lock.is_expired():
-                # Clean up expired lock
+        lock = FileLock.from_row(dict(row))
+        if lock.is_expired():
+            # Clean up expired lock, unless it was renewed meanwhile
+            with transaction(db_path) as conn:
                 conn.execute(
-                    "DELETE FROM file_locks WHERE file_path = ?",
-                    (file_path,)
+                    "DELETE FROM file_locks WHERE file_path = ? AND expires_at < ?",
+                    (file_path, now_iso())
                 )
-                return None
+            return None
 
-            return lock
+        return lock
 
     @staticmethod
-    def release_expired(db_path: Optional[Path] = None) -> int:
+    def release_expired(
+        db_path: Optional[Path] = None,
+        conn: Optional[sqlite3.Connection] = None
+    ) -> int:
         """Release all expired locks. Returns count released."""
-        with transaction(db_path) as conn:
+        with _writer(db_path, conn) as conn:
             result = conn.execute(
                 "DELETE FROM file_locks WHERE expires_at < ?",
                 (now_iso(),)
@@ -522,9 +902,13 @@ class FileLockQueries:
             return result.rowcount
 
     @staticmethod
-    def release_all_for_owner(locked_by: str, db_path: Optional[Path] = None) -> int:
+    def release_all_for_owner(
+        locked_by: str,
+        db_path: Optional[Path] = None,
+        conn: Optional[sqlite3.Connection] = None
+    ) -> int:
         """Release all locks for an owner. Returns count released."""
-        with transaction(db_path) as conn:
+        with _writer(db_path, conn) as conn:
             result = conn.execute(
                 "DELETE FROM file_locks WHERE locked_by = ?",
                 (locked_by,)
@@ -559,25 +943,11 @@ class KnowledgeQueries:
         db_path: Optional[Path] = None
     ) -> List[Knowledge]:
         """Query knowledge items."""
-        with get_connection(db_path) as conn:
-            query = "SELECT * FROM knowledge WHERE superseded_by IS NULL"
-            params = []
-
-            if topic:
-                query += " AND topic = ?"
-                params.append(topic)
-
-            if item_type:
-                query += " AND item_type = ?"
-                params.append(item_type)
-
-            if loop_id:
-                query += " AND loop_id = ?"
-                params.append(loop_id)
-
-            query += " ORDER BY created_at DESC LIMIT ?"
-            params.append(limit)
+        params = [v for v in (topic, item_type, loop_id) if v]
+        params.append(limit)
 
+        query = _knowledge_sql(bool(topic), bool(item_type), bool(loop_id))
+        with get_connection(db_path, readonly=True) as conn:
             rows = conn.execute(query, params).fetchall()
             return [Knowledge.from_row(dict(r)) for r in rows]
 
@@ -603,7 +973,7 @@ class DecisionQueries:
     @staticmethod
     def get_pending(db_path: Optional[Path] = None) -> List[Decision]:
         """Get all pending decisions."""
-        with get_connection(db_path) as conn:
+        with get_connection(db_path, readonly=True) as conn:
             rows = conn.execute(
                 "SELECT * FROM decisions WHERE status = 'pending' ORDER BY requested_at"
             ).fetchall()
@@ -651,7 +1021,7 @@ class ComponentHealthQueries:
     @staticmethod
     def get_all(db_path: Optional[Path] = None) -> List[ComponentHealth]:
         """Get all component health records."""
-        with get_connection(db_path) as conn:
+        with get_connection(db_path, readonly=True) as conn:
             rows = conn.execute(
                 "SELECT * FROM component_health ORDER BY component"
             ).fetchall()
@@ -663,15 +1033,9 @@ class ComponentHealthQueries:
         db_path: Optional[Path] = None
     ) -> List[ComponentHealth]:
         """Get components with stale heartbeats."""
-        threshold = (
-            datetime.now(timezone.utc) - timedelta(seconds=threshold_seconds)
-        ).isoformat()
-        with get_connection(db_path) as conn:
-            rows = conn.execute(
-                "SELECT * FROM component_health WHERE last_heartbeat < ?",
-                (threshold,)
-            ).fetchall()
-            return [ComponentHealth.from_row(dict(r)) for r in rows]
+        threshold = now_iso(-threshold_seconds)
+        rows = fetch_all(_SQL_STALE_COMPONENTS, (threshold,), db_path)
+        return [ComponentHealth.from_row(dict(r)) for r in rows]
 
 
 class AlertQueries:
@@ -695,7 +1059,7 @@ class AlertQueries:
     @staticmethod
     def get_unacknowledged(db_path: Optional[Path] = None) -> List[Alert]:
         """Get all unacknowledged alerts."""
-        with get_connection(db_path) as conn:
+        with get_connection(db_path, readonly=True) as conn:
             rows = conn.execute(
                 """SELECT * FROM alerts
                    WHERE acknowledged = 0
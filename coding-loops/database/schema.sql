@@ -69,11 +69,19 @@ CREATE TABLE IF NOT EXISTS events (
     acknowledged_at TEXT
 );
 
+-- Composite indexes carry timestamp so filtered timeline and correlation
+-- queries can read rows already in order; they replace the single-column
+-- indexes dropped below.
+DROP INDEX IF EXISTS idx_events_source;
+DROP INDEX IF EXISTS idx_events_type;
+DROP INDEX IF EXISTS idx_events_unack;
+DROP INDEX IF EXISTS idx_events_correlation;
 CREATE INDEX IF NOT EXISTS idx_events_timestamp ON events(timestamp);
-CREATE INDEX IF NOT EXISTS idx_events_source ON events(source);
-CREATE INDEX IF NOT EXISTS idx_events_type ON events(event_type);
-CREATE INDEX IF NOT EXISTS idx_events_unack ON events(acknowledged) WHERE acknowledged = 0;
-CREATE INDEX IF NOT EXISTS idx_events_correlation ON events(correlation_id);
+CREATE INDEX IF NOT EXISTS idx_events_source_timestamp ON events(source, timestamp);
+CREATE INDEX IF NOT EXISTS idx_events_type_timestamp ON events(event_type, timestamp);
+CREATE INDEX IF NOT EXISTS idx_events_correlation_timestamp ON events(correlation_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_events_pending ON events(priority, timestamp) WHERE acknowledged = 0;
+CREATE INDEX IF NOT EXISTS idx_events_poll ON events(acknowledged, event_type, priority, timestamp);
 
 --------------------------------------------------------------------------------
 -- SUBSCRIPTIONS
@@ -91,6 +99,21 @@ CREATE TABLE IF NOT EXISTS subscriptions (
 CREATE INDEX IF NOT EXISTS idx_subscriptions_subscriber ON subscriptions(subscriber);
 CREATE INDEX IF NOT EXISTS idx_subscriptions_active ON subscriptions(active) WHERE active = 1;
 
+-- One row per (subscription, event type) so poll can match events with a
+-- single indexed lookup instead of decoding the JSON array in Python.
+CREATE TABLE IF NOT EXISTS subscription_event_types (
+    subscription_id TEXT NOT NULL,
+    event_type TEXT NOT NULL,
+    PRIMARY KEY (subscription_id, event_type),
+    FOREIGN KEY (subscription_id) REFERENCES subscriptions(id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_sub_event_types_type ON subscription_event_types(event_type);
+
+-- Backfill subscriptions created before subscription_event_types existed
+INSERT OR IGNORE INTO subscription_event_types (subscription_id, event_type)
+SELECT s.id, j.value FROM subscriptions s, json_each(s.event_types) j;
+
 --------------------------------------------------------------------------------
 -- FILE LOCKS
 --------------------------------------------------------------------------------
@@ -107,6 +130,27 @@ CREATE TABLE IF NOT EXISTS file_locks (
 CREATE INDEX IF NOT EXISTS idx_locks_owner ON file_locks(locked_by);
 CREATE INDEX IF NOT EXISTS idx_locks_expires ON file_locks(expires_at);
 
+-- Taking a lock publishes its file_locked event in the same statement.
+-- FileLockQueries.acquire renews or takes over a lock by replacing the row,
+-- so only inserts publish; other updates to a lock (its reason, expiry)
+-- do not. This replaces the earlier AFTER UPDATE trigger.
+DROP TRIGGER IF EXISTS file_locks_publish_update;
+CREATE TRIGGER IF NOT EXISTS file_locks_publish_insert AFTER INSERT ON file_locks
+BEGIN
+    INSERT INTO events (id, timestamp, source, event_type, payload)
+    VALUES (
+        lower(hex(randomblob(16))), NEW.locked_at, NEW.locked_by, 'file_locked',
+        json_object(
+            'file_path', NEW.file_path,
+            'reason', NEW.lock_reason,
+            'ttl_seconds', CAST(round(
+                (julianday(NEW.expires_at) - julianday(NEW.locked_at)) * 86400
+            ) AS INTEGER),
+            'test_id', NEW.test_id
+        )
+    );
+END;
+
 --------------------------------------------------------------------------------
 -- WAIT GRAPH (for deadlock detection)
 --------------------------------------------------------------------------------
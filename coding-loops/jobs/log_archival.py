@@ -15,10 +15,11 @@ Run monthly for cleanup:
 import argparse
 import json
 import logging
+import os
 import sys
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 # Add parent to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -27,6 +28,11 @@ from shared.archive_config import ArchiveConfig
 from shared.database_archiver import DatabaseArchiver
 from shared.archive_cleanup import ArchiveCleanup
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -35,7 +41,55 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def run_daily_archival(config: ArchiveConfig, dry_run: bool = False) -> dict:
+def encode_results(results: dict) -> bytes:
+    """
+    Serialize a job result or event compactly for machine consumption.
+
+    Uses orjson when installed, otherwise stdlib json without indentation.
+    """
+    if orjson is not None:
+        return orjson.dumps(results, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(results, separators=(",", ":")).encode("utf-8")
+
+
+class ResultsEmitter:
+    """
+    Writes job progress as JSON Lines, one event per line.
+
+    Events go to stdout or are appended to a file opened with O_APPEND, so
+    several archiver processes can share one report and each line lands
+    whole. Each event is written as soon as it happens, which lets
+    operators ``tail -f`` long runs and keeps partial results if a run dies.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        if path:
+            self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        else:
+            sys.stdout.flush()
+            self._fd = sys.stdout.fileno()
+
+    def emit(self, phase: str, event: str, **fields) -> None:
+        """Write one event line."""
+        line = encode_results({"phase": phase, "event": event, **fields})
+        os.write(self._fd, line + b"\n")
+
+    def table_done(self, phase: str) -> Callable[[dict], None]:
+        """Callback for DatabaseArchiver that emits each table's result."""
+        return lambda result: self.emit(phase, "table", **result)
+
+    def close(self) -> None:
+        if self.path:
+            os.close(self._fd)
+
+
+def run_daily_archival(
+    config: ArchiveConfig,
+    dry_run: bool = False,
+    timestamp: Optional[str] = None,
+    emitter: Optional[ResultsEmitter] = None
+) -> dict:
     """
     Daily archival: transcript entries, tool uses, skill traces, message bus log.
 
@@ -43,33 +97,42 @@ def run_daily_archival(config: ArchiveConfig, dry_run: bool = False) -> dict:
     """
     logger.info("Starting daily archival job")
 
-    with DatabaseArchiver(config) as archiver:
+    on_table_done = emitter.table_done("daily") if emitter else None
+
+    with DatabaseArchiver(config, on_table_done=on_table_done) as archiver:
         results = archiver.archive_transcripts(
             older_than=timedelta(days=7),
             dry_run=dry_run
         )
 
         # Also archive message bus log
-        mbus_result = archiver.archive_table(
-            "message_bus_log",
+        results.extend(archiver.archive_tables(
+            ["message_bus_log"],
             older_than=timedelta(days=7),
             dry_run=dry_run
-        )
-        results.append(mbus_result)
+        ))
 
     total_archived = sum(r.get("records", 0) for r in results)
     logger.info(f"Daily archival complete: {total_archived} records archived")
 
-    return {
+    summary = {
         "mode": "daily",
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": timestamp or datetime.now(timezone.utc).isoformat(),
         "dry_run": dry_run,
         "total_archived": total_archived,
         "tables": results
     }
+    if emitter:
+        emitter.emit("daily", "complete", total_archived=total_archived, dry_run=dry_run)
+    return summary
 
 
-def run_weekly_archival(config: ArchiveConfig, dry_run: bool = False) -> dict:
+def run_weekly_archival(
+    config: ArchiveConfig,
+    dry_run: bool = False,
+    timestamp: Optional[str] = None,
+    emitter: Optional[ResultsEmitter] = None
+) -> dict:
     """
     Weekly archival: assertion results, assertion chains.
 
@@ -77,7 +140,9 @@ def run_weekly_archival(config: ArchiveConfig, dry_run: bool = False) -> dict:
     """
     logger.info("Starting weekly archival job")
 
-    with DatabaseArchiver(config) as archiver:
+    on_table_done = emitter.table_done("weekly") if emitter else None
+
+    with DatabaseArchiver(config, on_table_done=on_table_done) as archiver:
         results = archiver.archive_assertions(
             older_than=timedelta(days=30),
             dry_run=dry_run
@@ -86,16 +151,24 @@ def run_weekly_archival(config: ArchiveConfig, dry_run: bool = False) -> dict:
     total_archived = sum(r.get("records", 0) for r in results)
     logger.info(f"Weekly archival complete: {total_archived} records archived")
 
-    return {
+    summary = {
         "mode": "weekly",
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": timestamp or datetime.now(timezone.utc).isoformat(),
         "dry_run": dry_run,
         "total_archived": total_archived,
         "tables": results
     }
+    if emitter:
+        emitter.emit("weekly", "complete", total_archived=total_archived, dry_run=dry_run)
+    return summary
 
 
-def run_monthly_cleanup(config: ArchiveConfig, dry_run: bool = False) -> dict:
+def run_monthly_cleanup(
+    config: ArchiveConfig,
+    dry_run: bool = False,
+    timestamp: Optional[str] = None,
+    emitter: Optional[ResultsEmitter] = None
+) -> dict:
     """
     Monthly cleanup: consolidate warm -> cold, purge expired.
     """
@@ -113,26 +186,46 @@ def run_monthly_cleanup(config: ArchiveConfig, dry_run: bool = False) -> dict:
         f"{len(results['purge'].get('purged_files', []))} purged"
     )
 
+    if emitter:
+        for step, result in results.items():
+            emitter.emit("monthly", step, **result)
+        emitter.emit("monthly", "complete", dry_run=dry_run)
+
     return {
         "mode": "monthly",
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": timestamp or datetime.now(timezone.utc).isoformat(),
         "dry_run": dry_run,
-        "consolidation": results["consolidation"],
-        "purge": results["purge"]
+        **results
     }
 
 
-def run_full_archival(config: ArchiveConfig, dry_run: bool = False) -> dict:
-    """Run all archival and cleanup tasks."""
+def run_full_archival(
+    config: ArchiveConfig,
+    dry_run: bool = False,
+    timestamp: Optional[str] = None,
+    emitter: Optional[ResultsEmitter] = None
+) -> dict:
+    """
+    Run all archival and cleanup tasks.
+
+    Daily and weekly archival run one after the other: both delete from
+    the same database, and SQLite allows one writer at a time, so running
+    them side by side only makes them wait on each other's write lock.
+    Monthly cleanup consolidates the warm archives they produce and runs
+    last.
+    """
     logger.info("Starting full archival job")
 
+    # One run, one timestamp: every phase reports when the job started
+    timestamp = timestamp or datetime.now(timezone.utc).isoformat()
+
     results = {
         "mode": "full",
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": timestamp,
         "dry_run": dry_run,
-        "daily": run_daily_archival(config, dry_run),
-        "weekly": run_weekly_archival(config, dry_run),
-        "monthly": run_monthly_cleanup(config, dry_run)
+        "daily": run_daily_archival(config, dry_run, timestamp, emitter),
+        "weekly": run_weekly_archival(config, dry_run, timestamp, emitter),
+        "monthly": run_monthly_cleanup(config, dry_run, timestamp, emitter)
     }
 
     logger.info("Full archival complete")
@@ -164,10 +257,58 @@ def main():
         type=Path,
         help="Path to archive directory (default: coding-loops/archives)"
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        help="Rows archived per transaction (default: 5000)"
+    )
+    parser.add_argument(
+        "--max-purge",
+        type=int,
+        help="Max rows archived and deleted per table per run; the rest is "
+             "left for the next run (default: 100000)"
+    )
+    parser.add_argument(
+        "--compress-level",
+        type=int,
+        choices=range(1, 10),
+        metavar="{1-9}",
+        help="Gzip level for warm archives (default: 1)"
+    )
+    parser.add_argument(
+        "--codec",
+        choices=["gzip", "zstd", "lz4"],
+        help="Warm archive codec; zstd and lz4 need the zstandard / lz4 "
+             "packages and fall back to gzip without them (default: gzip)"
+    )
+    parser.add_argument(
+        "--direct-to-cold",
+        action="store_true",
+        help="Append archived rows straight to the monthly cold tar, "
+             "skipping warm archives and their consolidation"
+    )
+    parser.add_argument(
+        "--wal",
+        action="store_true",
+        help="Put the database in WAL mode so each batch commit only syncs "
+             "the WAL tail; only for databases not also read by sql.js"
+    )
+    parser.add_argument(
+        "--gzip-after-days",
+        type=int,
+        help="Write warm archives uncompressed and gzip them once older than "
+             "this many days (default: gzip immediately)"
+    )
+    parser.add_argument(
+        "--cold-format",
+        choices=["jsonl", "parquet"],
+        help="Cold storage format: monthly tar.gz of JSONL, or per-table "
+             "Parquet (requires pyarrow) (default: jsonl)"
+    )
     parser.add_argument(
         "--output",
         type=Path,
-        help="Write results to JSON file"
+        help="Append JSON Lines progress events to this file (default: stdout)"
     )
 
     args = parser.parse_args()
@@ -178,6 +319,22 @@ def main():
         config.db_path = args.db_path
     if args.archive_path:
         config.base_path = args.archive_path
+    if args.batch_size:
+        config.batch_size = args.batch_size
+    if args.max_purge:
+        config.max_rows_per_run = args.max_purge
+    if args.compress_level:
+        config.compresslevel = args.compress_level
+    if args.codec:
+        config.codec = args.codec
+    if args.direct_to_cold:
+        config.direct_to_cold = True
+    if args.wal:
+        config.wal = True
+    if args.gzip_after_days:
+        config.gzip_after_days = args.gzip_after_days
+    if args.cold_format:
+        config.cold_format = args.cold_format
 
     # Run appropriate mode
     mode_handlers = {
@@ -187,16 +344,16 @@ def main():
         "full": run_full_archival
     }
 
-    handler = mode_handlers[args.mode]
-    results = handler(config, args.dry_run)
+    # Results are streamed as JSON Lines events while the job runs
+    emitter = ResultsEmitter(args.output)
+    try:
+        handler = mode_handlers[args.mode]
+        handler(config, args.dry_run, emitter=emitter)
+    finally:
+        emitter.close()
 
-    # Output results
     if args.output:
-        with open(args.output, "w") as f:
-            json.dump(results, f, indent=2)
         logger.info(f"Results written to {args.output}")
-    else:
-        print(json.dumps(results, indent=2))
 
     return 0
 
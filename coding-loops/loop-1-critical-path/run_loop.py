@@ -35,16 +35,8 @@ class CriticalPathLoop(RalphLoopRunner):
     Handles UFS completion, Specification Agent, and Build Agent implementation.
     """
 
-    def get_spec_content(self, test_id: str) -> str:
-        """Get the spec content for a given test ID."""
-        # Return the full overview which contains all specs
-        overview_file = self.specs_dir / "00-overview.md"
-        if overview_file.exists():
-            content = overview_file.read_text()
-
-            # Add category-specific context
-            if test_id.startswith("CP-UFS"):
-                content += """
+    SPEC_SUFFIXES = {
+        "CP-UFS": """
 
 ## FOCUS: Unified File System Completion
 
@@ -58,9 +50,8 @@ Reference: Check existing implementation in:
 - utils/folder-structure.ts
 - utils/unified-artifact-store.ts
 - templates/unified/
-"""
-            elif test_id.startswith("CP-SPEC"):
-                content += """
+""",
+        "CP-SPEC": """
 
 ## FOCUS: Specification Agent
 
@@ -74,9 +65,8 @@ The Specification Agent should:
 1. Extract requirements from ideation artifacts
 2. Generate structured specs for build
 3. Create test cases from requirements
-"""
-            elif test_id.startswith("CP-BUILD"):
-                content += """
+""",
+        "CP-BUILD": """
 
 ## FOCUS: Build Agent
 
@@ -90,10 +80,8 @@ The Build Agent should:
 1. Take specs from Specification Agent
 2. Generate code using Ralph loop pattern
 3. Run tests and iterate until passing
-"""
-            return content
-        else:
-            return f"Spec file not found: {overview_file}"
+""",
+    }
 
     def build_system_prompt(self) -> str:
         """Build the system prompt for this loop."""
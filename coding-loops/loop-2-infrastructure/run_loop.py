@@ -35,16 +35,8 @@ class InfrastructureLoop(RalphLoopRunner):
     Handles Authentication, Credit System, and Hosting implementation.
     """
 
-    def get_spec_content(self, test_id: str) -> str:
-        """Get the spec content for a given test ID."""
-        # Return the full overview which contains all specs
-        overview_file = self.specs_dir / "00-overview.md"
-        if overview_file.exists():
-            content = overview_file.read_text()
-
-            # Add category-specific context
-            if test_id.startswith("INFRA-AUTH"):
-                content += """
+    SPEC_SUFFIXES = {
+        "INFRA-AUTH": """
 
 ## FOCUS: Authentication
 
@@ -59,9 +51,8 @@ Key files to create/modify:
 - frontend/src/pages/Register.tsx
 - frontend/src/components/AuthProvider.tsx
 - frontend/src/hooks/useAuth.ts
-"""
-            elif test_id.startswith("INFRA-CRED"):
-                content += """
+""",
+        "INFRA-CRED": """
 
 ## FOCUS: Credit System
 
@@ -75,9 +66,8 @@ Key files to create/modify:
 - frontend/src/pages/Credits.tsx
 - frontend/src/components/CreditBalance.tsx
 - frontend/src/components/CreditUsageAlert.tsx
-"""
-            elif test_id.startswith("INFRA-HOST"):
-                content += """
+""",
+        "INFRA-HOST": """
 
 ## FOCUS: Hosting
 
@@ -89,10 +79,8 @@ Key files to create/modify:
 - frontend/src/pages/Apps.tsx
 - frontend/src/pages/AppDetail.tsx
 - frontend/src/components/DeploymentStatus.tsx
-"""
-            return content
-        else:
-            return f"Spec file not found: {overview_file}"
+""",
+    }
 
     def build_system_prompt(self) -> str:
         """Build the system prompt for this loop."""
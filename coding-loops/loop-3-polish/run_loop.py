@@ -35,16 +35,8 @@ class PolishLoop(RalphLoopRunner):
     Handles Error Monitoring, E2E Testing, and PWA/Mobile implementation.
     """
 
-    def get_spec_content(self, test_id: str) -> str:
-        """Get the spec content for a given test ID."""
-        # Return the full overview which contains all specs
-        overview_file = self.specs_dir / "00-overview.md"
-        if overview_file.exists():
-            content = overview_file.read_text()
-
-            # Add category-specific context
-            if test_id.startswith("POLISH-MON"):
-                content += """
+    SPEC_SUFFIXES = {
+        "POLISH-MON": """
 
 ## FOCUS: Error Monitoring
 
@@ -63,9 +55,8 @@ Install packages:
 Environment variables needed:
 - VITE_SENTRY_DSN (frontend)
 - SENTRY_DSN (backend)
-"""
-            elif test_id.startswith("POLISH-E2E"):
-                content += """
+""",
+        "POLISH-E2E": """
 
 ## FOCUS: E2E Testing
 
@@ -76,9 +67,8 @@ Key files to create/modify:
 
 Use existing Ralph loop infrastructure as a pattern.
 Tests should use the Claude Agent SDK for AI-driven testing.
-"""
-            elif test_id.startswith("POLISH-PWA"):
-                content += """
+""",
+        "POLISH-PWA": """
 
 ## FOCUS: PWA/Mobile
 
@@ -96,10 +86,8 @@ PWA Requirements:
 - Manifest with name, icons, theme color
 - Service worker for caching
 - iOS meta tags for Add to Home Screen
-"""
-            return content
-        else:
-            return f"Spec file not found: {overview_file}"
+""",
+    }
 
     def build_system_prompt(self) -> str:
         """Build the system prompt for this loop."""
@@ -13,6 +13,7 @@ Components (implemented):
 Archive Modules (Phase 10):
 - ArchiveConfig: Retention policies and configuration
 - ArchiveWriter/ArchiveReader: JSONL archive file writer/reader
+- ColdStreamingWriter: Appends archived rows straight to monthly cold tars
 - DatabaseArchiver: SQLite to archive migration
 - ArchiveCleanup: Warm -> cold consolidation and purging
 
@@ -34,65 +35,82 @@ Components (TODO - see TASKS.md):
 - TelegramNotifier: Telegram notifications
 """
 
-# Existing components
-from .ralph_loop_base import (
-    RalphLoopRunner,
-    load_config,
-    validate_json,
-    load_schema,
-    HealthCheck,
-    DEFAULT_CONFIG,
-)
+import importlib
 
-# New components - uncomment as implemented
-from .message_bus import MessageBus, get_message_bus
+# Exports are imported on first attribute access (PEP 562) so that importing
+# one submodule, e.g. shared.archive_config from the archival job, does not
+# pull in the Claude SDK, the HTTP client and every other component.
+_LAZY_IMPORTS = {
+    # Existing components
+    "RalphLoopRunner": "ralph_loop_base",
+    "load_config": "ralph_loop_base",
+    "validate_json": "ralph_loop_base",
+    "load_schema": "ralph_loop_base",
+    "HealthCheck": "ralph_loop_base",
+    "DEFAULT_CONFIG": "ralph_loop_base",
+    "MessageBus": "message_bus",
+    "get_message_bus": "message_bus",
+    # Archive modules (Phase 10)
+    "ArchiveConfig": "archive_config",
+    "RetentionPolicy": "archive_config",
+    "RETENTION_POLICIES": "archive_config",
+    "get_policy": "archive_config",
+    "is_exempt": "archive_config",
+    "ArchiveWriter": "archive_writer",
+    "ColdStreamingWriter": "archive_writer",
+    "ArchiveReader": "archive_writer",
+    "list_archives": "archive_writer",
+    "get_archive_stats": "archive_writer",
+    "get_cold_storage_stats": "archive_writer",
+    "DatabaseArchiver": "database_archiver",
+    "ArchiveCleanup": "archive_cleanup",
+    # Observability Skills
+    "ObservabilitySkills": "observability_skills",
+    "ValidationIssue": "observability_skills",
+    "ErrorRecord": "observability_skills",
+    "StuckOperation": "observability_skills",
+    "ParallelHealthReport": "observability_skills",
+    "AnomalyReport": "observability_skills",
+    "obs_validate": "observability_skills",
+    "obs_errors": "observability_skills",
+    "obs_parallel_health": "observability_skills",
+    "obs_anomalies": "observability_skills",
+    "obs_summary": "observability_skills",
+    # Observability API client
+    "create_execution_run": "observability_api",
+    "complete_execution_run": "observability_api",
+    "record_heartbeat": "observability_api",
+    "flush_heartbeats": "observability_api",
+    "log_tool_start": "observability_api",
+    "log_tool_end": "observability_api",
+    "log_tool_simple": "observability_api",
+    "start_assertion_chain": "observability_api",
+    "record_assertion": "observability_api",
+    "end_assertion_chain": "observability_api",
+    "log_phase_start": "observability_api",
+    "log_phase_end": "observability_api",
+    "is_observable_available": "observability_api",
+    "check_observable": "observability_api",
+    "OBSERVABLE_AVAILABLE": "observability_api",
+}
+
+
+def __getattr__(name: str):
+    """Import an exported name from its submodule on first access."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
 
-# Archive modules (Phase 10)
-from .archive_config import (
-    ArchiveConfig,
-    RetentionPolicy,
-    RETENTION_POLICIES,
-    get_policy,
-    is_exempt,
-)
-from .archive_writer import (
-    ArchiveWriter,
-    ArchiveReader,
-    list_archives,
-    get_archive_stats,
-    get_cold_storage_stats,
-)
-from .database_archiver import DatabaseArchiver
-from .archive_cleanup import ArchiveCleanup
-from .observability_skills import (
-    ObservabilitySkills,
-    ValidationIssue,
-    ErrorRecord,
-    StuckOperation,
-    ParallelHealthReport,
-    AnomalyReport,
-    obs_validate,
-    obs_errors,
-    obs_parallel_health,
-    obs_anomalies,
-    obs_summary,
-)
-from .observability_api import (
-    create_execution_run,
-    complete_execution_run,
-    record_heartbeat,
-    log_tool_start,
-    log_tool_end,
-    log_tool_simple,
-    start_assertion_chain,
-    record_assertion,
-    end_assertion_chain,
-    log_phase_start,
-    log_phase_end,
-    is_observable_available,
-    check_observable,
-    OBSERVABLE_AVAILABLE,
-)
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+# Planned components - add to _LAZY_IMPORTS as implemented
 # from .verification_gate import VerificationGate, VerificationResult
 # from .git_manager import GitManager, RebaseResult
 # from .checkpoint_manager import CheckpointManager
@@ -109,80 +127,5 @@ from .observability_api import (
 # from .context_manager import ContextManager
 # from .telegram_notifier import TelegramNotifier
 
-__all__ = [
-    # Existing
-    "RalphLoopRunner",
-    "load_config",
-    "validate_json",
-    "load_schema",
-    "HealthCheck",
-    "DEFAULT_CONFIG",
-    # New - uncomment as implemented
-    "MessageBus",
-    "get_message_bus",
-    # Archive modules (Phase 10)
-    "ArchiveConfig",
-    "RetentionPolicy",
-    "RETENTION_POLICIES",
-    "get_policy",
-    "is_exempt",
-    "ArchiveWriter",
-    "ArchiveReader",
-    "list_archives",
-    "get_archive_stats",
-    "get_cold_storage_stats",
-    "DatabaseArchiver",
-    "ArchiveCleanup",
-    # Observability Skills
-    "ObservabilitySkills",
-    "ValidationIssue",
-    "ErrorRecord",
-    "StuckOperation",
-    "ParallelHealthReport",
-    "AnomalyReport",
-    "obs_validate",
-    "obs_errors",
-    "obs_parallel_health",
-    "obs_anomalies",
-    "obs_summary",
-    # Observability API client
-    "create_execution_run",
-    "complete_execution_run",
-    "record_heartbeat",
-    "log_tool_start",
-    "log_tool_end",
-    "log_tool_simple",
-    "start_assertion_chain",
-    "record_assertion",
-    "end_assertion_chain",
-    "log_phase_start",
-    "log_phase_end",
-    "is_observable_available",
-    "check_observable",
-    "OBSERVABLE_AVAILABLE",
-    # "VerificationGate",
-    # "VerificationResult",
-    # "GitManager",
-    # "RebaseResult",
-    # "CheckpointManager",
-    # "ResourceRegistry",
-    # "MigrationAllocator",
-    # "BudgetManager",
-    # "KnowledgeBase",
-    # "KnowledgeItem",
-    # "ErrorClassifier",
-    # "ErrorCategory",
-    # "ErrorHandling",
-    # "DeadlockDetector",
-    # "SemanticAnalyzer",
-    # "SemanticReport",
-    # "RegressionMonitor",
-    # "Regression",
-    # "BlameResult",
-    # "DegradationManager",
-    # "DegradedMode",
-    # "OrphanCleaner",
-    # "CleanupResult",
-    # "ContextManager",
-    # "TelegramNotifier",
-]
+# Single source of truth: every lazily exported name is public
+__all__ = list(_LAZY_IMPORTS)
@@ -5,19 +5,105 @@ Archive cleanup service.
 Manages archive lifecycle: warm -> cold -> delete
 """
 
-import gzip
+import os
 import shutil
+import subprocess
 import tarfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Any, Callable, Dict, Iterable, List, Optional
 import logging
 
 from .archive_config import ArchiveConfig, RETENTION_POLICIES, get_policy
-from .archive_writer import list_archives, get_archive_stats, get_cold_storage_stats
+from .archive_writer import (
+    CODEC_SUFFIXES,
+    ArchiveReader,
+    codec_available,
+    open_compressed,
+    list_archives,
+    list_cold_archives,
+    open_cold_tar,
+    parse_archive_date,
+    parse_cold_archive_name,
+    get_archive_stats,
+    get_cold_storage_stats
+)
 
 logger = logging.getLogger(__name__)
 
+# Copy chunk for tar members and record size for streamed tars. tarfile's
+# 16 KiB default turns a month of warm archives into many small writes.
+TAR_BUFFER_SIZE = 2 << 20
+
+_COMPRESSED_SUFFIXES = frozenset(CODEC_SUFFIXES.values())
+
+
+def _parquet_available() -> bool:
+    """Check for pyarrow, which Parquet cold storage needs."""
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        logger.warning("pyarrow not installed; writing cold archives as tarballs")
+        return False
+    return True
+
+
+@contextmanager
+def _open_month_tar(tar_path: Path, compresslevel: int, threads: Optional[int] = None):
+    """
+    Open a gzipped tar for writing, compressing with pigz when available.
+
+    pigz runs DEFLATE on ``threads`` cores (default: all) while tarfile
+    streams into its stdin; without it, fall back to tarfile's
+    single-threaded gzip.
+    """
+    pigz = shutil.which("pigz")
+    if not pigz:
+        with tarfile.open(
+            tar_path, "w:gz", compresslevel=compresslevel, copybufsize=TAR_BUFFER_SIZE
+        ) as tar:
+            yield tar
+        return
+
+    with open(tar_path, "wb") as out:
+        args = [pigz, "-c", f"-{compresslevel}"]
+        if threads:
+            args += ["-p", str(threads)]
+        proc = subprocess.Popen(
+            args,
+            stdin=subprocess.PIPE,
+            stdout=out
+        )
+        try:
+            with tarfile.open(
+                fileobj=proc.stdin,
+                mode="w|",
+                bufsize=TAR_BUFFER_SIZE,
+                copybufsize=TAR_BUFFER_SIZE
+            ) as tar:
+                yield tar
+        finally:
+            proc.stdin.close()
+            returncode = proc.wait()
+    if returncode != 0:
+        raise OSError(f"pigz exited with status {returncode} writing {tar_path}")
+
+
+def _remove_empty_dirs(dirs: Iterable[Path]) -> None:
+    """
+    Remove whichever of ``dirs`` are empty.
+
+    rmdir fails on a non-empty directory, which is one syscall instead of
+    listing the directory to check first.
+    """
+    for path in dirs:
+        try:
+            os.rmdir(path)
+        except OSError:
+            pass
+
 
 class ArchiveCleanup:
     """Manages archive cleanup and cold storage consolidation."""
@@ -25,6 +111,88 @@ class ArchiveCleanup:
     def __init__(self, config: Optional[ArchiveConfig] = None):
         self.config = config or ArchiveConfig.default()
         self.config.ensure_directories()
+        # key -> listing, only while cleanup_all() runs; see _cached_scan
+        self._scan_cache: Optional[Dict[str, Any]] = None
+
+    def _cached_scan(self, key: str, scan: Callable[[], Any]) -> Any:
+        """
+        Return a directory listing, reusing one taken earlier in the same
+        cleanup_all() call.
+
+        A cleanup run lists the same trees for each of its steps. Steps that
+        change the trees call _invalidate_scans. Listings are not kept
+        between calls: an archiver may add files to an existing date
+        directory at any time, which no cheap check (such as the root's
+        mtime) would notice.
+        """
+        if self._scan_cache is None:
+            return scan()
+        if key not in self._scan_cache:
+            self._scan_cache[key] = scan()
+        return self._scan_cache[key]
+
+    def _invalidate_scans(self) -> None:
+        """Forget cached listings after changing warm or cold storage."""
+        if self._scan_cache is not None:
+            self._scan_cache.clear()
+
+    def _scan_warm(self) -> List[Path]:
+        """All warm archive files (cached)."""
+        return self._cached_scan("warm", lambda: list_archives(self.config.warm_path))
+
+    def _scan_cold(self) -> Dict[Path, List[Path]]:
+        """Cold archive files by year directory, including empty ones (cached)."""
+        def scan() -> Dict[Path, List[Path]]:
+            if not self.config.cold_path.exists():
+                return {}
+            with os.scandir(self.config.cold_path) as it:
+                year_dirs = [
+                    Path(e.path) for e in it if e.is_dir(follow_symlinks=False)
+                ]
+            return {year_dir: list_cold_archives(year_dir) for year_dir in year_dirs}
+
+        return self._cached_scan("cold", scan)
+
+    def compress_warm(
+        self,
+        older_than: timedelta,
+        dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Compress plain JSONL warm archives older than threshold with the
+        configured codec.
+
+        Appends to the day's existing compressed file if there is one;
+        readers treat the result as one stream.
+        """
+        cutoff_date = datetime.now(timezone.utc).replace(tzinfo=None) - older_than
+        results = {"status": "success", "compressed": 0, "files": []}
+        codec = self.config.codec if codec_available(self.config.codec) else "gzip"
+
+        for archive_file in self._scan_warm():
+            if archive_file.suffix != ".jsonl":
+                continue
+            archive_date = parse_archive_date(archive_file.parent.name)
+            if archive_date >= cutoff_date:
+                continue
+
+            results["files"].append(str(archive_file))
+            results["compressed"] += 1
+            if dry_run:
+                continue
+
+            compressed_path = archive_file.with_name(
+                archive_file.name + CODEC_SUFFIXES[codec]
+            )
+            with open(archive_file, "rb") as src, open_compressed(
+                compressed_path, "ab", codec, self.config.compresslevel
+            ) as dst:
+                shutil.copyfileobj(src, dst)
+            archive_file.unlink()
+
+        if results["compressed"] and not dry_run:
+            self._invalidate_scans()
+        return results
 
     def consolidate_to_cold(
         self,
@@ -34,16 +202,18 @@ class ArchiveCleanup:
         """
         Consolidate warm archives older than threshold into cold storage.
 
-        Creates monthly tar.gz files in cold storage.
+        Creates a monthly tarball in cold storage (``.tar`` when every warm
+        file is already gzipped, else ``.tar.gz``), or one ZSTD Parquet file
+        per table and month when ``config.cold_format`` is "parquet".
         """
         cutoff_date = datetime.now(timezone.utc).replace(tzinfo=None) - older_than
 
         # Find archives to consolidate
         archives_by_month: Dict[str, List[Path]] = {}
 
-        for archive_file in list_archives(self.config.warm_path):
+        for archive_file in self._scan_warm():
             date_str = archive_file.parent.name
-            archive_date = datetime.strptime(date_str, "%Y-%m-%d")
+            archive_date = parse_archive_date(date_str)
 
             if archive_date >= cutoff_date:
                 continue
@@ -64,41 +234,175 @@ class ArchiveCleanup:
             "removed_warm": []
         }
 
-        for month_key, files in archives_by_month.items():
-            logger.info(f"Consolidating {len(files)} archives for {month_key}")
-
-            if dry_run:
+        if dry_run:
+            for month_key, files in archives_by_month.items():
+                logger.info(f"Would consolidate {len(files)} archives for {month_key}")
                 results["consolidated"] += len(files)
-                continue
-
-            # Create year directory
-            year = month_key.split("-")[0]
-            year_dir = self.config.cold_path / year
-            year_dir.mkdir(parents=True, exist_ok=True)
+            return results
 
-            # Create tar.gz for the month
-            tar_path = year_dir / f"{month_key}.tar.gz"
+        use_parquet = self.config.cold_format == "parquet" and _parquet_available()
+
+        # Months read disjoint warm files and write separate cold files, so
+        # they are built side by side. pigz threads are split between them;
+        # a single month leaves pigz its default of every core.
+        cpus = os.cpu_count() or 1
+        workers = min(len(archives_by_month), cpus)
+        pigz_threads = max(1, cpus // workers) if workers > 1 else None
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [
+                    (files, pool.submit(
+                        self._consolidate_month,
+                        month_key, files, use_parquet, pigz_threads
+                    ))
+                    for month_key, files in archives_by_month.items()
+                ]
+                for files, future in futures:
+                    results["cold_files"].extend(str(p) for p in future.result())
+                    results["removed_warm"].extend(str(f) for f in files)
+                    results["consolidated"] += len(files)
+        finally:
+            self._invalidate_scans()
 
-            with tarfile.open(tar_path, "w:gz") as tar:
-                for archive_file in files:
-                    # Add file to tar with relative path
-                    arcname = f"{archive_file.parent.name}/{archive_file.name}"
-                    tar.add(archive_file, arcname=arcname)
+        return results
 
-            results["cold_files"].append(str(tar_path))
+    def _consolidate_month(
+        self,
+        month_key: str,
+        files: List[Path],
+        use_parquet: bool,
+        pigz_threads: Optional[int] = None
+    ) -> List[Path]:
+        """
+        Write one month of warm archives to cold storage, then remove them
+        from warm storage. Returns the cold files written.
+        """
+        logger.info(f"Consolidating {len(files)} archives for {month_key}")
+
+        # Create year directory
+        year = month_key.split("-")[0]
+        year_dir = self.config.cold_path / year
+        year_dir.mkdir(parents=True, exist_ok=True)
+
+        if use_parquet:
+            cold_files = self._write_parquet(year_dir, month_key, files)
+        else:
+            # Warm archives are normally compressed already and DEFLATE
+            # gains nothing on them a second time, so those months are
+            # stored in a plain tar. Months with plain JSONL files still get
+            # a fast gzip pass.
+            if all(f.suffix in _COMPRESSED_SUFFIXES for f in files):
+                tar_path = year_dir / f"{month_key}.tar"
+                self._append_to_tar(tar_path, files)
+            else:
+                tar_path = year_dir / f"{month_key}.tar.gz"
+                self._write_gz_tar(tar_path, files, pigz_threads)
+
+            cold_files = [tar_path]
+
+        # Remove consolidated files from warm storage
+        date_dirs = set()
+        for archive_file in files:
+            os.unlink(archive_file)
+            date_dirs.add(archive_file.parent)
+
+        # Remove emptied date directories; rmdir refuses non-empty ones
+        _remove_empty_dirs(date_dirs)
+
+        return cold_files
+
+    @staticmethod
+    def _arcname(archive_file: Path) -> str:
+        """Name of a warm archive inside a month tar, e.g. "2025-01-15/x.jsonl.gz"."""
+        return f"{archive_file.parent.name}/{archive_file.name}"
+
+    def _append_to_tar(self, tar_path: Path, files: List[Path]) -> None:
+        """
+        Add warm archives to a store-only month tar, creating it if needed.
 
-            # Remove consolidated files from warm storage
+        An existing tar is appended to, so a month that is consolidated
+        over several runs only costs the new files each time. Files already
+        in the tar with the same name and size (left behind when an earlier
+        run stopped before deleting them) are not added twice.
+        """
+        with open_cold_tar(tar_path, TAR_BUFFER_SIZE) as tar:
+            present = {m.name: m.size for m in tar.getmembers()}
             for archive_file in files:
-                archive_file.unlink()
-                results["removed_warm"].append(str(archive_file))
+                arcname = self._arcname(archive_file)
+                if present.get(arcname) == archive_file.stat().st_size:
+                    continue
+                tar.add(archive_file, arcname=arcname)
+
+    def _write_gz_tar(
+        self,
+        tar_path: Path,
+        files: List[Path],
+        pigz_threads: Optional[int] = None
+    ) -> None:
+        """
+        Write warm archives to a gzipped month tar.
 
-                # Remove empty date directories
-                if not any(archive_file.parent.iterdir()):
-                    archive_file.parent.rmdir()
+        A gzip stream cannot be appended to in place, so when the month
+        already has a tarball it is rewritten with its old members first.
+        The new tar is built beside it and moved into place when complete.
+        """
+        if not tar_path.exists():
+            with _open_month_tar(tar_path, 1, pigz_threads) as tar:
+                for archive_file in files:
+                    tar.add(archive_file, arcname=self._arcname(archive_file))
+            return
+
+        partial_path = tar_path.with_name(f".{tar_path.name}.partial")
+        with _open_month_tar(partial_path, 1, pigz_threads) as tar:
+            with tarfile.open(tar_path, "r|gz") as existing:
+                for member in existing:
+                    tar.addfile(member, existing.extractfile(member))
+            for archive_file in files:
+                tar.add(archive_file, arcname=self._arcname(archive_file))
+        os.replace(partial_path, tar_path)
 
-            results["consolidated"] += len(files)
+    def _write_parquet(
+        self,
+        year_dir: Path,
+        month_key: str,
+        files: List[Path]
+    ) -> List[Path]:
+        """Rewrite a month of warm JSONL archives as per-table Parquet files."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        files_by_table: Dict[str, List[Path]] = {}
+        for archive_file in files:
+            table_name = archive_file.name.partition(".")[0]
+            files_by_table.setdefault(table_name, []).append(archive_file)
+
+        written = []
+        for table_name, table_files in files_by_table.items():
+            # Daily files of one table can disagree on column types (e.g. a
+            # column that is all NULL on one day), so promote while merging.
+            table = pa.concat_tables(
+                [pa.Table.from_pylist(ArchiveReader(f).read_all()) for f in table_files],
+                promote_options="default"
+            )
+            parquet_path = year_dir / f"{month_key}.{table_name}.parquet"
+            if parquet_path.exists():
+                # Parquet files cannot be appended to; fold in the month's
+                # earlier consolidation instead of overwriting it.
+                table = pa.concat_tables(
+                    [pq.read_table(parquet_path), table],
+                    promote_options="default"
+                )
+            pq.write_table(
+                table,
+                parquet_path,
+                compression="zstd",
+                compression_level=3,
+                use_dictionary=True
+            )
+            written.append(parquet_path)
 
-        return results
+        return written
 
     def purge_expired(
         self,
@@ -108,6 +412,7 @@ class ArchiveCleanup:
         Delete archives that have exceeded their retention period.
 
         Checks cold storage against table-specific cold_days policies.
+        Expired archives are whole files, so purging is just an unlink.
         """
         results = {
             "status": "success",
@@ -116,31 +421,25 @@ class ArchiveCleanup:
         }
 
         now = datetime.now(timezone.utc).replace(tzinfo=None)
+        # Monthly tarballs mix tables, so they keep the longest retention
+        max_retention = max(p.cold_threshold for p in RETENTION_POLICIES.values())
 
         # Check cold storage
-        if not self.config.cold_path.exists():
-            return results
-
-        for year_dir in self.config.cold_path.iterdir():
-            if not year_dir.is_dir():
-                continue
+        cold_archives = self._scan_cold()
 
-            for tar_file in year_dir.glob("*.tar.gz"):
-                # Parse month from filename (handle double extension .tar.gz)
-                # tar_file.stem gives "2025-01.tar", need to remove .tar
-                month_str = tar_file.stem.replace(".tar", "")  # e.g., "2025-01"
+        for year_archives in cold_archives.values():
+            for tar_file in year_archives:
                 try:
-                    archive_date = datetime.strptime(month_str, "%Y-%m")
+                    archive_date, table_name = parse_cold_archive_name(tar_file.name)
                 except ValueError:
                     logger.warning(f"Cannot parse date from archive: {tar_file}")
                     continue
 
-                # Check if expired (use longest retention policy)
-                max_retention = max(
-                    p.cold_threshold for p in RETENTION_POLICIES.values()
-                )
+                # Per-table archives expire with their own table's policy
+                policy = get_policy(table_name) if table_name else None
+                retention = policy.cold_threshold if policy else max_retention
 
-                if now - archive_date > max_retention:
+                if now - archive_date > retention:
                     file_size = tar_file.stat().st_size
 
                     if dry_run:
@@ -154,9 +453,8 @@ class ArchiveCleanup:
 
         # Remove empty year directories
         if not dry_run:
-            for year_dir in self.config.cold_path.iterdir():
-                if year_dir.is_dir() and not any(year_dir.iterdir()):
-                    year_dir.rmdir()
+            _remove_empty_dirs(cold_archives)
+            self._invalidate_scans()
 
         return results
 
@@ -165,27 +463,34 @@ class ArchiveCleanup:
         consolidate_older_than: timedelta = timedelta(days=30),
         dry_run: bool = False
     ) -> Dict[str, Any]:
-        """Run full cleanup: consolidate warm -> cold, then purge expired."""
-        results = {
-            "consolidation": self.consolidate_to_cold(consolidate_older_than, dry_run),
-            "purge": self.purge_expired(dry_run)
-        }
+        """
+        Run full cleanup: gzip aged plain warm archives (when
+        ``config.gzip_after_days`` is set), consolidate warm -> cold, then
+        purge expired.
+        """
+        results = {}
+        self._scan_cache = {}
+        try:
+            if self.config.gzip_after_days:
+                results["compression"] = self.compress_warm(
+                    timedelta(days=self.config.gzip_after_days), dry_run
+                )
+            results["consolidation"] = self.consolidate_to_cold(
+                consolidate_older_than, dry_run
+            )
+            results["purge"] = self.purge_expired(dry_run)
+        finally:
+            self._scan_cache = None
         return results
 
     def get_retention_status(self) -> Dict[str, Any]:
         """Get comprehensive retention status across all storage tiers."""
-        warm_stats = get_archive_stats(self.config.warm_path)
-        cold_stats = get_cold_storage_stats(self.config.cold_path)
-
-        # Calculate what's eligible for cleanup
+        # Count what's eligible for cleanup while gathering warm stats
         now = datetime.now(timezone.utc).replace(tzinfo=None)
-        eligible_for_cold = 0
-
-        for archive in list_archives(self.config.warm_path):
-            date_str = archive.parent.name
-            archive_date = datetime.strptime(date_str, "%Y-%m-%d")
-            if now - archive_date > timedelta(days=30):
-                eligible_for_cold += 1
+        warm_stats = get_archive_stats(
+            self.config.warm_path, eligible_cutoff=now - timedelta(days=30)
+        )
+        cold_stats = get_cold_storage_stats(self.config.cold_path)
 
         return {
             "warm": {
@@ -193,7 +498,7 @@ class ArchiveCleanup:
                 "total_size_mb": round(warm_stats["total_size_bytes"] / 1024 / 1024, 2),
                 "oldest": warm_stats["oldest_archive"],
                 "newest": warm_stats["newest_archive"],
-                "eligible_for_cold": eligible_for_cold
+                "eligible_for_cold": warm_stats["eligible"]
             },
             "cold": {
                 "total_files": cold_stats["total_files"],
@@ -5,31 +5,36 @@ Archive configuration and retention policies.
 Defines data lifecycle rules for observability tables.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import timedelta
+from functools import cached_property
 from pathlib import Path
 from typing import Dict, Optional
 import os
 
 
-@dataclass
+@dataclass(frozen=True)
 class RetentionPolicy:
-    """Retention policy for a single table."""
+    """
+    Retention policy for a single table.
+
+    Policies are immutable, so the thresholds are computed once per policy.
+    """
     table_name: str
     hot_days: int          # Days to keep in SQLite
     warm_days: int         # Days to keep in warm archive
     cold_days: int         # Days to keep in cold archive (0 = delete after warm)
     timestamp_column: str  # Column to use for age calculation
 
-    @property
+    @cached_property
     def hot_threshold(self) -> timedelta:
         return timedelta(days=self.hot_days)
 
-    @property
+    @cached_property
     def warm_threshold(self) -> timedelta:
         return timedelta(days=self.hot_days + self.warm_days)
 
-    @property
+    @cached_property
     def cold_threshold(self) -> timedelta:
         if self.cold_days == 0:
             return self.warm_threshold
@@ -94,8 +99,27 @@ class ArchiveConfig:
     base_path: Path
     db_path: Path
     compress: bool = True
-    batch_size: int = 1000
+    # Gzip level for warm archives; level 1 is several times faster than 9
+    # and only a few percent larger on JSONL.
+    compresslevel: int = 1
+    codec: str = "gzip"  # Warm archive codec: "gzip", "zstd" or "lz4"
+    # Append archived rows straight to the month's cold tar instead of
+    # writing warm files for later consolidation (see ColdStreamingWriter)
+    direct_to_cold: bool = False
+    # Switch the database to WAL journaling before archiving. Off by default:
+    # the mode persists on ideas.db, and sql.js reads only the main file.
+    wal: bool = False
+    batch_size: int = 5000
     dry_run: bool = False
+    cold_format: str = "jsonl"  # "jsonl" (monthly tar.gz) or "parquet"
+    max_rows_per_run: Optional[int] = 100_000  # Per table; None = unbounded
+    # If set (with compress), new warm archives are written as plain JSONL
+    # and gzipped by cleanup once older than this many days, so recent
+    # archives stay greppable.
+    gzip_after_days: Optional[int] = None
+    _directories_ready: Optional[Path] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @classmethod
     def default(cls) -> "ArchiveConfig":
@@ -105,7 +129,7 @@ class ArchiveConfig:
             base_path=project_root / "archives",
             db_path=project_root.parent / "database" / "ideas.db",
             compress=True,
-            batch_size=1000,
+            batch_size=5000,
             dry_run=False
         )
 
@@ -120,9 +144,17 @@ class ArchiveConfig:
         return self.base_path / "cold"
 
     def ensure_directories(self) -> None:
-        """Create archive directories if they don't exist."""
+        """
+        Create archive directories if they don't exist.
+
+        Every archiver and cleanup built from this config calls this, so the
+        mkdirs are skipped once done for the current base_path.
+        """
+        if self._directories_ready == self.base_path:
+            return
         self.warm_path.mkdir(parents=True, exist_ok=True)
         self.cold_path.mkdir(parents=True, exist_ok=True)
+        self._directories_ready = self.base_path
 
 
 def get_policy(table_name: str) -> Optional[RetentionPolicy]:
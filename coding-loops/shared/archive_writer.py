@@ -1,19 +1,86 @@
 # coding-loops/shared/archive_writer.py
 """
-Archive writer for JSONL files with gzip compression.
+Archive writer for JSONL files with gzip, zstd or lz4 compression.
 
 Handles writing database records to archive files.
 """
 
 import gzip
+import io
 import json
+import os
+import re
+import tarfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterator, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads in this process are serialized
+    fcntl = None
+
 logger = logging.getLogger(__name__)
 
+# Buffer size for uncompressed archives; records reach the OS in large
+# writes and are only forced to disk by ArchiveWriter.sync().
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Compression codecs for warm archives and the file suffix each one uses.
+# gzip is always available; zstd and lz4 need the zstandard / lz4 packages.
+CODEC_SUFFIXES = {"gzip": ".gz", "zstd": ".zst", "lz4": ".lz4"}
+_SUFFIX_CODECS = {suffix: codec for codec, suffix in CODEC_SUFFIXES.items()}
+
+# A newline that ends an empty line (it follows another newline)
+_BLANK_LINE = re.compile(rb"\n(?=\n)")
+
+
+def codec_available(codec: str) -> bool:
+    """Check that a codec is known and its library is installed."""
+    try:
+        if codec == "zstd":
+            import zstandard  # noqa: F401
+        elif codec == "lz4":
+            import lz4.frame  # noqa: F401
+    except ImportError:
+        return False
+    return codec in CODEC_SUFFIXES
+
+
+def open_compressed(
+    path: Path,
+    mode: str,
+    codec: str = "gzip",
+    compresslevel: int = 1,
+    **kwargs
+):
+    """
+    Open a compressed archive file with the given codec.
+
+    ``compresslevel`` is the gzip level; zstd uses level 3 and lz4 its
+    default level, the fast settings for those codecs. Appending adds a new
+    frame, and all three readers read concatenated frames as one stream.
+    Extra keyword arguments (e.g. ``encoding``) are passed to the opener.
+    """
+    if codec == "zstd":
+        import zstandard
+        cctx = None if "r" in mode else zstandard.ZstdCompressor(level=3)
+        return zstandard.open(path, mode, cctx=cctx, **kwargs)
+    if codec == "lz4":
+        import lz4.frame
+        return lz4.frame.open(path, mode, **kwargs)
+    return gzip.open(path, mode, compresslevel=compresslevel, **kwargs)
+
 
 class ArchiveWriter:
     """Writes records to JSONL archive files."""
@@ -23,12 +90,19 @@ class ArchiveWriter:
         base_path: Path,
         table_name: str,
         archive_date: datetime,
-        compress: bool = True
+        compress: bool = True,
+        compresslevel: int = 1,
+        codec: str = "gzip"
     ):
         self.base_path = base_path
         self.table_name = table_name
         self.archive_date = archive_date
         self.compress = compress
+        self.compresslevel = compresslevel
+        if compress and not codec_available(codec):
+            logger.warning(f"{codec} codec not available; writing gzip archives")
+            codec = "gzip"
+        self.codec = codec
         self.records_written = 0
         self._file = None
 
@@ -41,17 +115,20 @@ class ArchiveWriter:
     @property
     def archive_file(self) -> Path:
         """Full path to archive file."""
-        ext = ".jsonl.gz" if self.compress else ".jsonl"
+        ext = ".jsonl" + CODEC_SUFFIXES[self.codec] if self.compress else ".jsonl"
         return self.archive_dir / f"{self.table_name}{ext}"
 
     def __enter__(self) -> "ArchiveWriter":
         """Open archive file for writing."""
         self.archive_dir.mkdir(parents=True, exist_ok=True)
 
+        # Binary mode: records are serialized straight to UTF-8 bytes
         if self.compress:
-            self._file = gzip.open(self.archive_file, "at", encoding="utf-8")
+            self._file = open_compressed(
+                self.archive_file, "ab", self.codec, self.compresslevel
+            )
         else:
-            self._file = open(self.archive_file, "a", encoding="utf-8")
+            self._file = open(self.archive_file, "ab", buffering=WRITE_BUFFER_SIZE)
 
         logger.info(f"Opened archive: {self.archive_file}")
         return self
@@ -65,69 +142,357 @@ class ArchiveWriter:
                 f"({self.records_written} records)"
             )
 
+    @staticmethod
+    def _serialize(record: Dict[str, Any], archived_at: str) -> bytes:
+        """
+        Serialize one record as a JSONL line, adding archive metadata.
+
+        Uses orjson when installed, otherwise stdlib json.
+        """
+        record["_archived_at"] = archived_at
+        if orjson is not None:
+            return orjson.dumps(
+                record,
+                default=str,
+                option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+            )
+        return (json.dumps(record, default=str) + "\n").encode("utf-8")
+
     def write_record(self, record: Dict[str, Any]) -> None:
         """Write a single record to the archive."""
         if not self._file:
             raise RuntimeError("Archive not opened. Use context manager.")
 
-        # Add archive metadata
-        record["_archived_at"] = datetime.now(timezone.utc).isoformat()
-
-        line = json.dumps(record, default=str) + "\n"
-        self._file.write(line)
+        archived_at = datetime.now(timezone.utc).isoformat()
+        self._file.write(self._serialize(record, archived_at))
         self.records_written += 1
 
     def write_batch(self, records: List[Dict[str, Any]]) -> int:
-        """Write multiple records to the archive."""
-        for record in records:
-            self.write_record(record)
+        """Write multiple records to the archive with a single write call."""
+        if not self._file:
+            raise RuntimeError("Archive not opened. Use context manager.")
+
+        if records:
+            # One timestamp for the whole batch; the records are archived
+            # together. join() builds a list anyway, so hand it one.
+            archived_at = datetime.now(timezone.utc).isoformat()
+            serialize = self._serialize
+            self._file.write(b"".join([serialize(r, archived_at) for r in records]))
+        self.records_written += len(records)
         return len(records)
 
+    def write_lines(self, lines: List[str]) -> int:
+        """
+        Write records that are already serialized as JSON objects.
+
+        The lines must not contain newlines and should already carry the
+        ``_archived_at`` metadata.
+        """
+        if not self._file:
+            raise RuntimeError("Archive not opened. Use context manager.")
+
+        if lines:
+            self._file.write(("\n".join(lines) + "\n").encode("utf-8"))
+        self.records_written += len(lines)
+        return len(lines)
+
+    def sync(self) -> None:
+        """
+        Flush buffered records and fsync the archive file.
+
+        Callers that delete the source rows afterwards should sync first so
+        a crash cannot lose records that are gone from the database.
+        """
+        if not self._file:
+            raise RuntimeError("Archive not opened. Use context manager.")
+
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+
+# One lock per cold tar, so archiver threads take turns appending to it
+_cold_tar_locks: Dict[Path, threading.Lock] = defaultdict(threading.Lock)
+_cold_tar_locks_guard = threading.Lock()
+
+
+def _repair_tar_end(f) -> None:
+    """
+    Cut a cold tar back to its last complete member and rewrite the
+    end-of-archive blocks, which an appender killed mid-run never wrote.
+    """
+    f.seek(0)
+    with tarfile.open(fileobj=f, mode="r") as tar:
+        try:
+            for _ in tar:
+                pass
+        except tarfile.ReadError:
+            pass  # Stopped at the cut-off member; the ones read so far stand
+        members = tar.members
+
+    size = os.fstat(f.fileno()).st_size
+    end = 0
+    for member in members:
+        blocks = -(-member.size // tarfile.BLOCKSIZE)
+        member_end = member.offset_data + blocks * tarfile.BLOCKSIZE
+        if member_end > size:
+            break
+        end = member_end
+
+    f.seek(end)
+    f.truncate()
+    f.write(tarfile.NUL * tarfile.BLOCKSIZE * 2)
+    f.flush()
+
+
+@contextmanager
+def open_cold_tar(tar_path: Path, copybufsize: int = WRITE_BUFFER_SIZE):
+    """
+    Open a store-only cold tar for appending, creating it if needed.
+
+    Holds a lock for the duration: threads in this process and, where
+    fcntl exists, other processes take turns, so no appender reads the
+    member list while another is writing. A tar left without its end
+    blocks by a killed appender is repaired first.
+    """
+    with _cold_tar_locks_guard:
+        lock = _cold_tar_locks[tar_path]
+
+    with lock:
+        fd = os.open(tar_path, os.O_RDWR | os.O_CREAT, 0o644)
+        with os.fdopen(fd, "r+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+            if not os.fstat(f.fileno()).st_size:
+                tar = tarfile.open(fileobj=f, mode="w", copybufsize=copybufsize)
+            else:
+                try:
+                    tar = tarfile.open(fileobj=f, mode="a", copybufsize=copybufsize)
+                except tarfile.ReadError:
+                    logger.warning(f"Repairing unterminated cold archive: {tar_path}")
+                    _repair_tar_end(f)
+                    f.seek(0)
+                    tar = tarfile.open(fileobj=f, mode="a", copybufsize=copybufsize)
+
+            # Always close: that writes the end blocks the next append needs
+            try:
+                yield tar
+            finally:
+                tar.close()
+
+
+class ColdStreamingWriter(ArchiveWriter):
+    """
+    Writes records straight into the month's store-only cold tar.
+
+    Each synced batch becomes one compressed JSONL member, e.g.
+    ``2025-01-15/tool_uses.<ns>.jsonl.gz`` in ``<cold>/2025/2025-01.tar``.
+    That is the same layout consolidation produces, so data archived this
+    way skips the warm tier and never needs consolidating. Purge and cold
+    stats treat the tar like any other.
+
+    Records are buffered in memory until sync(), which appends the member
+    and fsyncs the tar. A batch that fails to append is cut off again so the
+    tar stays appendable. The tar is only locked (see open_cold_tar) while
+    sync() appends, never while the writer is merely open: callers sync
+    while holding the database write lock, so holding the tar for longer
+    would let two archivers each wait on the lock the other holds.
+    """
+
+    def __init__(
+        self,
+        base_path: Path,
+        table_name: str,
+        archive_date: datetime,
+        compresslevel: int = 1,
+        codec: str = "gzip"
+    ):
+        super().__init__(
+            base_path, table_name, archive_date,
+            compress=True, compresslevel=compresslevel, codec=codec
+        )
+
+    @property
+    def archive_dir(self) -> Path:
+        """Year directory in cold storage."""
+        return self.base_path / self.archive_date.strftime("%Y")
+
+    @property
+    def archive_file(self) -> Path:
+        """The month's cold tar."""
+        return self.archive_dir / f"{self.archive_date.strftime('%Y-%m')}.tar"
+
+    def __enter__(self) -> "ColdStreamingWriter":
+        """Start buffering records for the month's tar."""
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self._file = io.BytesIO()
+        logger.info(f"Opened cold archive: {self.archive_file}")
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Append any remaining records to the tar."""
+        try:
+            if exc_type is None:
+                self.sync()
+        finally:
+            self._file = None
+        logger.info(
+            f"Closed cold archive: {self.archive_file} "
+            f"({self.records_written} records)"
+        )
+
+    def sync(self) -> None:
+        """Lock the tar, append buffered records as one member and fsync it."""
+        if not self._file:
+            raise RuntimeError("Archive not opened. Use context manager.")
+
+        data = self._file.getvalue()
+        if not data:
+            return
+
+        compressed = io.BytesIO()
+        with open_compressed(compressed, "wb", self.codec, self.compresslevel) as f:
+            f.write(data)
+
+        info = tarfile.TarInfo(
+            f"{self.archive_date.strftime('%Y-%m-%d')}/{self.table_name}"
+            f".{time.time_ns()}.jsonl{CODEC_SUFFIXES[self.codec]}"
+        )
+        info.size = compressed.tell()
+        info.mtime = int(time.time())
+        compressed.seek(0)
+
+        with open_cold_tar(self.archive_file) as tar:
+            offset = tar.offset
+            try:
+                tar.addfile(info, compressed)
+                tar.fileobj.flush()
+                os.fsync(tar.fileobj.fileno())
+            except BaseException:
+                # Drop the partial member so the next append starts cleanly
+                tar.fileobj.seek(offset)
+                tar.fileobj.truncate()
+                tar.offset = offset
+                if tar.members and tar.members[-1] is info:
+                    tar.members.pop()
+                raise
+
+        self._file = io.BytesIO()
+
 
 class ArchiveReader:
     """Reads records from JSONL archive files."""
 
     def __init__(self, archive_path: Path):
         self.archive_path = archive_path
-        self.compressed = archive_path.suffix == ".gz"
+        self.codec = _SUFFIX_CODECS.get(archive_path.suffix)
+        self.compressed = self.codec is not None
 
     def __iter__(self) -> Iterator[Dict[str, Any]]:
         """Iterate over records in the archive."""
-        opener = gzip.open if self.compressed else open
+        if self.compressed:
+            f = open_compressed(self.archive_path, "rt", self.codec, encoding="utf-8")
+        else:
+            f = open(self.archive_path, "rt", encoding="utf-8")
 
-        with opener(self.archive_path, "rt", encoding="utf-8") as f:
+        with f:
             for line in f:
                 if line.strip():
                     yield json.loads(line)
 
     def count(self) -> int:
-        """Count records in the archive."""
-        return sum(1 for _ in self)
+        """
+        Count records in the archive without decoding them.
+
+        Counts newlines in large chunks rather than iterating lines, which
+        the zstd reader does not support. Empty lines are not records; a
+        last record without a trailing newline is.
+        """
+        if self.compressed:
+            f = open_compressed(self.archive_path, "rb", self.codec)
+        else:
+            f = open(self.archive_path, "rb")
+
+        records = 0
+        last = b"\n"  # A newline at the very start ends an empty line
+        with f:
+            while True:
+                chunk = f.read(1 << 20)
+                if not chunk:
+                    break
+                records += chunk.count(b"\n") - len(_BLANK_LINE.findall(last + chunk))
+                last = chunk[-1:]
+        if last != b"\n":
+            records += 1
+        return records
 
     def read_all(self) -> List[Dict[str, Any]]:
         """Read all records into memory."""
         return list(self)
 
 
-def list_archives(
+def parse_archive_date(name: str) -> datetime:
+    """
+    Parse a warm archive directory name ("2025-01-15").
+
+    Equivalent to ``datetime.strptime(name, "%Y-%m-%d")`` for these names,
+    without strptime's per-call format handling. Raises ValueError for
+    anything else.
+    """
+    if len(name) != 10 or name[4] != "-" or name[7] != "-":
+        raise ValueError(f"not a YYYY-MM-DD date: {name!r}")
+    return datetime(int(name[:4]), int(name[5:7]), int(name[8:]))
+
+
+def parse_archive_month(name: str) -> datetime:
+    """Parse a cold archive month ("2025-01"); raises ValueError otherwise."""
+    if len(name) != 7 or name[4] != "-":
+        raise ValueError(f"not a YYYY-MM month: {name!r}")
+    return datetime(int(name[:4]), int(name[5:]), 1)
+
+
+def parse_cold_archive_name(name: str) -> Tuple[datetime, Optional[str]]:
+    """
+    Parse a cold archive file name into (month, table).
+
+    Monthly tarballs ("2025-01.tar", "2025-01.tar.gz") mix tables, so their
+    table is None; per-table Parquet files ("2025-01.tool_uses.parquet")
+    name theirs. Raises ValueError for anything else.
+    """
+    month, _, rest = name.partition(".")
+    archive_month = parse_archive_month(month)
+    if rest.endswith(".parquet"):
+        return archive_month, rest[:-len(".parquet")]
+    if rest == "tar" or rest.startswith("tar."):
+        return archive_month, None
+    raise ValueError(f"not a cold archive name: {name!r}")
+
+
+def _scan_archives(
     base_path: Path,
     table_name: Optional[str] = None,
     after_date: Optional[datetime] = None,
     before_date: Optional[datetime] = None
-) -> List[Path]:
-    """List archive files matching criteria."""
-    archives = []
+) -> Iterator[Tuple[str, os.DirEntry]]:
+    """
+    Yield (date directory name, directory entry) for matching archive files.
 
+    Uses os.scandir so file type and stat results come from the directory
+    listing instead of a separate syscall per path.
+    """
     if not base_path.exists():
-        return archives
+        return
 
-    for date_dir in sorted(base_path.iterdir()):
-        if not date_dir.is_dir():
-            continue
+    with os.scandir(base_path) as it:
+        date_dirs = sorted(
+            (e for e in it if e.is_dir(follow_symlinks=False)),
+            key=lambda e: e.name
+        )
 
+    for date_dir in date_dirs:
         # Parse date from directory name
         try:
-            dir_date = datetime.strptime(date_dir.name, "%Y-%m-%d")
+            dir_date = parse_archive_date(date_dir.name)
         except ValueError:
             continue
 
@@ -138,106 +503,146 @@ def list_archives(
             continue
 
         # Find matching files
-        for archive_file in date_dir.iterdir():
-            if not archive_file.is_file():
-                continue
+        with os.scandir(date_dir.path) as files:
+            for entry in files:
+                # d_type from the listing; no stat for regular files
+                if not entry.is_file(follow_symlinks=False):
+                    continue
 
-            # Check table name
-            file_table = archive_file.name.split(".")[0]
-            if table_name and file_table != table_name:
-                continue
+                # Check table name
+                file_table = entry.name.partition(".")[0]
+                if table_name and file_table != table_name:
+                    continue
 
-            archives.append(archive_file)
+                yield date_dir.name, entry
 
-    return archives
 
+def list_archives(
+    base_path: Path,
+    table_name: Optional[str] = None,
+    after_date: Optional[datetime] = None,
+    before_date: Optional[datetime] = None
+) -> List[Path]:
+    """List archive files matching criteria."""
+    return [
+        Path(entry.path)
+        for _, entry in _scan_archives(base_path, table_name, after_date, before_date)
+    ]
 
-def get_archive_stats(base_path: Path) -> Dict[str, Any]:
-    """Get statistics about archives (warm storage with JSONL files)."""
-    stats = {
-        "total_files": 0,
-        "total_size_bytes": 0,
-        "by_table": {},
-        "by_date": {},
-        "oldest_archive": None,
-        "newest_archive": None,
-    }
 
-    if not base_path.exists():
-        return stats
-
-    for archive_file in list_archives(base_path):
-        stats["total_files"] += 1
-        stats["total_size_bytes"] += archive_file.stat().st_size
-
-        # By table
-        table_name = archive_file.name.split(".")[0]
-        if table_name not in stats["by_table"]:
-            stats["by_table"][table_name] = {"files": 0, "size_bytes": 0}
-        stats["by_table"][table_name]["files"] += 1
-        stats["by_table"][table_name]["size_bytes"] += archive_file.stat().st_size
-
-        # By date
-        date_str = archive_file.parent.name
-        if date_str not in stats["by_date"]:
-            stats["by_date"][date_str] = {"files": 0, "size_bytes": 0}
-        stats["by_date"][date_str]["files"] += 1
-        stats["by_date"][date_str]["size_bytes"] += archive_file.stat().st_size
-
-        # Track oldest/newest
-        if stats["oldest_archive"] is None or date_str < stats["oldest_archive"]:
-            stats["oldest_archive"] = date_str
-        if stats["newest_archive"] is None or date_str > stats["newest_archive"]:
-            stats["newest_archive"] = date_str
+def get_archive_stats(
+    base_path: Path,
+    eligible_cutoff: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    Get statistics about archives (warm storage with JSONL files).
+
+    With ``eligible_cutoff``, also counts files dated before it under
+    ``"eligible"`` in the same pass over the tree.
+    """
+    # [files, size_bytes] per key; converted to dicts once at the end
+    by_table = defaultdict(lambda: [0, 0])
+    by_date = defaultdict(lambda: [0, 0])
+
+    for date_str, archive_file in _scan_archives(base_path):
+        file_size = archive_file.stat().st_size
+
+        entry = by_table[archive_file.name.partition(".")[0]]
+        entry[0] += 1
+        entry[1] += file_size
+
+        entry = by_date[date_str]
+        entry[0] += 1
+        entry[1] += file_size
+
+    stats = _summarize(by_date, "by_table", by_table, "by_date")
+    if eligible_cutoff is not None:
+        # Dates repeat for every table, so check each date once
+        stats["eligible"] = sum(
+            files for date_str, (files, _) in by_date.items()
+            if parse_archive_date(date_str) < eligible_cutoff
+        )
 
     return stats
 
 
-def get_cold_storage_stats(base_path: Path) -> Dict[str, Any]:
-    """Get statistics about cold storage (monthly tar.gz files)."""
-    stats = {
-        "total_files": 0,
-        "total_size_bytes": 0,
-        "by_year": {},
-        "by_month": {},
-        "oldest_archive": None,
-        "newest_archive": None,
+def _summarize(
+    by_period: Dict[str, List[int]],
+    group_key: str,
+    groups: Dict[str, List[int]],
+    period_key: str
+) -> Dict[str, Any]:
+    """Build a stats dict from [files, size_bytes] tallies per period and group."""
+    def as_dicts(tallies: Dict[str, List[int]]) -> Dict[str, Dict[str, int]]:
+        return {
+            key: {"files": files, "size_bytes": size}
+            for key, (files, size) in tallies.items()
+        }
+
+    return {
+        "total_files": sum(files for files, _ in by_period.values()),
+        "total_size_bytes": sum(size for _, size in by_period.values()),
+        group_key: as_dicts(groups),
+        period_key: as_dicts(by_period),
+        "oldest_archive": min(by_period, default=None),
+        "newest_archive": max(by_period, default=None),
     }
 
-    if not base_path.exists():
-        return stats
 
-    for year_dir in base_path.iterdir():
-        if not year_dir.is_dir():
-            continue
+def _scan_cold_archives(year_dir: Path) -> List[os.DirEntry]:
+    """Directory entries for the cold archives in a year directory, by name."""
+    with os.scandir(year_dir) as it:
+        return sorted(
+            (
+                e for e in it
+                if not e.name.startswith(".")
+                and (".tar" in e.name or e.name.endswith(".parquet"))
+                and e.is_file(follow_symlinks=False)
+            ),
+            key=lambda e: e.name
+        )
+
+
+def list_cold_archives(year_dir: Path) -> List[Path]:
+    """
+    List cold archives in a year directory.
+
+    Cold archives are either monthly tarballs (``2025-01.tar`` or
+    ``2025-01.tar.gz``) or per-table Parquet files
+    (``2025-01.tool_uses.parquet``); in all cases the month is the part of
+    the name before the first dot.
+    """
+    return [Path(entry.path) for entry in _scan_cold_archives(year_dir)]
 
+
+def get_cold_storage_stats(base_path: Path) -> Dict[str, Any]:
+    """Get statistics about cold storage (monthly tarballs or Parquet files)."""
+    # [files, size_bytes] per key; converted to dicts once at the end
+    by_year = defaultdict(lambda: [0, 0])
+    by_month = defaultdict(lambda: [0, 0])
+
+    if base_path.exists():
+        with os.scandir(base_path) as it:
+            year_dirs = [e for e in it if e.is_dir(follow_symlinks=False)]
+    else:
+        year_dirs = []
+
+    for year_dir in year_dirs:
         try:
-            year = int(year_dir.name)
+            int(year_dir.name)
         except ValueError:
             continue
 
-        for tar_file in year_dir.glob("*.tar.gz"):
-            stats["total_files"] += 1
+        for tar_file in _scan_cold_archives(year_dir.path):
             file_size = tar_file.stat().st_size
-            stats["total_size_bytes"] += file_size
-
-            # By year
-            if year_dir.name not in stats["by_year"]:
-                stats["by_year"][year_dir.name] = {"files": 0, "size_bytes": 0}
-            stats["by_year"][year_dir.name]["files"] += 1
-            stats["by_year"][year_dir.name]["size_bytes"] += file_size
-
-            # By month (e.g., "2025-01" from "2025-01.tar.gz")
-            month_str = tar_file.stem.replace(".tar", "")
-            if month_str not in stats["by_month"]:
-                stats["by_month"][month_str] = {"files": 0, "size_bytes": 0}
-            stats["by_month"][month_str]["files"] += 1
-            stats["by_month"][month_str]["size_bytes"] += file_size
-
-            # Track oldest/newest
-            if stats["oldest_archive"] is None or month_str < stats["oldest_archive"]:
-                stats["oldest_archive"] = month_str
-            if stats["newest_archive"] is None or month_str > stats["newest_archive"]:
-                stats["newest_archive"] = month_str
 
-    return stats
+            entry = by_year[year_dir.name]
+            entry[0] += 1
+            entry[1] += file_size
+
+            # By month (e.g., "2025-01" from "2025-01.tar")
+            entry = by_month[tar_file.name.partition(".")[0]]
+            entry[0] += 1
+            entry[1] += file_size
+
+    return _summarize(by_month, "by_year", by_year, "by_month")
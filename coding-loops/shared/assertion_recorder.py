@@ -2,20 +2,138 @@
 AssertionRecorder - Records test assertions with evidence linking.
 """
 
+import itertools
 import json
 import os
+import queue
 import sqlite3
 import subprocess
+import threading
+import time
 import uuid
-from dataclasses import dataclass, field, asdict
-from datetime import datetime
+import weakref
+from dataclasses import dataclass, field, fields
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, NamedTuple, Optional
 
+from database.queries import now_iso
 from .transcript_writer import TranscriptWriter
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 PROJECT_ROOT = Path(__file__).parent.parent.parent
+_PROJECT_ROOT_STR = str(PROJECT_ROOT)
+
+# Per-connection settings for the recorder's long-lived connection.
+# journal_mode is left alone: it is persistent, and ideas.db is also opened
+# by sql.js, which reads the main file only.
+RECORDER_PRAGMAS = (
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",  # 64 MiB
+)
+
+# Each multi-row INSERT size is a distinct statement, so keep more of them
+# prepared than sqlite3's default of 128.
+CACHED_STATEMENTS = 256
+
+# The background writer stops waiting for more writes once this many are
+# batched, or once FLUSH_INTERVAL seconds have passed since the first.
+FLUSH_THRESHOLD = 64
+FLUSH_INTERVAL = 0.1
+# Bound on queued writes; callers block briefly if the writer falls behind
+WRITE_QUEUE_SIZE = 4096
+
+# execution_id and wave_id are the same for every row a recorder writes, so
+# they are bound once per statement as ?1 and ?2; each row then binds only
+# the columns that vary (a bare ? numbers itself after the highest so far).
+INSERT_ASSERTION_SQL = """
+    INSERT INTO assertion_results (
+        execution_id, wave_id, id, task_id, category,
+        description, result, evidence, chain_id,
+        chain_position, timestamp
+    ) VALUES """
+ASSERTION_ROW_PARAMS = 9
+ASSERTION_ROW = "(?1, ?2, " + ", ".join("?" * ASSERTION_ROW_PARAMS) + ")"
+
+
+# Characters of stdout/stderr kept as assertion evidence
+OUTPUT_CAP = 2000
+
+
+def _drain(pipe, cap: int, out: List[bytes]) -> None:
+    """Read a pipe to EOF, keeping only its first ``cap`` bytes."""
+    kept = 0
+    with pipe:
+        for chunk in iter(lambda: pipe.read(65536), b""):
+            if kept < cap:
+                out.append(chunk[:cap - kept])
+                kept += len(out[-1])
+
+
+def _run_bounded(
+    cmd, timeout: float, shell: bool = False, cap: int = OUTPUT_CAP
+) -> subprocess.CompletedProcess:
+    """
+    Run a command like subprocess.run(capture_output=True, text=True), but
+    keep only the first ``cap`` characters of stdout and stderr.
+
+    The pipes are still drained so the child never blocks on a full pipe,
+    but memory stays bounded however much a tool prints.
+
+    Raises:
+        subprocess.TimeoutExpired: If the command runs longer than timeout
+    """
+    # A character is at most 4 bytes of UTF-8
+    byte_cap = cap * 4
+    proc = subprocess.Popen(
+        cmd,
+        shell=shell,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        cwd=str(PROJECT_ROOT)
+    )
+    out: List[bytes] = []
+    err: List[bytes] = []
+    readers = [
+        threading.Thread(target=_drain, args=(proc.stdout, byte_cap, out), daemon=True),
+        threading.Thread(target=_drain, args=(proc.stderr, byte_cap, err), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+    try:
+        returncode = proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        raise
+    finally:
+        # Grandchildren may still hold the pipes open after a kill
+        for reader in readers:
+            reader.join(timeout=5)
+
+    def decode(chunks: List[bytes]) -> str:
+        return b"".join(chunks).decode("utf-8", errors="replace")[:cap]
+
+    return subprocess.CompletedProcess(cmd, returncode, decode(out), decode(err))
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize to a JSON string, with orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def _stop_writer(write_queue: "queue.Queue[Any]", writer: threading.Thread) -> None:
+    """Queue the stop sentinel and wait for the writer to commit the rest."""
+    write_queue.put(None)
+    writer.join()
 
 
 class AssertionCategory(str, Enum):
@@ -40,7 +158,7 @@ class AssertionResult(str, Enum):
     WARN = "warn"
 
 
-@dataclass
+@dataclass(slots=True)
 class AssertionEvidence:
     """Evidence collected for an assertion."""
     command: Optional[str] = None
@@ -51,8 +169,24 @@ class AssertionEvidence:
     file_exists: Optional[bool] = None
     error_message: Optional[str] = None
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict of the fields (cheaper than dataclasses.asdict)."""
+        return {
+            "command": self.command,
+            "exit_code": self.exit_code,
+            "stdout": self.stdout,
+            "stderr": self.stderr,
+            "file_path": self.file_path,
+            "file_exists": self.file_exists,
+            "error_message": self.error_message,
+        }
+
+
+# Keys of assert_manual()'s evidence_details that map onto evidence fields
+_EVIDENCE_FIELDS = frozenset(f.name for f in fields(AssertionEvidence))
 
-@dataclass
+
+@dataclass(slots=True)
 class ChainResult:
     """Result of an assertion chain."""
     overall_result: str
@@ -61,14 +195,42 @@ class ChainResult:
     first_failure_id: Optional[str]
 
 
+class _Statement(NamedTuple):
+    """A single write queued for the background writer."""
+    sql: str
+    params: tuple
+    action: str  # For the warning if it fails, e.g. "start assertion chain"
+
+
 class AssertionRecorder:
     """
     Records test assertions with evidence linking.
 
     Supports assertion chains that group related assertions,
     tracking pass/fail counts and computing overall results.
+
+    Database writes are queued to a background thread that commits them
+    in batches, so recording an assertion does not wait on SQLite.
+    end_chain(), flush() and close() wait for the queue to drain; writes
+    still queued when the interpreter exits are committed by a finalizer.
     """
 
+    __slots__ = (
+        "transcript",
+        "execution_id",
+        "db_path",
+        "_current_chain_id",
+        "_chain_pass_count",
+        "_chain_fail_count",
+        "_first_failure_id",
+        "_chain_position",
+        "_conn",
+        "_queue",
+        "_writer",
+        "_stop",
+        "__weakref__",
+    )
+
     def __init__(
         self,
         transcript_writer: TranscriptWriter,
@@ -93,11 +255,147 @@ class AssertionRecorder:
         self._first_failure_id: Optional[str] = None
         self._chain_position: int = 0
 
+        # Owned by the writer thread while it runs
+        self._conn: Optional[sqlite3.Connection] = None
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        self._writer: Optional[threading.Thread] = None
+        # Stops the writer once; also run at interpreter exit, since the
+        # writer is a daemon thread and would die with its queue unwritten
+        self._stop: Optional[weakref.finalize] = None
+
     def _get_connection(self) -> sqlite3.Connection:
-        """Get database connection."""
-        conn = sqlite3.connect(str(self.db_path), timeout=30.0)
-        conn.execute("PRAGMA foreign_keys = ON")
-        return conn
+        """Get the recorder's database connection, opening it on first use."""
+        if self._conn is None:
+            self._conn = sqlite3.connect(
+                str(self.db_path),
+                timeout=30.0,
+                check_same_thread=False,
+                cached_statements=CACHED_STATEMENTS
+            )
+            # Once per connection, as a single script
+            self._conn.executescript(";\n".join(RECORDER_PRAGMAS))
+        return self._conn
+
+    def _insert_rows(self, conn: sqlite3.Connection, rows: List[tuple]) -> None:
+        """Insert assertion rows without committing."""
+        # One multi-row INSERT per chunk instead of a step per row, kept
+        # under the connection's bound-parameter limit.
+        max_rows = max(
+            1,
+            (conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER) - 2)
+            // ASSERTION_ROW_PARAMS
+        )
+        shared = (self.execution_id, self.transcript.wave_id)
+        for start in range(0, len(rows), max_rows):
+            chunk = rows[start:start + max_rows]
+            conn.execute(
+                INSERT_ASSERTION_SQL + ", ".join([ASSERTION_ROW] * len(chunk)),
+                list(itertools.chain(shared, *chunk))
+            )
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[Any]) -> None:
+        """Apply queued writes in order and commit them as one transaction."""
+        rows: List[tuple] = []
+        action = "record assertions"
+        try:
+            for item in batch:
+                if isinstance(item, _Statement):
+                    action = "record assertions"
+                    self._insert_rows(conn, rows)
+                    rows = []
+                    action = item.action
+                    conn.execute(item.sql, item.params)
+                elif isinstance(item, tuple):
+                    rows.append(item)
+            action = "record assertions"
+            self._insert_rows(conn, rows)
+            conn.commit()
+        except Exception as e:
+            # Anything escaping here would kill the writer and hang flush()
+            conn.rollback()
+            print(f"Warning: Failed to {action} in DB: {e}")
+
+    def _run_writer(self) -> None:
+        """Writer thread: commit queued writes in batches until stopped."""
+        try:
+            conn = self._get_connection()
+        except sqlite3.Error as e:
+            # Keep draining so flush() and close() still return
+            print(f"Warning: Failed to open assertion DB: {e}")
+            conn = None
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            # Gather more writes, but answer flush/stop requests right away.
+            # Writes already queued always join the batch, so a chain's
+            # closing UPDATE shares the commit of its last assertions;
+            # the threshold and interval only limit how long to wait.
+            while isinstance(batch[-1], tuple):
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except queue.Empty:
+                    pass
+                timeout = deadline - time.monotonic()
+                if len(batch) >= FLUSH_THRESHOLD or timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            if conn is not None:
+                self._write_batch(conn, batch)
+
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+            if batch[-1] is None:
+                return
+
+    def _submit(self, item: Any) -> None:
+        """Queue a write, starting the writer thread on first use."""
+        if self._writer is None:
+            self._writer = threading.Thread(
+                target=self._run_writer, name="assertion-writer", daemon=True
+            )
+            self._writer.start()
+            self._stop = weakref.finalize(
+                self, _stop_writer, self._queue, self._writer
+            )
+        self._queue.put(item)
+
+    def flush(self) -> None:
+        """Wait until every queued write has been committed."""
+        if self._writer is None:
+            return
+        done = threading.Event()
+        self._submit(done)
+        done.wait()
+
+    def close(self) -> None:
+        """Drain the write queue, stop the writer and close the connection."""
+        if self._current_chain_id is not None:
+            # Chain left open: stop holding back its transcript entries
+            self._current_chain_id = None
+            self.transcript.release_flush()
+        if self._writer is not None:
+            self._stop()
+            self._writer = None
+            self._stop = None
+        if self._conn is not None:
+            try:
+                self._conn.commit()
+            finally:
+                self._conn.close()
+                self._conn = None
+
+    def __enter__(self) -> "AssertionRecorder":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
 
     def start_chain(self, task_id: str, description: str) -> str:
         """
@@ -111,36 +409,32 @@ class AssertionRecorder:
             chain_id
         """
         chain_id = str(uuid.uuid4())
+        if self._current_chain_id is None:
+            # Flush the chain's transcript entries together at end_chain()
+            self.transcript.hold_flush()
         self._current_chain_id = chain_id
         self._chain_pass_count = 0
         self._chain_fail_count = 0
         self._first_failure_id = None
         self._chain_position = 0
 
-        conn = self._get_connection()
-        try:
-            conn.execute("""
-                INSERT INTO assertion_chains (
-                    id, task_id, execution_id, description,
-                    overall_result, pass_count, fail_count,
-                    started_at, wave_id
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                chain_id,
-                task_id,
-                self.execution_id,
-                description,
-                "pending",
-                0,
-                0,
-                datetime.utcnow().isoformat() + "Z",
-                self.transcript.wave_id
-            ))
-            conn.commit()
-        except sqlite3.Error as e:
-            print(f"Warning: Failed to start assertion chain in DB: {e}")
-        finally:
-            conn.close()
+        self._submit(_Statement("""
+            INSERT INTO assertion_chains (
+                id, task_id, execution_id, description,
+                overall_result, pass_count, fail_count,
+                started_at, wave_id
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            chain_id,
+            task_id,
+            self.execution_id,
+            description,
+            "pending",
+            0,
+            0,
+            now_iso(suffix="Z"),
+            self.transcript.wave_id
+        ), "start assertion chain"))
 
         return chain_id
 
@@ -161,29 +455,25 @@ class AssertionRecorder:
         else:
             overall = "skip"
 
-        conn = self._get_connection()
-        try:
-            conn.execute("""
-                UPDATE assertion_chains SET
-                    overall_result = ?,
-                    pass_count = ?,
-                    fail_count = ?,
-                    first_failure_id = ?,
-                    completed_at = ?
-                WHERE id = ?
-            """, (
-                overall,
-                self._chain_pass_count,
-                self._chain_fail_count,
-                self._first_failure_id,
-                datetime.utcnow().isoformat() + "Z",
-                chain_id
-            ))
-            conn.commit()
-        except sqlite3.Error as e:
-            print(f"Warning: Failed to end assertion chain in DB: {e}")
-        finally:
-            conn.close()
+        # Queued behind the chain's assertions, so the writer commits the
+        # last of them and the final counts together
+        self._submit(_Statement("""
+            UPDATE assertion_chains SET
+                overall_result = ?,
+                pass_count = ?,
+                fail_count = ?,
+                first_failure_id = ?,
+                completed_at = ?
+            WHERE id = ?
+        """, (
+            overall,
+            self._chain_pass_count,
+            self._chain_fail_count,
+            self._first_failure_id,
+            now_iso(suffix="Z"),
+            chain_id
+        ), "end assertion chain"))
+        self.flush()
 
         result = ChainResult(
             overall_result=overall,
@@ -192,9 +482,24 @@ class AssertionRecorder:
             first_failure_id=self._first_failure_id
         )
 
-        self._current_chain_id = None
+        if self._current_chain_id is not None:
+            self._current_chain_id = None
+            self.transcript.release_flush()
         return result
 
+    def _exists(self, file_path: str) -> bool:
+        """
+        Check whether a file exists, relative paths being resolved against
+        the project root.
+
+        Always checks the filesystem: an assertion must see the file as it
+        is now. Plain os.path calls avoid building Path objects for a
+        one-off check.
+        """
+        if not os.path.isabs(file_path):
+            file_path = os.path.join(_PROJECT_ROOT_STR, file_path)
+        return os.path.exists(file_path)
+
     def _record_assertion(
         self,
         task_id: str,
@@ -230,46 +535,33 @@ class AssertionRecorder:
         position = self._chain_position
         self._chain_position += 1
 
+        evidence_dict = evidence.to_dict()
+
         # Write transcript entry
         self.transcript.write({
             "entry_type": "assertion",
             "category": "validation",
             "task_id": task_id,
             "summary": f"Assertion {result}: {description[:150]}",
-            "details": json.dumps({
+            "details": _dumps({
                 "category": category,
                 "result": result,
-                "evidence": asdict(evidence)
+                "evidence": evidence_dict
             })
         })
 
-        # Insert assertion result
-        conn = self._get_connection()
-        try:
-            conn.execute("""
-                INSERT INTO assertion_results (
-                    id, task_id, execution_id, category,
-                    description, result, evidence, chain_id,
-                    chain_position, timestamp, wave_id
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                assertion_id,
-                task_id,
-                self.execution_id,
-                category,
-                description,
-                result,
-                json.dumps(asdict(evidence)),
-                self._current_chain_id,
-                position,
-                datetime.utcnow().isoformat() + "Z",
-                self.transcript.wave_id
-            ))
-            conn.commit()
-        except sqlite3.Error as e:
-            print(f"Warning: Failed to record assertion in DB: {e}")
-        finally:
-            conn.close()
+        # Queue the row for the background writer
+        self._submit((
+            assertion_id,
+            task_id,
+            category,
+            description,
+            result,
+            _dumps(evidence_dict),
+            self._current_chain_id,
+            position,
+            now_iso(suffix="Z")
+        ))
 
         return assertion_id
 
@@ -284,11 +576,7 @@ class AssertionRecorder:
         Returns:
             assertion_id
         """
-        full_path = Path(file_path)
-        if not full_path.is_absolute():
-            full_path = PROJECT_ROOT / file_path
-
-        exists = full_path.exists()
+        exists = self._exists(file_path)
         evidence = AssertionEvidence(
             file_path=str(file_path),
             file_exists=exists
@@ -314,11 +602,7 @@ class AssertionRecorder:
         Returns:
             assertion_id
         """
-        full_path = Path(file_path)
-        if not full_path.is_absolute():
-            full_path = PROJECT_ROOT / file_path
-
-        exists = full_path.exists()
+        exists = self._exists(file_path)
         evidence = AssertionEvidence(
             file_path=str(file_path),
             file_exists=exists
@@ -344,11 +628,7 @@ class AssertionRecorder:
         Returns:
             assertion_id
         """
-        full_path = Path(file_path)
-        if not full_path.is_absolute():
-            full_path = PROJECT_ROOT / file_path
-
-        exists = full_path.exists()
+        exists = self._exists(file_path)
         evidence = AssertionEvidence(
             file_path=str(file_path),
             file_exists=exists
@@ -374,18 +654,15 @@ class AssertionRecorder:
             assertion_id
         """
         try:
-            result = subprocess.run(
+            result = _run_bounded(
                 ["npx", "tsc", "--noEmit"],
-                capture_output=True,
-                text=True,
-                timeout=120,
-                cwd=str(PROJECT_ROOT)
+                timeout=120
             )
             evidence = AssertionEvidence(
                 command="npx tsc --noEmit",
                 exit_code=result.returncode,
-                stdout=result.stdout[:2000] if result.stdout else None,
-                stderr=result.stderr[:2000] if result.stderr else None
+                stdout=result.stdout or None,
+                stderr=result.stderr or None
             )
             status = "pass" if result.returncode == 0 else "fail"
         except subprocess.TimeoutExpired:
@@ -420,18 +697,15 @@ class AssertionRecorder:
             assertion_id
         """
         try:
-            result = subprocess.run(
+            result = _run_bounded(
                 ["npm", "run", "lint"],
-                capture_output=True,
-                text=True,
-                timeout=60,
-                cwd=str(PROJECT_ROOT)
+                timeout=60
             )
             evidence = AssertionEvidence(
                 command="npm run lint",
                 exit_code=result.returncode,
-                stdout=result.stdout[:2000] if result.stdout else None,
-                stderr=result.stderr[:2000] if result.stderr else None
+                stdout=result.stdout or None,
+                stderr=result.stderr or None
             )
             status = "pass" if result.returncode == 0 else "fail"
         except Exception as e:
@@ -465,18 +739,15 @@ class AssertionRecorder:
             cmd.extend(["--", pattern])
 
         try:
-            result = subprocess.run(
+            result = _run_bounded(
                 cmd,
-                capture_output=True,
-                text=True,
-                timeout=180,
-                cwd=str(PROJECT_ROOT)
+                timeout=180
             )
             evidence = AssertionEvidence(
                 command=" ".join(cmd),
                 exit_code=result.returncode,
-                stdout=result.stdout[:2000] if result.stdout else None,
-                stderr=result.stderr[:2000] if result.stderr else None
+                stdout=result.stdout or None,
+                stderr=result.stderr or None
             )
             status = "pass" if result.returncode == 0 else "fail"
         except Exception as e:
@@ -516,19 +787,16 @@ class AssertionRecorder:
             assertion_id
         """
         try:
-            result = subprocess.run(
+            result = _run_bounded(
                 command,
-                shell=True,
-                capture_output=True,
-                text=True,
                 timeout=timeout,
-                cwd=str(PROJECT_ROOT)
+                shell=True
             )
             evidence = AssertionEvidence(
                 command=command,
                 exit_code=result.returncode,
-                stdout=result.stdout[:2000] if result.stdout else None,
-                stderr=result.stderr[:2000] if result.stderr else None
+                stdout=result.stdout or None,
+                stderr=result.stderr or None
             )
             status = "pass" if result.returncode == 0 else "fail"
         except subprocess.TimeoutExpired:
@@ -573,11 +841,11 @@ class AssertionRecorder:
         Returns:
             assertion_id
         """
-        evidence = AssertionEvidence()
-        if evidence_details:
-            for key, value in evidence_details.items():
-                if hasattr(evidence, key):
-                    setattr(evidence, key, value)
+        evidence = AssertionEvidence(**{
+            key: value
+            for key, value in (evidence_details or {}).items()
+            if key in _EVIDENCE_FIELDS
+        })
 
         result = "pass" if passed else "fail"
         return self._record_assertion(
@@ -6,9 +6,10 @@ Moves old records from SQLite to JSONL archives based on retention policies.
 """
 
 import sqlite3
+from contextlib import ExitStack, nullcontext
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import logging
 
 from .archive_config import (
@@ -18,30 +19,166 @@ from .archive_config import (
     get_policy,
     is_exempt
 )
-from .archive_writer import ArchiveWriter
+from .archive_writer import ArchiveWriter, ColdStreamingWriter
 
 logger = logging.getLogger(__name__)
 
+# Connection tuning for large sequential scans and batched deletes. All of
+# these are per-connection. journal_mode is only changed when config.wal is
+# set: it is persistent, and ideas.db is also opened by sql.js, which reads
+# the main file only.
+ARCHIVE_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456",  # 256 MiB
+    "PRAGMA cache_size = -65536",  # 64 MiB
+)
+
 
 class DatabaseArchiver:
     """Archives old database records to JSONL files."""
 
-    def __init__(self, config: Optional[ArchiveConfig] = None):
+    def __init__(
+        self,
+        config: Optional[ArchiveConfig] = None,
+        on_table_done: Optional[Callable[[Dict[str, Any]], None]] = None
+    ):
         self.config = config or ArchiveConfig.default()
+        # Called with each table's result once that table is done and its
+        # deletes are committed (or rolled back)
+        self.on_table_done = on_table_done
         self.config.ensure_directories()
         self._conn: Optional[sqlite3.Connection] = None
+        self._indexes_checked = False
+        # Set while archive_tables() shares one transaction across tables
+        self._shared_txn = False
+        self._uncommitted_rows = 0
+        # Deleted but uncommitted rows by table, and rows that a rollback
+        # put back in the database, by table, until they are reported
+        self._uncommitted_tables: Dict[str, int] = {}
+        self._rolled_back: Dict[str, int] = {}
+        # Warm writers kept open across archive_tables(), by table name;
+        # synced only right before a commit instead of after every batch
+        self._writer_pool: Optional[Dict[str, ArchiveWriter]] = None
+        self._writer_stack: Optional[ExitStack] = None
 
     def __enter__(self) -> "DatabaseArchiver":
         """Open database connection."""
-        self._conn = sqlite3.connect(str(self.config.db_path))
+        # Autocommit mode so each batch can take the write lock up front
+        # with an explicit BEGIN IMMEDIATE.
+        self._conn = sqlite3.connect(str(self.config.db_path), isolation_level=None)
         self._conn.row_factory = sqlite3.Row
+        if self.config.wal:
+            self._conn.execute("PRAGMA journal_mode = WAL")
+        for pragma in ARCHIVE_PRAGMAS:
+            self._conn.execute(pragma)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Close database connection."""
         if self._conn:
+            # Fold the archival writes back into the main file so the WAL
+            # does not stay at the size of the largest batch.
+            journal_mode = self._conn.execute("PRAGMA journal_mode").fetchone()[0]
+            if journal_mode == "wal":
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
             self._conn.close()
 
+    def ensure_timestamp_indexes(self) -> List[str]:
+        """
+        Make sure every archivable table has an index on its timestamp column.
+
+        Archival deletes by ``timestamp_column < ?``; without an index each
+        batch is a full table scan. Tables that are missing or already have
+        an index leading with the column are left alone, so this is safe to
+        call on every run. Called automatically before the first real
+        (non dry-run) archive of a session.
+
+        Returns:
+            Names of the indexes that were created
+        """
+        existing_tables = {
+            row["name"] for row in self._conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
+            )
+        }
+
+        missing = [
+            (table_name, policy.timestamp_column)
+            for table_name, policy in RETENTION_POLICIES.items()
+            if table_name in existing_tables
+            and not self._has_leading_index(table_name, policy.timestamp_column)
+        ]
+
+        created = []
+        if missing:
+            # All indexes in one transaction: a single commit, and a failure
+            # leaves none of them half-built.
+            own_txn = not self._conn.in_transaction
+            if own_txn:
+                self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for table_name, column in missing:
+                    # The index also carries the rowid, so it covers the
+                    # batch and stats queries on its own.
+                    index_name = f"idx_{table_name}_{column}"
+                    self._conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS {index_name} "
+                        f"ON {table_name}({column})"
+                    )
+                    # Planner statistics for the new index only; a bare
+                    # ANALYZE would rescan every table in the database.
+                    self._conn.execute(f"ANALYZE {index_name}")
+                    created.append(index_name)
+                if own_txn:
+                    self._conn.commit()
+            except BaseException:
+                if own_txn:
+                    self._conn.rollback()
+                raise
+            for index_name in created:
+                logger.info(f"Created archival index {index_name}")
+
+        for table_name, policy in RETENTION_POLICIES.items():
+            if table_name in existing_tables:
+                self._check_query_plan(table_name, policy.timestamp_column)
+
+        self._indexes_checked = True
+        return created
+
+    def _has_leading_index(self, table_name: str, column: str) -> bool:
+        """Check whether any index on the table starts with the given column."""
+        for index in self._conn.execute(f"PRAGMA index_list({table_name})"):
+            info = self._conn.execute(
+                f"PRAGMA index_info({index['name']})"
+            ).fetchone()
+            if info is not None and info["name"] == column:
+                return True
+        return False
+
+    def _check_query_plan(self, table_name: str, column: str) -> None:
+        """
+        Log how SQLite plans the archival batch query for a table.
+
+        Batches are taken oldest first with ``ORDER BY column LIMIT n``.
+        Served from the timestamp index, each batch starts at the first
+        row still present (earlier batches are deleted), so it costs
+        O(batch). Warns if the planner would sort the matching rows instead,
+        which makes every batch O(rows before the cutoff).
+        """
+        plan = self._conn.execute(
+            f"EXPLAIN QUERY PLAN SELECT rowid FROM {table_name} "
+            f"WHERE {column} < ? ORDER BY {column} LIMIT ?",
+            ("", 1)
+        ).fetchall()
+        details = "; ".join(row["detail"] for row in plan)
+        if "TEMP B-TREE" in details:
+            logger.warning(
+                f"Archival batches on {table_name} are sorted per batch: {details}"
+            )
+        else:
+            logger.debug(f"Archival plan for {table_name}: {details}")
+
     def archive_table(
         self,
         table_name: str,
@@ -68,6 +205,11 @@ class DatabaseArchiver:
             logger.warning(f"No retention policy for table: {table_name}")
             return {"table": table_name, "status": "no_policy", "records": 0}
 
+        # Dry runs and stats never write, so indexes are only ensured once
+        # the archiver is about to delete.
+        if not dry_run and not self._indexes_checked:
+            self.ensure_timestamp_indexes()
+
         # Calculate cutoff date
         threshold = older_than or policy.hot_threshold
         cutoff_date = datetime.now(timezone.utc).replace(tzinfo=None) - threshold
@@ -101,54 +243,80 @@ class DatabaseArchiver:
                 "cutoff_date": cutoff_str
             }
 
-        # Archive records in batches
+        # Archive records in batches, stopping at the per-run cap so a
+        # backlog (e.g. after missed cron runs) drains over several runs
+        # instead of holding the writer lock for hours.
+        limit = count
+        if self.config.max_rows_per_run is not None:
+            limit = min(count, self.config.max_rows_per_run)
         archived = 0
         archive_date = datetime.now(timezone.utc).replace(tzinfo=None)
         failed_batches = 0
 
         try:
-            with ArchiveWriter(
-                self.config.warm_path,
-                table_name,
-                archive_date,
-                compress=self.config.compress
-            ) as writer:
-
-                while archived < count:
+            pooled = self._writer_pool is not None and not self.config.direct_to_cold
+            if pooled and table_name in self._writer_pool:
+                writer = self._writer_pool[table_name]
+            elif self.config.direct_to_cold:
+                # Not pooled: members are appended per batch, under the
+                # month's tar lock only for the append itself
+                writer = ColdStreamingWriter(
+                    self.config.cold_path,
+                    table_name,
+                    archive_date,
+                    compresslevel=self.config.compresslevel,
+                    codec=self.config.codec
+                )
+            else:
+                writer = ArchiveWriter(
+                    self.config.warm_path,
+                    table_name,
+                    archive_date,
+                    compress=self.config.compress and not self.config.gzip_after_days,
+                    compresslevel=self.config.compresslevel,
+                    codec=self.config.codec
+                )
+                if pooled:
+                    self._writer_pool[table_name] = (
+                        self._writer_stack.enter_context(writer)
+                    )
+
+            with nullcontext(writer) if pooled else writer:
+
+                take_batch = self._batch_taker(table_name, policy.timestamp_column)
+
+                while archived < limit:
                     try:
-                        # Fetch batch
-                        select_sql = f"""
-                            SELECT * FROM {table_name}
-                            WHERE {policy.timestamp_column} < ?
-                            ORDER BY {policy.timestamp_column}
-                            LIMIT ?
-                        """
-                        cursor = self._conn.execute(
-                            select_sql,
-                            (cutoff_str, self.config.batch_size)
+                        # One write transaction per batch: bounded lock hold
+                        # time, one commit/fsync for the whole batch. Inside
+                        # archive_tables() the transaction may already be open.
+                        if not self._conn.in_transaction:
+                            self._conn.execute("BEGIN IMMEDIATE")
+
+                        # Rows are deleted here but only committed after the
+                        # archive is synced (safer: potential duplicates >
+                        # data loss).
+                        lines = take_batch(
+                            cutoff_str, min(self.config.batch_size, limit - archived)
                         )
-
-                        rows = cursor.fetchall()
-                        if not rows:
+                        if not lines:
+                            if not self._uncommitted_rows:
+                                self._conn.rollback()
                             break
 
-                        # Write to archive first (safer: potential duplicates > data loss)
-                        records = [dict(row) for row in rows]
-                        writer.write_batch(records)
+                        writer.write_lines(lines)
+                        if not pooled:
+                            # One fsync per batch, before the delete commits
+                            writer.sync()
+                        self._commit_batch(table_name, len(lines))
 
-                        # Delete archived records only after successful write
-                        ids = [r["id"] for r in records]
-                        placeholders = ",".join("?" * len(ids))
-                        delete_sql = f"DELETE FROM {table_name} WHERE id IN ({placeholders})"
-                        self._conn.execute(delete_sql, ids)
-                        self._conn.commit()
-
-                        archived += len(records)
+                        archived += len(lines)
                         logger.info(f"Archived {archived}/{count} records from {table_name}")
 
                     except sqlite3.Error as e:
                         # Rollback the current batch on database error
-                        self._conn.rollback()
+                        self._rollback_batch()
+                        archived -= self._rolled_back.pop(table_name, 0)
                         logger.error(f"Database error archiving {table_name}: {e}")
                         failed_batches += 1
                         if failed_batches >= 3:
@@ -156,6 +324,8 @@ class DatabaseArchiver:
                             break
 
         except Exception as e:
+            self._rollback_batch()
+            archived -= self._rolled_back.pop(table_name, 0)
             logger.error(f"Failed to archive {table_name}: {e}")
             return {
                 "table": table_name,
@@ -165,28 +335,211 @@ class DatabaseArchiver:
                 "cutoff_date": cutoff_str
             }
 
+        if archived < count:
+            logger.info(
+                f"{count - archived} records left in {table_name} for the next run"
+            )
+
         return {
             "table": table_name,
             "status": "archived",
             "records": archived,
+            "remaining": count - archived,
             "cutoff_date": cutoff_str,
             "archive_file": str(writer.archive_file)
         }
 
-    def archive_all(
+    def _batch_taker(
+        self,
+        table_name: str,
+        timestamp_column: str
+    ) -> Callable[[str, int], List[str]]:
+        """
+        Build a function that deletes the oldest rows before a cutoff and
+        returns them as JSONL lines, serialized by SQLite's json_object().
+
+        Uses a single DELETE ... RETURNING where SQLite supports it (3.35+),
+        otherwise a SELECT followed by a DELETE of the selected rowids.
+        """
+        row_json = (
+            f"json_object({self._json_object_args(table_name)}, '_archived_at', ?)"
+        )
+        # rowid rather than id: the timestamp index covers it, so picking
+        # the batch never touches the table, and the delete needs no
+        # primary-key index probe.
+        oldest_rows = f"""
+            SELECT rowid FROM {table_name}
+            WHERE {timestamp_column} < ?
+            ORDER BY {timestamp_column}
+            LIMIT ?
+        """
+
+        if sqlite3.sqlite_version_info >= (3, 35, 0):
+            delete_sql = f"""
+                DELETE FROM {table_name}
+                WHERE rowid IN ({oldest_rows})
+                RETURNING {row_json}
+            """
+
+            def take_batch(cutoff: str, size: int) -> List[str]:
+                archived_at = datetime.now(timezone.utc).isoformat()
+                return [
+                    row[0] for row in
+                    self._conn.execute(delete_sql, (cutoff, size, archived_at))
+                ]
+
+            return take_batch
+
+        select_sql = f"""
+            SELECT rowid, {row_json} FROM {table_name}
+            WHERE {timestamp_column} < ?
+            ORDER BY {timestamp_column}
+            LIMIT ?
+        """
+        # One prepared statement rebound per row: no IN list to build or
+        # parse, and no SQLITE_MAX_VARIABLE_NUMBER limit on the batch size.
+        delete_sql = f"DELETE FROM {table_name} WHERE rowid = ?"
+
+        def take_batch(cutoff: str, size: int) -> List[str]:
+            archived_at = datetime.now(timezone.utc).isoformat()
+            rows = self._conn.execute(
+                select_sql, (archived_at, cutoff, size)
+            ).fetchall()
+            self._conn.executemany(delete_sql, [(row[0],) for row in rows])
+            return [row[1] for row in rows]
+
+        return take_batch
+
+    def _json_object_args(self, table_name: str) -> str:
+        """Build the json_object() argument list covering every column."""
+        columns = [
+            row["name"]
+            for row in self._conn.execute(f"PRAGMA table_info({table_name})")
+        ]
+        return ", ".join(f"'{col}', \"{col}\"" for col in columns)
+
+    def _commit_batch(self, table_name: str, rows: int) -> None:
+        """Commit a deleted batch, or defer it while a shared txn is open."""
+        self._uncommitted_rows += rows
+        self._uncommitted_tables[table_name] = (
+            self._uncommitted_tables.get(table_name, 0) + rows
+        )
+        if not self._shared_txn or self._uncommitted_rows >= self.config.batch_size:
+            self._commit()
+
+    def _commit(self) -> None:
+        """Sync pooled archive writers, then commit the deletes they hold."""
+        if self._writer_pool:
+            for writer in self._writer_pool.values():
+                writer.sync()
+        self._conn.commit()
+        self._uncommitted_rows = 0
+        self._uncommitted_tables.clear()
+
+    def _rollback_batch(self) -> None:
+        """Roll back the open transaction, if any."""
+        if self._conn.in_transaction:
+            if self._shared_txn and self._uncommitted_rows:
+                # Those rows are already in archive files and stay in the
+                # database; the next run archives them again (duplicates
+                # over data loss).
+                logger.warning(
+                    f"Rolled back {self._uncommitted_rows} archived but "
+                    f"uncommitted records from earlier tables"
+                )
+            self._conn.rollback()
+            for table_name, rows in self._uncommitted_tables.items():
+                self._rolled_back[table_name] = (
+                    self._rolled_back.get(table_name, 0) + rows
+                )
+        self._uncommitted_rows = 0
+        self._uncommitted_tables.clear()
+
+    def _apply_rollbacks(self, results: List[Dict[str, Any]]) -> None:
+        """
+        Take rolled-back rows out of the results of earlier tables.
+
+        Their deletes were only provisional: once a later table's error rolls
+        the shared transaction back, the rows are still in the database (and
+        will be archived again next run), so they are not reported as archived.
+        """
+        for result in results:
+            rows = self._rolled_back.pop(result["table"], 0)
+            if rows:
+                result["status"] = "rolled_back"
+                result["records"] -= rows
+                result["remaining"] = result.get("remaining", 0) + rows
+
+    def _report_table(self, result: Dict[str, Any]) -> None:
+        """Pass a finished table's result to the on_table_done callback."""
+        if self.on_table_done:
+            self.on_table_done(result)
+
+    def archive_tables(
         self,
+        tables: List[str],
         older_than: Optional[timedelta] = None,
         dry_run: bool = False
     ) -> List[Dict[str, Any]]:
-        """Archive all tables according to retention policies."""
-        results = []
+        """
+        Archive several tables, sharing write transactions between them.
 
-        for table_name in RETENTION_POLICIES.keys():
-            result = self.archive_table(table_name, older_than, dry_run)
-            results.append(result)
+        Deletes are committed once per ``batch_size`` rows across all the
+        tables rather than at least once per table, so a typical daily run
+        with a few small tables costs a single commit.
+
+        Warm archive files stay open for the whole call and are fsynced
+        once per commit rather than after every batch.
+
+        A table's deletes are provisional until they are committed: if a
+        later table's database error rolls the shared transaction back, the
+        earlier table's result is marked ``rolled_back`` and its ``records``
+        no longer count the rows that went back into the database. For the
+        same reason ``on_table_done`` is only called once a table's deletes
+        have been committed or rolled back.
+        """
+        self._shared_txn = True
+        self._writer_pool = {}
+        self._writer_stack = ExitStack()
+        try:
+            results = []
+            unreported = []
+            for table in tables:
+                result = self.archive_table(table, older_than, dry_run)
+                results.append(result)
+                unreported.append(result)
+                self._apply_rollbacks(results)
+                # Report tables in order, holding back the first one whose
+                # deletes are still in the open transaction
+                while (unreported and
+                       unreported[0]["table"] not in self._uncommitted_tables):
+                    self._report_table(unreported.pop(0))
+            if self._conn.in_transaction:
+                self._commit()
+            for result in unreported:
+                self._report_table(result)
+        except BaseException:
+            self._rollback_batch()
+            raise
+        finally:
+            self._shared_txn = False
+            self._uncommitted_rows = 0
+            self._uncommitted_tables.clear()
+            self._rolled_back.clear()
+            self._writer_pool = None
+            self._writer_stack.close()
+            self._writer_stack = None
 
         return results
 
+    def archive_all(
+        self,
+        older_than: Optional[timedelta] = None,
+        dry_run: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Archive all tables according to retention policies."""
+        return self.archive_tables(list(RETENTION_POLICIES.keys()), older_than, dry_run)
+
     def archive_transcripts(
         self,
         older_than: Optional[timedelta] = None,
@@ -194,13 +547,7 @@ class DatabaseArchiver:
     ) -> List[Dict[str, Any]]:
         """Archive transcript-related tables (entries, tools, skills)."""
         tables = ["transcript_entries", "tool_uses", "skill_traces"]
-        results = []
-
-        for table in tables:
-            result = self.archive_table(table, older_than, dry_run)
-            results.append(result)
-
-        return results
+        return self.archive_tables(tables, older_than, dry_run)
 
     def archive_assertions(
         self,
@@ -209,13 +556,7 @@ class DatabaseArchiver:
     ) -> List[Dict[str, Any]]:
         """Archive assertion-related tables."""
         tables = ["assertion_results", "assertion_chains"]
-        results = []
-
-        for table in tables:
-            result = self.archive_table(table, older_than, dry_run)
-            results.append(result)
-
-        return results
+        return self.archive_tables(tables, older_than, dry_run)
 
     def get_table_stats(self, table_name: str) -> Dict[str, Any]:
         """Get statistics for a table."""
@@ -223,28 +564,24 @@ class DatabaseArchiver:
         if not policy:
             return {"table": table_name, "error": "no_policy"}
 
-        # Total count
-        total_sql = f"SELECT COUNT(*) as count FROM {table_name}"
-        total = self._conn.execute(total_sql).fetchone()["count"]
-
         # Calculate age buckets
         now = datetime.now(timezone.utc).replace(tzinfo=None)
         hot_cutoff = (now - policy.hot_threshold).isoformat()
         warm_cutoff = (now - policy.warm_threshold).isoformat()
 
-        hot_sql = f"""
-            SELECT COUNT(*) as count FROM {table_name}
-            WHERE {policy.timestamp_column} >= ?
-        """
-        hot_count = self._conn.execute(hot_sql, (hot_cutoff,)).fetchone()["count"]
-
-        warm_sql = f"""
-            SELECT COUNT(*) as count FROM {table_name}
-            WHERE {policy.timestamp_column} < ? AND {policy.timestamp_column} >= ?
+        # One pass over the table (or its timestamp index) for all buckets
+        ts = policy.timestamp_column
+        stats_sql = f"""
+            SELECT
+                COUNT(*) AS total,
+                COUNT(CASE WHEN {ts} >= ? THEN 1 END) AS hot,
+                COUNT(CASE WHEN {ts} < ? AND {ts} >= ? THEN 1 END) AS warm
+            FROM {table_name}
         """
-        warm_count = self._conn.execute(
-            warm_sql, (hot_cutoff, warm_cutoff)
-        ).fetchone()["count"]
+        row = self._conn.execute(
+            stats_sql, (hot_cutoff, hot_cutoff, warm_cutoff)
+        ).fetchone()
+        total, hot_count, warm_count = row["total"], row["hot"], row["warm"]
 
         stale_count = total - hot_count - warm_count
 
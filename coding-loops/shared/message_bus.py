@@ -27,11 +27,13 @@ Usage:
         bus.unlock_file("/path/to/file.ts", "loop-1")
 """
 
+import copy
 import logging
-from datetime import datetime, timedelta, timezone
+from datetime import datetime
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 import threading
+import time
 
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -39,20 +41,50 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from database.init_db import (
     get_db_path,
     ensure_initialized,
-    get_connection,
     transaction,
+    fetch_all,
+    fetch_one,
 )
 from database.models import Event, Subscription, FileLock
 from database.queries import (
     EventQueries,
     SubscriptionQueries,
     FileLockQueries,
-    generate_id,
     now_iso,
 )
 
 logger = logging.getLogger(__name__)
 
+# How long a get_stats result is reused. Writes through the same
+# MessageBus invalidate it at once; writes from elsewhere show up
+# once it expires.
+STATS_TTL = 1.0
+
+# Fixed SQL for the hot paths, so each call reuses the same statement text
+# (and prepared statement, on the persistent per-thread connections).
+_SQL_RECORD_WAIT = """INSERT INTO wait_graph
+                      (waiter, holder, resource, waiting_since)
+                      VALUES (?, ?, ?, ?)
+                      ON CONFLICT(waiter, holder, resource)
+                      DO UPDATE SET waiting_since = excluded.waiting_since"""
+_SQL_CLEAR_WAIT = "DELETE FROM wait_graph WHERE waiter = ? AND resource = ?"
+_SQL_GET_EVENT = "SELECT * FROM events WHERE id = ?"
+_SQL_CORRELATED_EVENTS = "SELECT * FROM events WHERE correlation_id = ? ORDER BY timestamp"
+_SQL_ACTIVE_SUBSCRIPTIONS = "SELECT * FROM subscriptions WHERE subscriber = ? AND active = 1"
+_SQL_WAIT_GRAPH = "SELECT * FROM wait_graph"
+_SQL_LIVE_LOCKS = (
+    "SELECT file_path, locked_by, locked_at, lock_reason, expires_at, test_id "
+    "FROM file_locks WHERE (expires_at IS NULL OR expires_at >= ?)"
+)
+_SQL_LIVE_LOCKS_BY_OWNER = _SQL_LIVE_LOCKS + " AND locked_by = ?"
+_SQL_STATS = """SELECT
+                    (SELECT COUNT(*) FROM events) AS events,
+                    (SELECT SUM(acknowledged) FROM events) AS acknowledged,
+                    (SELECT COUNT(*) FROM subscriptions WHERE active = 1) AS subscriptions,
+                    (SELECT COUNT(*) FROM file_locks
+                     WHERE expires_at IS NULL OR expires_at >= ?) AS locks,
+                    (SELECT COUNT(*) FROM wait_graph) AS waits"""
+
 
 class MessageBus:
     """
@@ -72,6 +104,16 @@ class MessageBus:
         self.db_path = db_path or get_db_path()
         self._lock = threading.Lock()
 
+        # Bumped on every publish through this instance so poll_blocking
+        # can sleep until something new may be waiting.
+        self._published = threading.Condition()
+        self._publish_seq = 0
+
+        # (expires_at, stats) from the last get_stats, and a counter bumped
+        # by every write so a result computed across a write is not kept.
+        self._stats_cache: Optional[tuple] = None
+        self._stats_gen = 0
+
         # Ensure database is initialized
         ensure_initialized(self.db_path)
 
@@ -118,6 +160,7 @@ class MessageBus:
             db_path=self.db_path
         )
 
+        self._notify_published()
         logger.debug(f"Published event {event_id}: {event_type} from {source}")
         return event_id
 
@@ -135,26 +178,9 @@ class MessageBus:
         Returns:
             List of event IDs
         """
-        event_ids = []
-        with transaction(self.db_path) as conn:
-            for event_data in events:
-                event = Event(
-                    id=generate_id(),
-                    timestamp=now_iso(),
-                    source=event_data["source"],
-                    event_type=event_data["event_type"],
-                    payload=event_data["payload"],
-                    priority=event_data.get("priority", 5),
-                    correlation_id=event_data.get("correlation_id")
-                )
-                data = event.to_dict()
-                columns = ", ".join(data.keys())
-                placeholders = ", ".join("?" * len(data))
-                conn.execute(
-                    f"INSERT INTO events ({columns}) VALUES ({placeholders})",
-                    tuple(data.values())
-                )
-                event_ids.append(event.id)
+        event_ids = EventQueries.publish_batch(events, self.db_path)
+        if event_ids:
+            self._notify_published()
 
         logger.debug(f"Published batch of {len(event_ids)} events")
         return event_ids
@@ -192,6 +218,7 @@ class MessageBus:
             filter_sources=filter_sources,
             db_path=self.db_path
         )
+        self._invalidate_stats()
 
         logger.debug(f"Created subscription {sub_id} for {subscriber}: {event_types}")
         return sub_id
@@ -204,6 +231,7 @@ class MessageBus:
             subscription_id: The subscription ID to remove
         """
         SubscriptionQueries.unsubscribe(subscription_id, self.db_path)
+        self._invalidate_stats()
         logger.debug(f"Removed subscription {subscription_id}")
 
     def get_subscriptions(self, subscriber: str) -> List[Subscription]:
@@ -216,12 +244,8 @@ class MessageBus:
         Returns:
             List of Subscription objects
         """
-        with get_connection(self.db_path) as conn:
-            rows = conn.execute(
-                "SELECT * FROM subscriptions WHERE subscriber = ? AND active = 1",
-                (subscriber,)
-            ).fetchall()
-            return [Subscription.from_row(dict(r)) for r in rows]
+        rows = fetch_all(_SQL_ACTIVE_SUBSCRIPTIONS, (subscriber,), self.db_path)
+        return [Subscription.from_row(dict(r)) for r in rows]
 
     # =========================================================================
     # Polling
@@ -253,16 +277,61 @@ class MessageBus:
         events = EventQueries.poll(
             subscriber=subscriber,
             limit=limit,
-            db_path=self.db_path
+            db_path=self.db_path,
+            event_types=event_types
         )
 
-        # Filter by event types if specified
-        if event_types:
-            events = [e for e in events if e.event_type in event_types]
-
         logger.debug(f"Polled {len(events)} events for {subscriber}")
         return events
 
+    def poll_blocking(
+        self,
+        subscriber: str,
+        timeout: float = 5.0,
+        limit: int = 10,
+        event_types: Optional[List[str]] = None
+    ) -> List[Event]:
+        """
+        Poll, waiting up to timeout seconds for events if none are pending.
+
+        Publishes made through this MessageBus instance wake the caller
+        immediately, so same-process subscribers need not poll in a loop.
+        Events from other processes are not signalled; they are picked up
+        by the poll made when the timeout expires.
+
+        Args:
+            subscriber: Name of the subscriber
+            timeout: Maximum time to wait in seconds
+            limit: Maximum number of events to return
+            event_types: Optional filter for specific event types
+
+        Returns:
+            List of Event objects, empty if none arrived in time
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            # Read the sequence before polling so a publish that lands
+            # between the poll and the wait is not missed.
+            with self._published:
+                seq = self._publish_seq
+            events = self.poll(subscriber, limit=limit, event_types=event_types)
+            remaining = deadline - time.monotonic()
+            if events or remaining <= 0:
+                return events
+            with self._published:
+                woken = self._published.wait_for(
+                    lambda: self._publish_seq != seq, remaining
+                )
+            if not woken:
+                return self.poll(subscriber, limit=limit, event_types=event_types)
+
+    def _notify_published(self) -> None:
+        """Wake poll_blocking callers after events were published."""
+        self._invalidate_stats()
+        with self._published:
+            self._publish_seq += 1
+            self._published.notify_all()
+
     def acknowledge(self, event_id: str, subscriber: str) -> None:
         """
         Acknowledge an event as processed.
@@ -272,6 +341,7 @@ class MessageBus:
             subscriber: Name of the subscriber acknowledging
         """
         EventQueries.acknowledge(event_id, subscriber, self.db_path)
+        self._invalidate_stats()
         logger.debug(f"Acknowledged event {event_id} by {subscriber}")
 
     def acknowledge_batch(self, event_ids: List[str], subscriber: str) -> None:
@@ -282,14 +352,8 @@ class MessageBus:
             event_ids: List of event IDs to acknowledge
             subscriber: Name of the subscriber acknowledging
         """
-        with transaction(self.db_path) as conn:
-            for event_id in event_ids:
-                conn.execute(
-                    """UPDATE events
-                       SET acknowledged = 1, acknowledged_by = ?, acknowledged_at = ?
-                       WHERE id = ?""",
-                    (subscriber, now_iso(), event_id)
-                )
+        EventQueries.acknowledge_batch(event_ids, subscriber, self.db_path)
+        self._invalidate_stats()
         logger.debug(f"Acknowledged {len(event_ids)} events by {subscriber}")
 
     # =========================================================================
@@ -344,12 +408,8 @@ class MessageBus:
         Returns:
             Event object or None if not found
         """
-        with get_connection(self.db_path) as conn:
-            row = conn.execute(
-                "SELECT * FROM events WHERE id = ?",
-                (event_id,)
-            ).fetchone()
-            return Event.from_row(dict(row)) if row else None
+        row = fetch_one(_SQL_GET_EVENT, (event_id,), self.db_path)
+        return Event.from_row(dict(row)) if row else None
 
     def get_correlated_events(self, correlation_id: str) -> List[Event]:
         """
@@ -361,12 +421,8 @@ class MessageBus:
         Returns:
             List of Event objects
         """
-        with get_connection(self.db_path) as conn:
-            rows = conn.execute(
-                "SELECT * FROM events WHERE correlation_id = ? ORDER BY timestamp",
-                (correlation_id,)
-            ).fetchall()
-            return [Event.from_row(dict(r)) for r in rows]
+        rows = fetch_all(_SQL_CORRELATED_EVENTS, (correlation_id,), self.db_path)
+        return [Event.from_row(dict(r)) for r in rows]
 
     # =========================================================================
     # File Locking
@@ -400,6 +456,8 @@ class MessageBus:
                 finally:
                     bus.unlock_file("/path/to/file.ts", "loop-1")
         """
+        # The file_locked event is written by a trigger on file_locks
+        # (see schema.sql), in the same statement that takes the lock.
         acquired = FileLockQueries.acquire(
             file_path=file_path,
             locked_by=locked_by,
@@ -410,18 +468,8 @@ class MessageBus:
         )
 
         if acquired:
+            self._notify_published()
             logger.debug(f"Lock acquired on {file_path} by {locked_by}")
-            # Publish lock event
-            self.publish(
-                source=locked_by,
-                event_type="file_locked",
-                payload={
-                    "file_path": file_path,
-                    "reason": reason,
-                    "ttl_seconds": ttl_seconds,
-                    "test_id": test_id
-                }
-            )
         else:
             logger.debug(f"Lock denied on {file_path} for {locked_by}")
 
@@ -438,16 +486,19 @@ class MessageBus:
         Returns:
             True if lock was released, False if not owned by this agent
         """
-        released = FileLockQueries.release(file_path, locked_by, self.db_path)
+        with transaction(self.db_path) as conn:
+            released = FileLockQueries.release(file_path, locked_by, conn=conn)
+            if released:
+                EventQueries.publish(
+                    source=locked_by,
+                    event_type="file_unlocked",
+                    payload={"file_path": file_path},
+                    conn=conn
+                )
 
         if released:
+            self._notify_published()
             logger.debug(f"Lock released on {file_path} by {locked_by}")
-            # Publish unlock event
-            self.publish(
-                source=locked_by,
-                event_type="file_unlocked",
-                payload={"file_path": file_path}
-            )
 
         return released
 
@@ -473,22 +524,13 @@ class MessageBus:
         Returns:
             List of FileLock objects
         """
-        with get_connection(self.db_path) as conn:
-            if locked_by:
-                rows = conn.execute(
-                    "SELECT * FROM file_locks WHERE locked_by = ?",
-                    (locked_by,)
-                ).fetchall()
-            else:
-                rows = conn.execute("SELECT * FROM file_locks").fetchall()
-
-            locks = []
-            for row in rows:
-                lock = FileLock.from_row(dict(row))
-                if not lock.is_expired():
-                    locks.append(lock)
-
-            return locks
+        # Expired locks are filtered in SQL; a lock without expires_at
+        # never expires.
+        if locked_by:
+            rows = fetch_all(_SQL_LIVE_LOCKS_BY_OWNER, (now_iso(), locked_by), self.db_path)
+        else:
+            rows = fetch_all(_SQL_LIVE_LOCKS, (now_iso(),), self.db_path)
+        return [FileLock.from_row(dict(r)) for r in rows]
 
     def release_expired_locks(self) -> int:
         """
@@ -512,15 +554,18 @@ class MessageBus:
         Returns:
             Number of locks released
         """
-        count = FileLockQueries.release_all_for_owner(locked_by, self.db_path)
+        with transaction(self.db_path) as conn:
+            count = FileLockQueries.release_all_for_owner(locked_by, conn=conn)
+            if count > 0:
+                EventQueries.publish(
+                    source=locked_by,
+                    event_type="all_locks_released",
+                    payload={"count": count},
+                    conn=conn
+                )
         if count > 0:
+            self._notify_published()
             logger.info(f"Released {count} locks for {locked_by}")
-            # Publish event
-            self.publish(
-                source=locked_by,
-                event_type="all_locks_released",
-                payload={"count": count}
-            )
         return count
 
     # =========================================================================
@@ -537,12 +582,8 @@ class MessageBus:
             resource: The resource being waited for (file path, etc.)
         """
         with transaction(self.db_path) as conn:
-            conn.execute(
-                """INSERT OR REPLACE INTO wait_graph
-                   (waiter, holder, resource, waiting_since)
-                   VALUES (?, ?, ?, ?)""",
-                (waiter, holder, resource, now_iso())
-            )
+            conn.execute(_SQL_RECORD_WAIT, (waiter, holder, resource, now_iso()))
+        self._invalidate_stats()
         logger.debug(f"Recorded wait: {waiter} waiting for {holder} on {resource}")
 
     def clear_wait(self, waiter: str, resource: str) -> None:
@@ -554,10 +595,8 @@ class MessageBus:
             resource: The resource that was being waited for
         """
         with transaction(self.db_path) as conn:
-            conn.execute(
-                "DELETE FROM wait_graph WHERE waiter = ? AND resource = ?",
-                (waiter, resource)
-            )
+            conn.execute(_SQL_CLEAR_WAIT, (waiter, resource))
+        self._invalidate_stats()
 
     def get_wait_graph(self) -> List[Dict[str, Any]]:
         """
@@ -566,9 +605,8 @@ class MessageBus:
         Returns:
             List of wait records with waiter, holder, resource, waiting_since
         """
-        with get_connection(self.db_path) as conn:
-            rows = conn.execute("SELECT * FROM wait_graph").fetchall()
-            return [dict(row) for row in rows]
+        rows = fetch_all(_SQL_WAIT_GRAPH, (), self.db_path)
+        return [dict(row) for row in rows]
 
     # =========================================================================
     # Utilities
@@ -584,9 +622,7 @@ class MessageBus:
         Returns:
             Dict with cleanup counts
         """
-        cutoff = (
-            datetime.now(timezone.utc) - timedelta(hours=older_than_hours)
-        ).isoformat()
+        cutoff = now_iso(-older_than_hours * 3600)
 
         with transaction(self.db_path) as conn:
             # Remove old acknowledged events
@@ -598,7 +634,8 @@ class MessageBus:
             events_removed = result.rowcount
 
             # Remove expired locks
-            locks_removed = FileLockQueries.release_expired(self.db_path)
+            locks_removed = FileLockQueries.release_expired(conn=conn)
+        self._invalidate_stats()
 
         logger.info(f"Cleanup: {events_removed} events, {locks_removed} locks removed")
 
@@ -611,37 +648,41 @@ class MessageBus:
         """
         Get message bus statistics.
 
+        Results are cached for STATS_TTL seconds; any write made through
+        this instance invalidates the cache.
+
         Returns:
             Dict with event counts, subscription counts, lock counts
         """
-        with get_connection(self.db_path) as conn:
-            stats = {}
-
-            # Event counts
-            row = conn.execute(
-                "SELECT COUNT(*) as total, SUM(acknowledged) as acknowledged FROM events"
-            ).fetchone()
-            stats["events"] = {
-                "total": row["total"],
-                "acknowledged": row["acknowledged"] or 0,
-                "pending": row["total"] - (row["acknowledged"] or 0)
-            }
-
-            # Subscription counts
-            row = conn.execute(
-                "SELECT COUNT(*) as total FROM subscriptions WHERE active = 1"
-            ).fetchone()
-            stats["subscriptions"] = {"active": row["total"]}
-
-            # Lock counts
-            row = conn.execute("SELECT COUNT(*) as total FROM file_locks").fetchone()
-            stats["locks"] = {"active": row["total"]}
-
-            # Wait graph size
-            row = conn.execute("SELECT COUNT(*) as total FROM wait_graph").fetchone()
-            stats["wait_graph"] = {"entries": row["total"]}
+        cached = self._stats_cache
+        if cached is not None and cached[0] > time.monotonic():
+            return copy.deepcopy(cached[1])
+
+        gen = self._stats_gen
+        # One statement, so all counts come from the same snapshot.
+        # Expired locks that have not been cleaned up yet are not counted.
+        row = fetch_one(_SQL_STATS, (now_iso(),), self.db_path)
+        acknowledged = row["acknowledged"] or 0
+        stats = {
+            "events": {
+                "total": row["events"],
+                "acknowledged": acknowledged,
+                "pending": row["events"] - acknowledged
+            },
+            "subscriptions": {"active": row["subscriptions"]},
+            "locks": {"active": row["locks"]},
+            "wait_graph": {"entries": row["waits"]}
+        }
+        with self._lock:
+            if gen == self._stats_gen:
+                self._stats_cache = (time.monotonic() + STATS_TTL, stats)
+        return copy.deepcopy(stats)
 
-            return stats
+    def _invalidate_stats(self) -> None:
+        """Drop the cached get_stats result after a write."""
+        with self._lock:
+            self._stats_gen += 1
+            self._stats_cache = None
 
 
 # Singleton instance for shared use
@@ -663,6 +704,12 @@ def get_message_bus(db_path: Optional[Path] = None) -> MessageBus:
     """
     global _default_bus
 
+    # Fast path without the lock once the instance exists; reading the
+    # module global is atomic.
+    bus = _default_bus
+    if bus is not None and (not db_path or db_path == bus.db_path):
+        return bus
+
     with _bus_lock:
         if _default_bus is None or (db_path and db_path != _default_bus.db_path):
             _default_bus = MessageBus(db_path)
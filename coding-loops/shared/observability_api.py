@@ -12,10 +12,13 @@ Usage:
     complete_execution_run(execution_id, status="completed")
 """
 
+import atexit
+import json
 import os
+import threading
 import time
 import logging
-from typing import Optional, Dict, Any, Literal
+from typing import Optional, Dict, Any, Literal, Tuple
 
 import requests
 from requests.adapters import HTTPAdapter
@@ -27,10 +30,31 @@ logger = logging.getLogger(__name__)
 API_BASE = os.environ.get("OBSERVABILITY_API_URL", "http://localhost:3001")
 API_TIMEOUT = int(os.environ.get("OBSERVABILITY_API_TIMEOUT", "10"))
 MAX_RETRIES = int(os.environ.get("OBSERVABILITY_MAX_RETRIES", "3"))
+# Keep-alive connections kept open to the API. Requests beyond this many
+# at once still go through, but on a fresh socket that is closed
+# afterwards, so this should cover the number of concurrent agent threads
+# (urllib3's default of 10 left busy processes reconnecting constantly).
+POOL_MAXSIZE = int(os.environ.get("OBSERVABILITY_POOL_MAXSIZE", "64"))
+
+# How long a queued heartbeat waits for newer ones before it is sent, in seconds
+HEARTBEAT_FLUSH_INTERVAL = float(os.environ.get("OBSERVABILITY_HEARTBEAT_INTERVAL", "0.25"))
+# An unchanged heartbeat is only re-sent after this many seconds
+HEARTBEAT_MAX_INTERVAL = float(os.environ.get("OBSERVABILITY_HEARTBEAT_MAX_INTERVAL", "30"))
 
 # Session with retry logic
 _session: Optional[requests.Session] = None
 
+# Latest unsent heartbeat body per (execution_id, instance_id). A newer
+# heartbeat replaces an older one still waiting, so at most one request
+# per instance is made per flush.
+_pending_heartbeats: Dict[Tuple[str, str], Dict[str, Any]] = {}
+_heartbeat_lock = threading.Lock()
+_heartbeat_flusher: Optional[threading.Thread] = None
+# Set when a heartbeat is queued; the flusher sleeps on it while idle
+_heartbeat_queued = threading.Event()
+# (monotonic send time, signature) of the last heartbeat sent per key
+_last_heartbeats: Dict[Tuple[str, str], Tuple[float, int]] = {}
+
 
 def _get_session() -> requests.Session:
     """Get or create a session with retry configuration."""
@@ -43,7 +67,13 @@ def _get_session() -> requests.Session:
             status_forcelist=[429, 500, 502, 503, 504],
             allowed_methods=["GET", "POST", "PUT"],
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # All requests go to API_BASE, so a few host pools are plenty;
+        # pool_maxsize bounds the connections kept alive to it.
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_connections=4,
+            pool_maxsize=POOL_MAXSIZE,
+        )
         _session.mount("http://", adapter)
         _session.mount("https://", adapter)
     return _session
@@ -176,6 +206,12 @@ def record_heartbeat(
 ) -> None:
     """Record a heartbeat for an active agent instance.
 
+    Does not block: the heartbeat is queued and sent by a background
+    thread within HEARTBEAT_FLUSH_INTERVAL seconds. If several arrive for
+    the same instance before then, only the latest is sent. A heartbeat
+    whose status and metadata match the last one sent is skipped unless
+    HEARTBEAT_MAX_INTERVAL seconds have passed since that send.
+
     Args:
         execution_id: The execution run ID
         instance_id: The agent instance ID
@@ -185,21 +221,82 @@ def record_heartbeat(
     Example:
         >>> record_heartbeat("exec-123", "agent-456", metadata={"task": "T-001"})
     """
-    try:
-        _api_request(
-            "POST",
-            f"/executions/{execution_id}/heartbeat",
-            json_data={
-                "instanceId": instance_id,
-                "status": status,
-                "metadata": metadata or {},
-                "timestamp": time.time(),
-            },
-        )
-        logger.debug(f"Recorded heartbeat for {instance_id} in {execution_id}")
-    except Exception as e:
-        # Heartbeat failures should not crash the agent
-        logger.warning(f"Failed to record heartbeat: {e}")
+    global _heartbeat_flusher
+    key = (execution_id, instance_id)
+    signature = _heartbeat_signature(status, metadata)
+    body = {
+        "instanceId": instance_id,
+        "status": status,
+        "metadata": metadata or {},
+        "timestamp": time.time(),
+    }
+    with _heartbeat_lock:
+        last = _last_heartbeats.get(key)
+        if (
+            key not in _pending_heartbeats
+            and last is not None
+            and last[1] == signature
+            and time.monotonic() - last[0] < HEARTBEAT_MAX_INTERVAL
+        ):
+            return
+        _pending_heartbeats[key] = body
+        _heartbeat_queued.set()
+        if _heartbeat_flusher is None:
+            _heartbeat_flusher = threading.Thread(
+                target=_run_heartbeat_flusher, name="heartbeat-flusher", daemon=True
+            )
+            _heartbeat_flusher.start()
+
+
+def flush_heartbeats() -> None:
+    """Send all queued heartbeats now. Also runs at interpreter exit."""
+    with _heartbeat_lock:
+        pending = list(_pending_heartbeats.items())
+        _pending_heartbeats.clear()
+
+    for (execution_id, instance_id), body in pending:
+        try:
+            _api_request("POST", f"/executions/{execution_id}/heartbeat", json_data=body)
+            with _heartbeat_lock:
+                _last_heartbeats[(execution_id, instance_id)] = (
+                    time.monotonic(),
+                    _heartbeat_signature(body["status"], body["metadata"]),
+                )
+            logger.debug(f"Recorded heartbeat for {instance_id} in {execution_id}")
+        except Exception as e:
+            # Heartbeat failures should not crash the agent
+            logger.warning(f"Failed to record heartbeat: {e}")
+
+
+def _heartbeat_signature(status: str, metadata: Optional[Dict[str, Any]]) -> int:
+    """Hash of the parts of a heartbeat that matter for change detection."""
+    return hash((status, json.dumps(metadata or {}, sort_keys=True, default=str)))
+
+
+def _run_heartbeat_flusher() -> None:
+    """Background loop sending queued heartbeats.
+
+    Blocks while nothing is queued (waking at most once per keepalive
+    interval), then waits HEARTBEAT_FLUSH_INTERVAL so heartbeats arriving
+    close together go out in one flush.
+    """
+    while True:
+        if not _heartbeat_queued.wait(HEARTBEAT_MAX_INTERVAL):
+            continue
+        time.sleep(HEARTBEAT_FLUSH_INTERVAL)
+        _heartbeat_queued.clear()
+        flush_heartbeats()
+
+
+def _reset_heartbeat_flusher() -> None:
+    """Forget the parent's flusher thread in a forked child (threads are not copied)."""
+    global _heartbeat_flusher, _heartbeat_queued
+    _heartbeat_flusher = None
+    _heartbeat_queued = threading.Event()
+
+
+atexit.register(flush_heartbeats)
+os.register_at_fork(after_in_child=_reset_heartbeat_flusher)
 
 
 # =============================================================================
@@ -599,10 +599,12 @@ class ObservableAgent:
 
     def flush(self) -> None:
         """Flush all pending writes."""
+        self._assertion_recorder.flush()
         self._transcript.flush()
 
     def close(self) -> None:
         """Flush and close all resources."""
+        self._assertion_recorder.close()
         self._transcript.close()
 
     def __enter__(self):
@@ -32,7 +32,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent / "tests" / "e2e"))
 from claude_code_sdk import ClaudeSDKClient
 from client import create_client
 
-# Observability API client for HTTP-based logging
+# Observability API client for HTTP-based logging. The server itself is
+# probed in run(), not here, so importing this module never blocks on HTTP.
 try:
     from observability_api import (
         create_execution_run,
@@ -42,7 +43,7 @@ try:
         log_phase_end,
         check_observable,
     )
-    OBS_API_AVAILABLE = check_observable()
+    OBS_API_AVAILABLE = True
 except ImportError:
     OBS_API_AVAILABLE = False
 
@@ -282,9 +283,12 @@ class RalphLoopRunner(ABC):
     Abstract base class for Ralph loop runners.
 
     Subclasses must implement:
-    - get_spec_content(test_id: str) -> str
     - build_system_prompt() -> str
 
+    Subclasses provide spec focus text through SPEC_SUFFIXES, a mapping of
+    test ID prefix to the section appended to ``00-overview.md`` for tests
+    with that prefix. Loops with other needs can override get_spec_content().
+
     Can be initialized with explicit paths or a config file:
 
         # Explicit paths (legacy)
@@ -301,6 +305,9 @@ class RalphLoopRunner(ABC):
         runner = MyLoop.from_config(config)
     """
 
+    # Test ID prefix -> focus section appended to the spec overview
+    SPEC_SUFFIXES: dict[str, str] = {}
+
     def __init__(
         self,
         name: str,
@@ -344,6 +351,9 @@ class RalphLoopRunner(ABC):
         # Observability tracking
         self._obs_execution_id: Optional[str] = None
 
+        # (mtime_ns, text) of the spec overview, see get_spec_content()
+        self._overview_cache: Optional[tuple[int, str]] = None
+
     @classmethod
     def from_config(cls, config: dict, max_iterations: Optional[int] = None) -> "RalphLoopRunner":
         """
@@ -371,13 +381,36 @@ class RalphLoopRunner(ABC):
         )
 
     # =========================================================================
-    # Abstract methods - must be implemented by subclasses
+    # Spec content
     # =========================================================================
 
-    @abstractmethod
     def get_spec_content(self, test_id: str) -> str:
         """Get the spec content for a given test ID."""
-        pass
+        # The full overview contains all specs
+        overview_file = self.specs_dir / "00-overview.md"
+        try:
+            mtime_ns = overview_file.stat().st_mtime_ns
+        except FileNotFoundError:
+            return f"Spec file not found: {overview_file}"
+
+        # Re-read only when the overview changes on disk
+        if self._overview_cache is None or self._overview_cache[0] != mtime_ns:
+            self._overview_cache = (mtime_ns, overview_file.read_text())
+
+        # Test IDs look like "CP-UFS-001", so the category is usually the
+        # first two tokens; fall back to a prefix scan for other shapes.
+        suffix = self.SPEC_SUFFIXES.get("-".join(test_id.split("-", 2)[:2]))
+        if suffix is None:
+            suffix = next(
+                (text for prefix, text in self.SPEC_SUFFIXES.items()
+                 if test_id.startswith(prefix)),
+                ""
+            )
+        return self._overview_cache[1] + suffix
+
+    # =========================================================================
+    # Abstract methods - must be implemented by subclasses
+    # =========================================================================
 
     @abstractmethod
     def build_system_prompt(self) -> str:
@@ -739,7 +772,7 @@ Begin implementation.
         )
 
         # Create observability execution run if API is available
-        if OBS_API_AVAILABLE:
+        if OBS_API_AVAILABLE and check_observable():
             try:
                 # Use a task list ID based on the loop name and test state
                 task_list_id = f"ralph-loop-{self.name.lower().replace(' ', '-')}"
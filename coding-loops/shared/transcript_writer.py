@@ -17,6 +17,10 @@ from typing import Any, Dict, Optional
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 
+# Buffered entries that trigger a flush, normally and while flushes are held
+FLUSH_THRESHOLD = 10
+HELD_FLUSH_THRESHOLD = 64
+
 
 class TranscriptEntryType(str, Enum):
     """Valid transcript entry types."""
@@ -86,6 +90,7 @@ class TranscriptWriter:
         self._sequence = 0
         self._lock = threading.Lock()
         self._buffer: list = []
+        self._held = 0  # Nesting depth of hold_flush()
         self._local = threading.local()
 
         # Create transcript directory
@@ -135,7 +140,8 @@ class TranscriptWriter:
         self._buffer.append(full_entry)
 
         # Auto-flush if buffer grows large
-        if len(self._buffer) >= 10:
+        threshold = HELD_FLUSH_THRESHOLD if self._held else FLUSH_THRESHOLD
+        if len(self._buffer) >= threshold:
             self.flush()
 
         return entry_id
@@ -210,6 +216,25 @@ class TranscriptWriter:
             "details": json.dumps(details or {"checkpoint_id": checkpoint_id})
         })
 
+    def hold_flush(self) -> None:
+        """
+        Defer automatic flushes until the matching release_flush().
+
+        For bursts of entries, such as an assertion chain: entries keep
+        their sequence and timestamp from write(), but reach the JSONL file
+        and database in fewer, larger flushes.
+        """
+        with self._lock:
+            self._held += 1
+
+    def release_flush(self) -> None:
+        """End a hold_flush(); flushes once the last hold is released."""
+        with self._lock:
+            self._held = max(0, self._held - 1)
+            held = self._held
+        if not held:
+            self.flush()
+
     def flush(self) -> None:
         """Flush buffered entries to disk and database."""
         with self._lock:
@@ -214,6 +214,104 @@ class TestFullArchivalWorkflow:
         records = reader.read_all()
         assert len(records) == 5
         assert all("_archived_at" in r for r in records)
+        first = min(records, key=lambda r: r["sequence"])
+        assert first["id"] == "old-0"
+        assert first["sequence"] == 0
+        assert first["summary"] == "Old entry 0"
+        assert first["task_id"] is None
+
+    def test_archive_in_multiple_batches(self, test_config, test_db):
+        """Test that records spanning several batches are all archived."""
+        test_config.batch_size = 2
+
+        with DatabaseArchiver(test_config) as archiver:
+            result = archiver.archive_table(
+                "transcript_entries",
+                older_than=timedelta(days=7)
+            )
+
+        assert result["status"] == "archived"
+        assert result["records"] == 5
+
+        conn = sqlite3.connect(str(test_db))
+        remaining = conn.execute(
+            "SELECT id FROM transcript_entries ORDER BY id"
+        ).fetchall()
+        conn.close()
+        assert [r[0] for r in remaining] == ["new-0", "new-1", "new-2"]
+
+        archives = list_archives(test_config.warm_path)
+        assert ArchiveReader(archives[0]).count() == 5
+
+    def test_archive_without_returning_support(self, test_config, test_db, monkeypatch):
+        """Test the SELECT + DELETE path used before SQLite 3.35."""
+        monkeypatch.setattr(sqlite3, "sqlite_version_info", (3, 34, 0))
+        test_config.batch_size = 2
+
+        with DatabaseArchiver(test_config) as archiver:
+            result = archiver.archive_table(
+                "transcript_entries",
+                older_than=timedelta(days=7)
+            )
+
+        assert result["records"] == 5
+        conn = sqlite3.connect(str(test_db))
+        remaining = conn.execute("SELECT COUNT(*) FROM transcript_entries").fetchone()[0]
+        conn.close()
+        assert remaining == 3
+        records = ArchiveReader(list_archives(test_config.warm_path)[0]).read_all()
+        assert sorted(r["id"] for r in records) == [f"old-{i}" for i in range(5)]
+
+    def test_max_rows_per_run_caps_archival(self, test_config, test_db):
+        """Test that a capped run leaves the backlog for the next run."""
+        test_config.batch_size = 2
+        test_config.max_rows_per_run = 3
+
+        with DatabaseArchiver(test_config) as archiver:
+            first = archiver.archive_table(
+                "transcript_entries",
+                older_than=timedelta(days=7)
+            )
+            second = archiver.archive_table(
+                "transcript_entries",
+                older_than=timedelta(days=7)
+            )
+
+        assert first["records"] == 3
+        assert first["remaining"] == 2
+        assert second["records"] == 2
+        assert second["remaining"] == 0
+
+    def test_timestamp_indexes_created(self, test_config, test_db):
+        """Test that archival predicates get an index on first use."""
+        with DatabaseArchiver(test_config) as archiver:
+            archiver.archive_table("transcript_entries", older_than=timedelta(days=7))
+            created_again = archiver.ensure_timestamp_indexes()
+
+        assert created_again == []
+
+        conn = sqlite3.connect(str(test_db))
+        index_columns = {
+            (row[0], row[1]) for row in conn.execute("""
+                SELECT m.tbl_name, i.name
+                FROM sqlite_master m, pragma_index_info(m.name) i
+                WHERE m.type = 'index' AND i.seqno = 0
+            """)
+        }
+        conn.close()
+        for table, policy in RETENTION_POLICIES.items():
+            assert (table, policy.timestamp_column) in index_columns
+
+    def test_query_plan_warns_on_sorted_batches(self, test_config, test_db, caplog):
+        """Test that a batch query needing a per-batch sort is reported."""
+        with DatabaseArchiver(test_config) as archiver:
+            with caplog.at_level("DEBUG", logger="shared.database_archiver"):
+                archiver._check_query_plan("transcript_entries", "summary")
+                archiver.ensure_timestamp_indexes()
+
+        warnings = [r for r in caplog.records if r.levelname == "WARNING"]
+        assert len(warnings) == 1
+        assert "transcript_entries" in warnings[0].getMessage()
 
     def test_archive_transcripts_command(self, test_config):
         """Test archive_transcripts convenience method."""
@@ -227,6 +325,107 @@ class TestFullArchivalWorkflow:
         assert "transcript_entries" in archived_tables
         assert "tool_uses" in archived_tables
 
+    def test_archive_transcripts_single_commit(self, test_config, test_db):
+        """Test that small tables archived together share one commit."""
+        statements = []
+
+        with DatabaseArchiver(test_config) as archiver:
+            archiver.ensure_timestamp_indexes()  # One-off, has its own commit
+            archiver._conn.set_trace_callback(statements.append)
+            results = archiver.archive_transcripts(older_than=timedelta(days=7))
+
+        assert sum(r["records"] for r in results) == 8  # 5 entries + 3 tool uses
+        assert statements.count("COMMIT") == 1
+
+        conn = sqlite3.connect(str(test_db))
+        assert conn.execute("SELECT COUNT(*) FROM tool_uses").fetchone()[0] == 0
+        conn.close()
+
+    def test_archive_transcripts_syncs_once_per_file(
+        self, test_config, test_db, monkeypatch
+    ):
+        """Test that shared-transaction runs fsync each archive at commit only."""
+        synced = []
+        original_sync = ArchiveWriter.sync
+        monkeypatch.setattr(
+            ArchiveWriter, "sync",
+            lambda self: (synced.append(self.table_name), original_sync(self))
+        )
+
+        with DatabaseArchiver(test_config) as archiver:
+            archiver.archive_transcripts(older_than=timedelta(days=7))
+
+        # One shared commit, so each table's file is synced exactly once
+        assert sorted(synced) == ["tool_uses", "transcript_entries"]
+
+    def test_table_done_reported_after_commit(self, test_config, test_db):
+        """Test that on_table_done only sees tables whose deletes are committed."""
+        seen = []
+
+        def on_table_done(result):
+            # A separate connection only sees committed deletes
+            conn = sqlite3.connect(str(test_db))
+            left = conn.execute(f"SELECT COUNT(*) FROM {result['table']}").fetchone()[0]
+            conn.close()
+            seen.append((result["table"], result["records"], left))
+
+        with DatabaseArchiver(test_config, on_table_done=on_table_done) as archiver:
+            archiver.archive_transcripts(older_than=timedelta(days=7))
+
+        assert ("transcript_entries", 5, 3) in seen
+        assert ("tool_uses", 3, 0) in seen
+
+    def test_later_table_error_rolls_back_earlier_results(self, test_config, test_db):
+        """Test that a rollback in a later table un-reports earlier tables."""
+        conn = sqlite3.connect(str(test_db))
+        conn.execute("""
+            CREATE TRIGGER block_tool_use_delete BEFORE DELETE ON tool_uses
+            BEGIN SELECT RAISE(ABORT, 'tool_uses is read-only'); END
+        """)
+        conn.commit()
+        conn.close()
+
+        with DatabaseArchiver(test_config) as archiver:
+            results = archiver.archive_transcripts(older_than=timedelta(days=7))
+        by_table = {r["table"]: r for r in results}
+
+        # transcript_entries' deletes were still uncommitted when tool_uses
+        # failed, so the rollback put them back
+        entries = by_table["transcript_entries"]
+        assert entries["status"] == "rolled_back"
+        assert entries["records"] == 0
+        assert entries["remaining"] == 5
+        assert by_table["tool_uses"]["records"] == 0
+
+        conn = sqlite3.connect(str(test_db))
+        assert conn.execute("SELECT COUNT(*) FROM transcript_entries").fetchone()[0] == 8
+        assert conn.execute("SELECT COUNT(*) FROM tool_uses").fetchone()[0] == 3
+        conn.close()
+
+    def test_wal_checkpointed_on_exit(self, test_config, test_db):
+        """Test that a WAL database is checkpointed when the archiver closes."""
+        conn = sqlite3.connect(str(test_db))
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.close()
+
+        with DatabaseArchiver(test_config) as archiver:
+            archiver.archive_table("transcript_entries", older_than=timedelta(days=7))
+
+        wal_file = Path(f"{test_db}-wal")
+        assert not wal_file.exists() or wal_file.stat().st_size == 0
+
+    def test_wal_opt_in(self, test_config, test_db):
+        """Test that the journal mode only changes when config.wal is set."""
+        with DatabaseArchiver(test_config) as archiver:
+            mode = archiver._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "delete"
+
+        test_config.wal = True
+        with DatabaseArchiver(test_config) as archiver:
+            archiver.archive_table("transcript_entries", older_than=timedelta(days=7))
+            mode = archiver._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
     def test_dry_run_mode(self, test_config, test_db):
         """Test that dry run doesn't modify data."""
         with DatabaseArchiver(test_config) as archiver:
@@ -245,6 +444,10 @@ class TestFullArchivalWorkflow:
             "SELECT COUNT(*) FROM transcript_entries"
         ).fetchone()[0]
         assert count == 8  # All records still present
+        indexes = conn.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL"
+        ).fetchone()[0]
+        assert indexes == 0  # Index creation is deferred to a real run
         conn.close()
 
         # Verify no archive created
@@ -259,6 +462,112 @@ class TestFullArchivalWorkflow:
         assert result["status"] == "exempt"
         assert result["records"] == 0
 
+    def test_archive_direct_to_cold(self, test_config):
+        """Test archiving straight into the month's cold tar, one member per batch."""
+        import gzip
+        import json
+        import tarfile
+
+        test_config.direct_to_cold = True
+        test_config.batch_size = 2
+
+        with DatabaseArchiver(test_config) as archiver:
+            first = archiver.archive_table("transcript_entries", older_than=timedelta(days=7))
+            second = archiver.archive_table("tool_uses", older_than=timedelta(days=7))
+
+        assert first["records"] == 5
+        assert second["archive_file"] == first["archive_file"]
+        assert list_archives(test_config.warm_path) == []
+
+        with tarfile.open(first["archive_file"]) as tar:
+            members = tar.getmembers()
+            records = [
+                json.loads(line)
+                for m in members
+                for line in gzip.decompress(tar.extractfile(m).read()).splitlines()
+            ]
+
+        # 5 transcript entries in batches of 2, then 3 tool uses
+        assert len(members) == 5
+        assert all(m.name.endswith(".jsonl.gz") for m in members)
+        assert len(records) == 8
+        assert all("_archived_at" in r for r in records)
+
+        # Cleanup sees the tar like any consolidated month
+        status = ArchiveCleanup(test_config).get_retention_status()
+        assert status["cold"]["total_files"] == 1
+
+    def test_concurrent_direct_to_cold_archivers(
+        self, test_config, test_db, monkeypatch
+    ):
+        """Test two archivers sharing a month's cold tar do not deadlock."""
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+        from shared import archive_writer
+
+        # Pause before each tar lock so the other archiver gets a turn at
+        # it, including at table boundaries where a shared transaction is
+        # still open.
+        open_cold_tar = archive_writer.open_cold_tar
+
+        def yielding_open_cold_tar(*args, **kwargs):
+            time.sleep(0.01)
+            return open_cold_tar(*args, **kwargs)
+
+        monkeypatch.setattr(archive_writer, "open_cold_tar", yielding_open_cold_tar)
+
+        old = (
+            datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=60)
+        ).isoformat()
+        conn = sqlite3.connect(str(test_db))
+        for table, column in [
+            ("transcript_entries", "timestamp"),
+            ("tool_uses", "start_time"),
+            ("assertion_results", "timestamp"),
+            ("assertion_chains", "created_at"),
+        ]:
+            conn.execute(f"DELETE FROM {table}")
+            if table == "transcript_entries":
+                conn.executemany(
+                    "INSERT INTO transcript_entries (id, timestamp) VALUES (?, ?)",
+                    [(f"r{i}", old) for i in range(3000)]
+                )
+            else:
+                conn.executemany(
+                    f"INSERT INTO {table} (id, {column}) VALUES (?, ?)",
+                    [(f"r{i}", old) for i in range(3000)]
+                )
+        conn.commit()
+        conn.close()
+
+        test_config.direct_to_cold = True
+        # Not a divisor of 3000: each table ends on a partial batch, which
+        # the shared transaction holds uncommitted into the next table
+        test_config.batch_size = 700
+
+        def run(phase):
+            with DatabaseArchiver(test_config) as archiver:
+                return getattr(archiver, phase)()
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            futures = [
+                pool.submit(run, "archive_transcripts"),
+                pool.submit(run, "archive_assertions"),
+            ]
+            results = [r for f in futures for r in f.result(timeout=120)]
+
+        by_table = {r["table"]: r for r in results}
+        for table in ("transcript_entries", "tool_uses",
+                      "assertion_results", "assertion_chains"):
+            assert by_table[table]["status"] == "archived"
+            assert by_table[table]["records"] == 3000
+            assert by_table[table]["remaining"] == 0
+
+        conn = sqlite3.connect(str(test_db))
+        for table in ("transcript_entries", "assertion_results"):
+            assert conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] == 0
+        conn.close()
+
 
 class TestArchiveCleanupWorkflow:
     """Integration tests for archive cleanup."""
@@ -287,14 +596,154 @@ class TestArchiveCleanupWorkflow:
         assert result["consolidated"] == 1
         assert len(result["cold_files"]) == 1
 
-        # Verify cold archive created
-        cold_archives = list(test_config.cold_path.rglob("*.tar.gz"))
+        # Verify cold archive created; gzipped warm files are stored as-is
+        cold_archives = list(test_config.cold_path.rglob("*.tar"))
         assert len(cold_archives) == 1
 
         # Verify warm archive removed
         warm_archives = list_archives(test_config.warm_path)
         assert len(warm_archives) == 1  # Only recent remains
 
+    def test_consolidate_several_months(self, test_config):
+        """Test that each month gets its own cold archive."""
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        for days in (45, 80):
+            with ArchiveWriter(
+                test_config.warm_path, "test_table", now - timedelta(days=days)
+            ) as writer:
+                writer.write_record({"id": str(days)})
+
+        cleanup = ArchiveCleanup(test_config)
+        result = cleanup.consolidate_to_cold(older_than=timedelta(days=30))
+
+        assert result["consolidated"] == 2
+        assert len(result["cold_files"]) == 2
+        assert len(result["removed_warm"]) == 2
+        assert list_archives(test_config.warm_path) == []
+
+    @pytest.mark.parametrize("compress", [True, False])
+    def test_consolidate_month_over_several_runs(self, test_config, compress):
+        """Test that a later run adds to the month's archive instead of replacing it."""
+        import tarfile
+
+        first_of_month = (
+            datetime.now(timezone.utc).replace(tzinfo=None, day=1) - timedelta(days=40)
+        ).replace(day=1)
+        cleanup = ArchiveCleanup(test_config)
+
+        cold_files = set()
+        for day in (first_of_month, first_of_month + timedelta(days=1)):
+            with ArchiveWriter(
+                test_config.warm_path, "test_table", day, compress=compress
+            ) as writer:
+                writer.write_record({"id": day.isoformat()})
+            result = cleanup.consolidate_to_cold(older_than=timedelta(days=30))
+            cold_files.update(result["cold_files"])
+
+        assert len(cold_files) == 1
+        with tarfile.open(cold_files.pop()) as tar:
+            assert len(tar.getnames()) == 2
+
+    def test_consolidate_skips_files_already_in_tar(self, test_config):
+        """Test that a warm file left over from an interrupted run is not added twice."""
+        import shutil
+        import tarfile
+
+        old_date = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=45)
+        with ArchiveWriter(test_config.warm_path, "test_table", old_date) as writer:
+            writer.write_record({"id": "1"})
+            archive_file = writer.archive_file
+        leftover = test_config.base_path / "leftover"
+        shutil.copy(archive_file, leftover)
+
+        cleanup = ArchiveCleanup(test_config)
+        cleanup.consolidate_to_cold(older_than=timedelta(days=30))
+        # Simulate a crash between writing the tar and deleting warm files
+        archive_file.parent.mkdir()
+        shutil.move(leftover, archive_file)
+        result = cleanup.consolidate_to_cold(older_than=timedelta(days=30))
+
+        with tarfile.open(result["cold_files"][0]) as tar:
+            assert len(tar.getnames()) == 1
+        assert list_archives(test_config.warm_path) == []
+
+    def test_dry_run_cleanup_lists_warm_once(self, test_config, monkeypatch):
+        """Test that a dry-run cleanup reuses one warm listing for every step."""
+        import shared.archive_cleanup as archive_cleanup
+
+        calls = []
+        real_list_archives = archive_cleanup.list_archives
+        monkeypatch.setattr(
+            archive_cleanup,
+            "list_archives",
+            lambda path: calls.append(path) or real_list_archives(path)
+        )
+        test_config.gzip_after_days = 1
+        old_date = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=45)
+        with ArchiveWriter(
+            test_config.warm_path, "test_table", old_date, compress=False
+        ) as writer:
+            writer.write_record({"id": "1"})
+
+        cleanup = ArchiveCleanup(test_config)
+        result = cleanup.cleanup_all(dry_run=True)
+
+        assert result["compression"]["compressed"] == 1
+        assert result["consolidation"]["consolidated"] == 1
+        assert len(calls) == 1
+
+        # A real run changes the tree, so the next step lists it again
+        cleanup.cleanup_all()
+        assert len(calls) == 3
+
+    def test_separate_calls_see_new_warm_files(self, test_config):
+        """Test that listings are not reused outside a single cleanup_all()."""
+        old_date = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=10)
+        with ArchiveWriter(
+            test_config.warm_path, "test_table", old_date, compress=False
+        ) as writer:
+            writer.write_record({"id": "1"})
+
+        cleanup = ArchiveCleanup(test_config)
+        assert cleanup.compress_warm(timedelta(days=7), dry_run=True)["compressed"] == 1
+
+        # Added to the existing date directory: the warm root's mtime is unchanged
+        with ArchiveWriter(
+            test_config.warm_path, "other_table", old_date, compress=False
+        ) as writer:
+            writer.write_record({"id": "2"})
+
+        assert cleanup.compress_warm(timedelta(days=7), dry_run=True)["compressed"] == 2
+
+    def test_consolidate_through_external_gzip(self, test_config, monkeypatch):
+        """Test consolidation piping the tar stream through pigz."""
+        import shutil
+        import tarfile
+
+        gzip_bin = shutil.which("gzip")
+        if not gzip_bin:
+            pytest.skip("gzip binary not available")
+        # gzip takes the same "-c -N" arguments as pigz
+        monkeypatch.setattr(
+            "shared.archive_cleanup.shutil.which",
+            lambda name: gzip_bin if name == "pigz" else None
+        )
+
+        # Plain JSONL warm files are the ones that still get gzipped
+        old_date = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=45)
+        with ArchiveWriter(
+            test_config.warm_path, "test_table", old_date, compress=False
+        ) as writer:
+            writer.write_record({"id": "1"})
+
+        cleanup = ArchiveCleanup(test_config)
+        result = cleanup.consolidate_to_cold(older_than=timedelta(days=30))
+
+        with tarfile.open(result["cold_files"][0], "r:gz") as tar:
+            assert tar.getnames() == [
+                f"{old_date.strftime('%Y-%m-%d')}/test_table.jsonl"
+            ]
+
     def test_purge_expired_archives(self, test_config):
         """Test purging expired cold archives."""
         import tarfile
@@ -336,6 +785,84 @@ class TestArchiveCleanupWorkflow:
         # The recent archive should still exist
         assert recent_tar_path.exists()
 
+    def test_compress_warm_archives(self, test_config):
+        """Test gzipping aged plain warm archives into the day's .jsonl.gz."""
+        old_date = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=10)
+        with ArchiveWriter(test_config.warm_path, "test_table", old_date) as writer:
+            writer.write_record({"id": "gz"})
+        with ArchiveWriter(
+            test_config.warm_path, "test_table", old_date, compress=False
+        ) as writer:
+            writer.write_record({"id": "plain"})
+
+        recent_date = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=1)
+        with ArchiveWriter(
+            test_config.warm_path, "test_table", recent_date, compress=False
+        ) as writer:
+            writer.write_record({"id": "recent"})
+
+        cleanup = ArchiveCleanup(test_config)
+        result = cleanup.compress_warm(older_than=timedelta(days=7))
+
+        assert result["compressed"] == 1
+        archives = list_archives(test_config.warm_path)
+        assert sorted(a.name for a in archives) == ["test_table.jsonl", "test_table.jsonl.gz"]
+        old_archive = next(a for a in archives if a.suffix == ".gz")
+        assert [r["id"] for r in ArchiveReader(old_archive)] == ["gz", "plain"]
+
+    def test_consolidate_to_parquet(self, test_config):
+        """Test consolidating warm archives into per-table Parquet files."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        test_config.cold_format = "parquet"
+
+        old_date = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=45)
+        with ArchiveWriter(
+            test_config.warm_path, "test_table", old_date
+        ) as writer:
+            for i in range(10):
+                writer.write_record({"id": str(i), "data": f"record {i}"})
+
+        cleanup = ArchiveCleanup(test_config)
+        result = cleanup.consolidate_to_cold(older_than=timedelta(days=30))
+
+        assert result["consolidated"] == 1
+        parquet_path = Path(result["cold_files"][0])
+        assert parquet_path.name == f"{old_date:%Y-%m}.test_table.parquet"
+        assert pq.read_table(parquet_path).num_rows == 10
+        assert list_archives(test_config.warm_path) == []
+
+    def test_purge_expired_parquet_archives(self, test_config):
+        """Test that expired Parquet cold archives are purged by month."""
+        year_dir = test_config.cold_path / "2022"
+        year_dir.mkdir(parents=True, exist_ok=True)
+        old_path = year_dir / "2022-01.tool_uses.parquet"
+        old_path.write_bytes(b"PAR1")
+
+        cleanup = ArchiveCleanup(test_config)
+        result = cleanup.purge_expired(dry_run=False)
+
+        assert result["purged_files"] == [str(old_path)]
+        assert not old_path.exists()
+
+    def test_purge_uses_table_policy_for_parquet(self, test_config):
+        """Test that per-table cold archives expire with their own policy."""
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        month = (now - timedelta(days=200)).strftime("%Y-%m")
+        year_dir = test_config.cold_path / month[:4]
+        year_dir.mkdir(parents=True, exist_ok=True)
+
+        # message_bus_log keeps 127 days in total, assertions keep 850
+        mbus_path = year_dir / f"{month}.message_bus_log.parquet"
+        assertion_path = year_dir / f"{month}.assertion_results.parquet"
+        mbus_path.write_bytes(b"PAR1")
+        assertion_path.write_bytes(b"PAR1")
+
+        cleanup = ArchiveCleanup(test_config)
+        result = cleanup.purge_expired(dry_run=False)
+
+        assert result["purged_files"] == [str(mbus_path)]
+        assert assertion_path.exists()
+
     def test_retention_status(self, test_config):
         """Test retention status reporting."""
         # Create some archives
@@ -345,13 +872,20 @@ class TestArchiveCleanupWorkflow:
             datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=5)
         ) as writer:
             writer.write_record({"id": "1"})
+        with ArchiveWriter(
+            test_config.warm_path,
+            "test_table",
+            datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=45)
+        ) as writer:
+            writer.write_record({"id": "2"})
 
         cleanup = ArchiveCleanup(test_config)
         status = cleanup.get_retention_status()
 
         assert "warm" in status
         assert "cold" in status
-        assert status["warm"]["total_files"] == 1
+        assert status["warm"]["total_files"] == 2
+        assert status["warm"]["eligible_for_cold"] == 1
 
 
 class TestStatisticsTracking:
@@ -63,6 +63,15 @@ class TestRetentionPolicy:
         )
         assert policy.cold_threshold == policy.warm_threshold
 
+    def test_policy_is_immutable(self):
+        """Thresholds are cached, so the day counts cannot change under them."""
+        import dataclasses
+
+        policy = RETENTION_POLICIES["transcript_entries"]
+        assert policy.hot_threshold is policy.hot_threshold
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            policy.hot_days = 1
+
 
 class TestRetentionPolicies:
     """Tests for predefined retention policies."""
@@ -130,7 +139,8 @@ class TestArchiveConfig:
         assert config.base_path.name == "archives"
         assert config.db_path.name == "ideas.db"
         assert config.compress is True
-        assert config.batch_size == 1000
+        assert config.compresslevel == 1
+        assert config.batch_size == 5000
 
     def test_warm_path(self):
         config = ArchiveConfig(
@@ -155,3 +165,15 @@ class TestArchiveConfig:
 
         assert config.warm_path.exists()
         assert config.cold_path.exists()
+
+    def test_ensure_directories_follows_base_path(self, tmp_path):
+        config = ArchiveConfig(
+            base_path=tmp_path / "archives",
+            db_path=tmp_path / "test.db"
+        )
+        config.ensure_directories()
+        config.base_path = tmp_path / "other"
+        config.ensure_directories()
+
+        assert config.warm_path == tmp_path / "other" / "warm"
+        assert config.warm_path.exists()
@@ -6,14 +6,23 @@ Unit tests for archive writer.
 import gzip
 import json
 import pytest
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+from shared.archive_cleanup import ArchiveCleanup
+from shared.archive_config import ArchiveConfig
+
 from shared.archive_writer import (
     ArchiveWriter,
     ArchiveReader,
+    CODEC_SUFFIXES,
+    ColdStreamingWriter,
     list_archives,
-    get_archive_stats
+    get_archive_stats,
+    parse_archive_date,
+    parse_archive_month,
+    parse_cold_archive_name,
+    open_compressed
 )
 
 
@@ -71,6 +80,48 @@ class TestArchiveWriter:
 
         assert "_archived_at" in record
 
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_serializes_non_json_values(self, tmp_path, monkeypatch, use_orjson):
+        import shared.archive_writer as archive_writer
+
+        if not use_orjson:
+            monkeypatch.setattr(archive_writer, "orjson", None)
+        elif archive_writer.orjson is None:
+            pytest.skip("orjson not installed")
+
+        with ArchiveWriter(tmp_path, "test_table", datetime(2026, 1, 15)) as writer:
+            writer.write_record({"id": "1", "path": Path("a/b"), "name": "ü"})
+
+        record = ArchiveReader(writer.archive_file).read_all()[0]
+        assert record["path"] == "a/b"
+        assert record["name"] == "ü"
+
+    @pytest.mark.parametrize("codec,module,suffix", [
+        ("zstd", "zstandard", ".zst"),
+        ("lz4", "lz4.frame", ".lz4"),
+    ])
+    def test_writes_with_codec(self, tmp_path, codec, module, suffix):
+        pytest.importorskip(module)
+        archive_date = datetime(2026, 1, 15)
+
+        # Two sessions append two frames; the reader sees one stream
+        for i in range(2):
+            with ArchiveWriter(tmp_path, "test_table", archive_date, codec=codec) as writer:
+                writer.write_record({"id": str(i)})
+
+        assert writer.archive_file.name == f"test_table.jsonl{suffix}"
+        records = ArchiveReader(writer.archive_file).read_all()
+        assert [r["id"] for r in records] == ["0", "1"]
+
+    def test_falls_back_to_gzip_without_codec(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(
+            "shared.archive_writer.codec_available", lambda codec: codec == "gzip"
+        )
+
+        writer = ArchiveWriter(tmp_path, "test_table", datetime(2026, 1, 15), codec="zstd")
+
+        assert writer.archive_file.name == "test_table.jsonl.gz"
+
     def test_tracks_records_written(self, tmp_path):
         archive_date = datetime(2026, 1, 15)
 
@@ -81,6 +132,26 @@ class TestArchiveWriter:
 
         assert writer.records_written == 4
 
+    def test_write_lines(self, tmp_path):
+        archive_date = datetime(2026, 1, 15)
+
+        with ArchiveWriter(tmp_path, "test_table", archive_date, compress=False) as writer:
+            writer.write_lines(['{"id":"1"}', '{"id":"2"}'])
+
+        assert writer.records_written == 2
+        records = ArchiveReader(writer.archive_file).read_all()
+        assert [r["id"] for r in records] == ["1", "2"]
+
+    def test_sync_makes_records_readable(self, tmp_path):
+        archive_date = datetime(2026, 1, 15)
+
+        with ArchiveWriter(tmp_path, "test_table", archive_date, compress=False) as writer:
+            writer.write_batch([{"id": "1"}, {"id": "2"}])
+            writer.sync()
+
+            # Everything written so far is on disk before the file is closed
+            assert ArchiveReader(writer.archive_file).count() == 2
+
     def test_raises_when_not_opened(self, tmp_path):
         writer = ArchiveWriter(tmp_path, "test_table", datetime.now())
 
@@ -88,6 +159,81 @@ class TestArchiveWriter:
             writer.write_record({"id": "1"})
 
 
+class TestColdStreamingWriter:
+    """Tests for ColdStreamingWriter."""
+
+    def test_appends_one_member_per_sync(self, tmp_path):
+        import tarfile
+
+        archive_date = datetime(2026, 1, 15)
+        for i in range(2):
+            with ColdStreamingWriter(tmp_path, "test_table", archive_date) as writer:
+                writer.write_batch([{"id": str(i)}])
+                writer.sync()
+                writer.write_batch([{"id": f"{i}b"}])
+
+        assert writer.archive_file == tmp_path / "2026" / "2026-01.tar"
+        with tarfile.open(writer.archive_file) as tar:
+            names = tar.getnames()
+            records = [
+                json.loads(gzip.decompress(tar.extractfile(name).read()))["id"]
+                for name in names
+            ]
+
+        assert len(names) == 4
+        assert all(n.startswith("2026-01-15/test_table.") for n in names)
+        assert records == ["0", "0b", "1", "1b"]
+
+    def test_failed_append_leaves_tar_appendable(self, tmp_path, monkeypatch):
+        import tarfile
+        import shared.archive_writer as archive_writer
+
+        archive_date = datetime(2026, 1, 15)
+        with ColdStreamingWriter(tmp_path, "test_table", archive_date) as writer:
+            writer.write_batch([{"id": "1"}])
+
+        def failing_fsync(fd):
+            raise OSError("disk full")
+
+        with pytest.raises(OSError):
+            with ColdStreamingWriter(tmp_path, "test_table", archive_date) as writer:
+                writer.write_batch([{"id": "2"}])
+                monkeypatch.setattr(archive_writer.os, "fsync", failing_fsync)
+                writer.sync()
+        monkeypatch.undo()
+
+        with ColdStreamingWriter(tmp_path, "test_table", archive_date) as writer:
+            writer.write_batch([{"id": "3"}])
+
+        with tarfile.open(writer.archive_file) as tar:
+            assert len(tar.getnames()) == 2
+
+    def test_repairs_tar_left_by_killed_writer(self, tmp_path):
+        import tarfile
+
+        archive_date = datetime(2026, 1, 15)
+        with ColdStreamingWriter(tmp_path, "test_table", archive_date) as writer:
+            writer.write_batch([{"id": "1"}])
+            writer.sync()
+            writer.write_batch([{"id": "2"}])
+
+        # A kill mid-append leaves a partial member and no end blocks
+        with tarfile.open(writer.archive_file) as tar:
+            partial = tar.getmembers()[1]
+        with open(writer.archive_file, "r+b") as f:
+            f.truncate(partial.offset_data + 10)
+
+        with ColdStreamingWriter(tmp_path, "test_table", archive_date) as writer:
+            writer.write_batch([{"id": "3"}])
+
+        with tarfile.open(writer.archive_file) as tar:
+            ids = [
+                json.loads(gzip.decompress(tar.extractfile(m).read()))["id"]
+                for m in tar.getmembers()
+            ]
+        assert ids == ["1", "3"]
+
+
 class TestArchiveReader:
     """Tests for ArchiveReader."""
 
@@ -120,6 +266,35 @@ class TestArchiveReader:
         reader = ArchiveReader(archive_file)
         assert reader.count() == 3
 
+    def test_count_compressed_skips_blank_lines(self, tmp_path):
+        archive_file = tmp_path / "test.jsonl.gz"
+        with gzip.open(archive_file, "wt") as f:
+            f.write('{"id": "1"}\n\n{"id": "2"}\n')
+
+        assert ArchiveReader(archive_file).count() == 2
+
+    @pytest.mark.parametrize("codec,module", [
+        ("gzip", "gzip"),
+        ("zstd", "zstandard"),
+        ("lz4", "lz4.frame"),
+    ])
+    def test_count_with_codec(self, tmp_path, codec, module):
+        pytest.importorskip(module)
+        archive_file = tmp_path / f"test.jsonl{CODEC_SUFFIXES[codec]}"
+        with open_compressed(archive_file, "wb", codec) as f:
+            f.write(b'\n{"id": "1"}\n\n\n{"id": "2"}\n{"id": "3"}')
+
+        assert ArchiveReader(archive_file).count() == 3
+
+    def test_count_blank_line_across_chunks(self, tmp_path):
+        archive_file = tmp_path / "test.jsonl"
+        # The first record's newline ends the first 1 MiB read, and the
+        # empty line after it starts the second
+        first = '{"pad": "' + "x" * ((1 << 20) - 12) + '"}'
+        archive_file.write_text(first + '\n\n{"id": "2"}\n')
+
+        assert ArchiveReader(archive_file).count() == 2
+
     def test_read_all(self, tmp_path):
         archive_file = tmp_path / "test.jsonl"
         archive_file.write_text('{"id": "1"}\n{"id": "2"}\n')
@@ -131,6 +306,49 @@ class TestArchiveReader:
         assert len(records) == 2
 
 
+@pytest.mark.parametrize("codec,module", [
+    ("gzip", "gzip"),
+    ("zstd", "zstandard"),
+    ("lz4", "lz4.frame"),
+])
+class TestCodecRoundTrip:
+    """Write, read, count and compress_warm append for each codec."""
+
+    def test_write_then_read_and_count(self, tmp_path, codec, module):
+        pytest.importorskip(module)
+        with ArchiveWriter(tmp_path, "test_table", datetime(2026, 1, 15), codec=codec) as writer:
+            for i in range(3):
+                writer.write_record({"id": str(i), "name": "ü"})
+
+        assert writer.archive_file.name == f"test_table.jsonl{CODEC_SUFFIXES[codec]}"
+        reader = ArchiveReader(writer.archive_file)
+        assert [r["id"] for r in reader.read_all()] == ["0", "1", "2"]
+        assert reader.read_all()[0]["name"] == "ü"
+        assert reader.count() == 3
+
+    def test_compress_warm_appends_to_day_file(self, tmp_path, codec, module):
+        pytest.importorskip(module)
+        config = ArchiveConfig(
+            base_path=tmp_path / "archives", db_path=tmp_path / "test.db", codec=codec
+        )
+        old_date = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=10)
+        with ArchiveWriter(config.warm_path, "test_table", old_date, codec=codec) as writer:
+            writer.write_record({"id": "compressed"})
+        with ArchiveWriter(
+            config.warm_path, "test_table", old_date, compress=False
+        ) as writer:
+            writer.write_record({"id": "plain"})
+
+        result = ArchiveCleanup(config).compress_warm(older_than=timedelta(days=7))
+
+        assert result["compressed"] == 1
+        archives = list_archives(config.warm_path)
+        assert [a.name for a in archives] == [f"test_table.jsonl{CODEC_SUFFIXES[codec]}"]
+        reader = ArchiveReader(archives[0])
+        assert [r["id"] for r in reader.read_all()] == ["compressed", "plain"]
+        assert reader.count() == 2
+
+
 class TestListArchives:
     """Tests for list_archives."""
 
@@ -214,3 +432,44 @@ class TestGetArchiveStats:
 
         assert stats["oldest_archive"] == "2026-01-10"
         assert stats["newest_archive"] == "2026-01-20"
+
+    def test_counts_eligible_before_cutoff(self, tmp_path):
+        for date_str in ("2026-01-10", "2026-01-15", "2026-01-20"):
+            (tmp_path / date_str).mkdir()
+            (tmp_path / date_str / "table.jsonl.gz").touch()
+
+        stats = get_archive_stats(tmp_path, eligible_cutoff=datetime(2026, 1, 15))
+
+        assert stats["eligible"] == 1
+        assert "eligible" not in get_archive_stats(tmp_path)
+
+
+class TestParseArchiveDates:
+    """Tests for parse_archive_date and parse_archive_month."""
+
+    def test_parses_date_and_month(self):
+        assert parse_archive_date("2026-01-15") == datetime(2026, 1, 15)
+        assert parse_archive_month("2026-01") == datetime(2026, 1, 1)
+
+    @pytest.mark.parametrize("name", ["2026-13-01", "2026-02-30", "2026_01_15", "latest", ""])
+    def test_rejects_bad_dates(self, name):
+        with pytest.raises(ValueError):
+            parse_archive_date(name)
+
+    @pytest.mark.parametrize("name", ["2026-13", "2026-1", "2026_01"])
+    def test_rejects_bad_months(self, name):
+        with pytest.raises(ValueError):
+            parse_archive_month(name)
+
+    @pytest.mark.parametrize("name,table", [
+        ("2026-01.tar", None),
+        ("2026-01.tar.gz", None),
+        ("2026-01.tool_uses.parquet", "tool_uses"),
+    ])
+    def test_parses_cold_archive_names(self, name, table):
+        assert parse_cold_archive_name(name) == (datetime(2026, 1, 1), table)
+
+    @pytest.mark.parametrize("name", ["2026-01.parquet", "2026-01.zip", "latest.tar"])
+    def test_rejects_bad_cold_archive_names(self, name):
+        with pytest.raises(ValueError):
+            parse_cold_archive_name(name)
@@ -0,0 +1,252 @@
+# coding-loops/tests/test_assertion_recorder.py
+"""
+Tests for AssertionRecorder's background writer.
+"""
+
+import sqlite3
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from shared import assertion_recorder
+from shared.assertion_recorder import AssertionRecorder
+
+
+class FakeTranscript:
+    """The parts of TranscriptWriter the recorder uses."""
+
+    wave_id = "wave-1"
+
+    def __init__(self):
+        self.entries = []
+        self.held = 0
+
+    def write(self, entry):
+        self.entries.append(entry)
+
+    def hold_flush(self):
+        self.held += 1
+
+    def release_flush(self):
+        self.held -= 1
+
+
+@pytest.fixture
+def test_db(tmp_path):
+    """Create a database with the assertion tables."""
+    db_path = tmp_path / "ideas.db"
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript("""
+        CREATE TABLE assertion_results (
+            id TEXT PRIMARY KEY,
+            task_id TEXT NOT NULL,
+            execution_id TEXT NOT NULL,
+            category TEXT NOT NULL,
+            description TEXT NOT NULL,
+            result TEXT NOT NULL,
+            evidence TEXT NOT NULL,
+            chain_id TEXT,
+            chain_position INTEGER,
+            timestamp TEXT NOT NULL,
+            wave_id TEXT
+        );
+
+        CREATE TABLE assertion_chains (
+            id TEXT PRIMARY KEY,
+            task_id TEXT NOT NULL,
+            execution_id TEXT NOT NULL,
+            description TEXT NOT NULL,
+            overall_result TEXT NOT NULL,
+            pass_count INTEGER NOT NULL DEFAULT 0,
+            fail_count INTEGER NOT NULL DEFAULT 0,
+            first_failure_id TEXT,
+            started_at TEXT,
+            completed_at TEXT,
+            wave_id TEXT
+        );
+    """)
+    conn.close()
+    return db_path
+
+
+@pytest.fixture
+def recorder(test_db):
+    """Recorder writing to the test database."""
+    recorder = AssertionRecorder(FakeTranscript(), "exec-1", db_path=test_db)
+    yield recorder
+    recorder.close()
+
+
+@pytest.fixture
+def statements(recorder):
+    """SQL statements run on the recorder's connection."""
+    statements = []
+    recorder._get_connection().set_trace_callback(statements.append)
+    return statements
+
+
+@pytest.fixture(autouse=True)
+def slow_flush(monkeypatch):
+    """Only a full batch, a flush or a statement ends a batch."""
+    monkeypatch.setattr(assertion_recorder, "FLUSH_INTERVAL", 60)
+
+
+def count_rows(db_path: Path, table: str) -> int:
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+class TestChains:
+    """Tests for assertion chains."""
+
+    def test_chain_update_commits_with_last_assertions(
+        self, recorder, statements, test_db
+    ):
+        chain_id = recorder.start_chain("task-1", "Files are in place")
+        recorder.assert_manual("task-1", "custom", "first", True)
+        recorder.assert_manual("task-1", "custom", "second", False)
+        result = recorder.end_chain(chain_id)
+
+        assert (result.overall_result, result.pass_count, result.fail_count) == ("fail", 1, 1)
+        assert recorder.transcript.held == 0
+
+        # The rows and the closing UPDATE are one transaction
+        tail = statements[-3:]
+        assert tail[0].lstrip().startswith("INSERT INTO assertion_results")
+        assert tail[1].lstrip().startswith("UPDATE assertion_chains")
+        assert tail[2] == "COMMIT"
+
+        conn = sqlite3.connect(str(test_db))
+        chain = conn.execute(
+            "SELECT overall_result, pass_count, fail_count, first_failure_id, wave_id "
+            "FROM assertion_chains WHERE id = ?", (chain_id,)
+        ).fetchone()
+        positions = conn.execute(
+            "SELECT chain_position FROM assertion_results WHERE chain_id = ? "
+            "ORDER BY chain_position", (chain_id,)
+        ).fetchall()
+        conn.close()
+        assert chain[:3] == ("fail", 1, 1)
+        assert chain[3] == result.first_failure_id
+        assert chain[4] == "wave-1"
+        assert positions == [(0,), (1,)]
+
+
+class TestBatchedInsert:
+    """Tests for the multi-row INSERT."""
+
+    def test_rows_share_one_insert(self, recorder, statements, test_db):
+        for i in range(5):
+            recorder.assert_manual("task-1", "custom", f"check {i}", True)
+        recorder.flush()
+
+        inserts = [s for s in statements if "INSERT INTO assertion_results" in s]
+        assert len(inserts) == 1
+
+        conn = sqlite3.connect(str(test_db))
+        rows = conn.execute(
+            "SELECT DISTINCT execution_id, wave_id FROM assertion_results"
+        ).fetchall()
+        conn.close()
+        assert rows == [("exec-1", "wave-1")]
+        assert count_rows(test_db, "assertion_results") == 5
+
+    def test_insert_split_under_variable_limit(
+        self, recorder, statements, test_db
+    ):
+        # Room for ?1, ?2 and two rows per statement
+        recorder._get_connection().setlimit(
+            sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER,
+            2 + 2 * assertion_recorder.ASSERTION_ROW_PARAMS
+        )
+        for i in range(5):
+            recorder.assert_manual("task-1", "custom", f"check {i}", True)
+        recorder.flush()
+
+        inserts = [s for s in statements if "INSERT INTO assertion_results" in s]
+        assert len(inserts) == 3
+        assert count_rows(test_db, "assertion_results") == 5
+
+
+class TestDraining:
+    """Tests that queued writes are not lost."""
+
+    def test_close_drains_queue(self, test_db):
+        recorder = AssertionRecorder(FakeTranscript(), "exec-1", db_path=test_db)
+        for i in range(5):
+            recorder.assert_manual("task-1", "custom", f"check {i}", True)
+        recorder.close()
+
+        assert count_rows(test_db, "assertion_results") == 5
+
+    def test_interpreter_exit_drains_queue(self, test_db):
+        script = f"""
+import sys
+sys.path.insert(0, {str(Path(__file__).parent.parent)!r})
+from shared import assertion_recorder
+assertion_recorder.FLUSH_INTERVAL = 60
+
+class FakeTranscript:
+    wave_id = None
+    def write(self, entry):
+        pass
+
+recorder = assertion_recorder.AssertionRecorder(
+    FakeTranscript(), "exec-1", db_path={str(test_db)!r}
+)
+for i in range(5):
+    recorder.assert_manual("task-1", "custom", f"check {{i}}", True)
+"""
+        subprocess.run([sys.executable, "-c", script], check=True, timeout=30)
+
+        assert count_rows(test_db, "assertion_results") == 5
+
+    def test_failed_batch_does_not_hang_flush(self, recorder, test_db, capsys):
+        conn = sqlite3.connect(str(test_db))
+        conn.execute("""
+            CREATE TRIGGER reject_assertions BEFORE INSERT ON assertion_results
+            BEGIN SELECT RAISE(ABORT, 'rejected'); END
+        """)
+        conn.commit()
+
+        recorder.assert_manual("task-1", "custom", "rejected", True)
+        flusher = threading.Thread(target=recorder.flush, daemon=True)
+        flusher.start()
+        flusher.join(timeout=10)
+        assert not flusher.is_alive()
+        assert "Failed to record assertions" in capsys.readouterr().out
+
+        # The writer survives the failure
+        conn.execute("DROP TRIGGER reject_assertions")
+        conn.commit()
+        conn.close()
+        recorder.assert_manual("task-1", "custom", "accepted", True)
+        recorder.flush()
+        assert count_rows(test_db, "assertion_results") == 1
+
+
+class TestFileAssertions:
+    """Tests for file assertions."""
+
+    def test_existence_checked_at_each_assertion(
+        self, recorder, test_db, tmp_path
+    ):
+        path = tmp_path / "output.txt"
+        path.write_text("done")
+        recorder.assert_file_created("task-1", str(path))
+        path.unlink()
+        recorder.assert_file_deleted("task-1", str(path))
+        recorder.flush()
+
+        conn = sqlite3.connect(str(test_db))
+        results = conn.execute(
+            "SELECT category, result FROM assertion_results ORDER BY rowid"
+        ).fetchall()
+        conn.close()
+        assert results == [("file_created", "pass"), ("file_deleted", "pass")]
@@ -22,6 +22,8 @@ from database.init_db import (
     verify_schema,
     get_connection,
     transaction,
+    fetch_one,
+    fetch_all,
     DatabaseConnection,
     ensure_initialized
 )
@@ -35,7 +37,7 @@ from database.queries import (
     SubscriptionQueries, FileLockQueries,
     KnowledgeQueries, DecisionQueries,
     ComponentHealthQueries, AlertQueries,
-    generate_id, now_iso
+    generate_id, now_iso, clear_query_cache
 )
 
 
@@ -125,6 +127,50 @@ class TestSchemaInitialization:
             assert row is None
 
 
+    def test_ensure_initialized_switches_existing_db_to_wal(self, temp_db):
+        """Verify a database created without WAL is switched on first use."""
+        import sqlite3
+
+        conn = sqlite3.connect(str(temp_db))
+        conn.execute("PRAGMA journal_mode = DELETE")
+        conn.close()
+
+        assert ensure_initialized(temp_db)
+
+        with get_connection(temp_db) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            # synchronous=NORMAL is per connection
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+    def test_ensure_initialized_applies_schema_indexes(self, temp_db):
+        """Verify an existing database gains new indexes/triggers and loses dropped ones."""
+        import sqlite3
+
+        conn = sqlite3.connect(str(temp_db))
+        conn.execute("DROP INDEX idx_events_correlation_timestamp")
+        conn.execute("CREATE INDEX idx_events_correlation ON events(correlation_id)")
+        conn.execute("DROP TRIGGER file_locks_publish_insert")
+        conn.execute(
+            "CREATE TRIGGER file_locks_publish_update AFTER UPDATE ON file_locks "
+            "BEGIN SELECT 1; END"
+        )
+        conn.commit()
+        conn.close()
+
+        assert ensure_initialized(temp_db)
+
+        with get_connection(temp_db) as conn:
+            objects = {
+                row[0] for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger')"
+                )
+            }
+        assert "file_locks_publish_insert" in objects
+        assert "idx_events_correlation_timestamp" in objects
+        assert "idx_events_correlation" not in objects
+        assert "file_locks_publish_update" not in objects
+
+
 # ============================================================================
 # Connection Tests
 # ============================================================================
@@ -150,6 +196,31 @@ class TestConnections:
             assert row["id"] == "test"
             assert row["name"] == "Test"
 
+    def test_readonly_connection_rejects_writes(self, temp_db):
+        """Verify readonly connections can read but never write."""
+        import sqlite3
+
+        with get_connection(temp_db, readonly=True) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM loops").fetchone()[0] == 0
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute(
+                    "INSERT INTO loops (id, name, priority) VALUES (?, ?, ?)",
+                    ("test", "Test", 1)
+                )
+
+    def test_fetch_helpers_see_later_writes(self, temp_db):
+        """Verify the reused read connection observes commits made elsewhere."""
+        assert fetch_one("SELECT * FROM loops WHERE id = ?", ("test",), temp_db) is None
+
+        with transaction(temp_db) as conn:
+            conn.execute(
+                "INSERT INTO loops (id, name, priority) VALUES (?, ?, ?)",
+                ("test", "Test", 1)
+            )
+
+        assert fetch_one("SELECT * FROM loops WHERE id = ?", ("test",), temp_db)["name"] == "Test"
+        assert len(fetch_all("SELECT * FROM loops", db_path=temp_db)) == 1
+
     def test_transaction_commits_on_success(self, temp_db):
         """Verify transaction commits on success."""
         with transaction(temp_db) as conn:
@@ -198,6 +269,23 @@ class TestConnections:
             db.close()
 
 
+# ============================================================================
+# ID Tests
+# ============================================================================
+
+class TestIds:
+    """Tests for generated record IDs."""
+
+    def test_generate_id_is_compact_uuid(self):
+        """Verify IDs are unique 32-char hex UUIDs."""
+        import uuid
+
+        first, second = generate_id(), generate_id()
+        assert first != second
+        assert len(first) == 32
+        assert uuid.UUID(first).hex == first
+
+
 # ============================================================================
 # Model Tests
 # ============================================================================
@@ -266,6 +354,14 @@ class TestModels:
         assert event2.payload == {"test_id": "TEST-001"}
         assert event2.acknowledged is True
 
+    def test_json_columns_decoded_by_models_only(self, temp_db):
+        """Verify raw SQL sees JSON columns as text; models decode them."""
+        EventQueries.publish("loop-1", "test_started", {"n": 1}, db_path=temp_db)
+        with get_connection(temp_db) as conn:
+            row = conn.execute("SELECT * FROM events").fetchone()
+        assert json.loads(row["payload"]) == {"n": 1}
+        assert Event.from_row(dict(row)).payload == {"n": 1}
+
     def test_file_lock_expiry_check(self):
         """Verify FileLock.is_expired() works correctly."""
         # Not expired
@@ -302,6 +398,27 @@ class TestLoopQueries:
         assert retrieved.id == sample_loop.id
         assert retrieved.name == sample_loop.name
 
+    def test_reregister_updates_in_place(self, temp_db, sample_loop, sample_test):
+        """Verify re-registering a loop updates the row instead of replacing it."""
+        LoopQueries.register(sample_loop, temp_db)
+        TestQueries.register(sample_test, temp_db)
+        with get_connection(temp_db) as conn:
+            before = conn.execute(
+                "SELECT rowid, created_at FROM loops WHERE id = ?", (sample_loop.id,)
+            ).fetchone()
+
+        sample_loop.name = "Renamed Loop"
+        LoopQueries.register(sample_loop, temp_db)
+
+        with get_connection(temp_db) as conn:
+            after = conn.execute(
+                "SELECT rowid, created_at, name FROM loops WHERE id = ?", (sample_loop.id,)
+            ).fetchone()
+        assert after["rowid"] == before["rowid"]
+        assert after["created_at"] == before["created_at"]
+        assert after["name"] == "Renamed Loop"
+        assert TestQueries.get_by_id(sample_test.id, temp_db) is not None
+
     def test_get_all_loops(self, temp_db):
         """Verify getting all loops ordered by priority."""
         loop1 = Loop(id="loop-1", name="Loop 1", priority=2)
@@ -341,6 +458,31 @@ class TestLoopQueries:
         assert len(running) == 1
         assert running[0].id == "loop-1"
 
+    def test_get_by_id_cache_invalidated_on_write(self, temp_db, sample_loop):
+        """Verify cached lookups are refreshed by writes through LoopQueries."""
+        LoopQueries.register(sample_loop, temp_db)
+        assert LoopQueries.get_by_id(sample_loop.id, temp_db).branch is None
+        assert LoopQueries.get_running(temp_db) == []
+
+        LoopQueries.set_branch(sample_loop.id, "loop/feature", temp_db)
+        LoopQueries.update_status(sample_loop.id, LoopStatus.RUNNING.value, db_path=temp_db)
+
+        assert LoopQueries.get_by_id(sample_loop.id, temp_db).branch == "loop/feature"
+        assert [l.id for l in LoopQueries.get_running(temp_db)] == [sample_loop.id]
+
+    def test_get_by_id_cache_serves_repeat_lookups(self, temp_db, sample_loop):
+        """Verify repeat lookups within the TTL skip the database."""
+        LoopQueries.register(sample_loop, temp_db)
+        first = LoopQueries.get_by_id(sample_loop.id, temp_db)
+
+        # Out-of-band write is not seen until the cache is cleared
+        with transaction(temp_db) as conn:
+            conn.execute("UPDATE loops SET name = ? WHERE id = ?", ("Renamed", sample_loop.id))
+        assert LoopQueries.get_by_id(sample_loop.id, temp_db).name == first.name
+
+        clear_query_cache()
+        assert LoopQueries.get_by_id(sample_loop.id, temp_db).name == "Renamed"
+
 
 # ============================================================================
 # Query Tests - Tests
@@ -400,6 +542,23 @@ class TestTestQueries:
         count = TestQueries.increment_attempts(sample_test.id, temp_db)
         assert count == 2
 
+    def test_get_by_status(self, temp_db, sample_loop):
+        """Verify status lookups with and without a loop filter."""
+        LoopQueries.register(sample_loop, temp_db)
+        LoopQueries.register(Loop(id="loop-2", name="Loop 2"), temp_db)
+        TestQueries.register(Test(id="TEST-001", loop_id=sample_loop.id, category="unit"), temp_db)
+        TestQueries.register(Test(id="TEST-002", loop_id="loop-2", category="unit"), temp_db)
+
+        pending = TestQueries.get_by_status(TestStatus.PENDING.value, db_path=temp_db)
+        assert sorted(t.id for t in pending) == ["TEST-001", "TEST-002"]
+
+        pending = TestQueries.get_by_status(TestStatus.PENDING.value, "loop-2", temp_db)
+        assert [t.id for t in pending] == ["TEST-002"]
+
+    def test_increment_attempts_unknown_test(self, temp_db):
+        """Verify incrementing a missing test returns 0."""
+        assert TestQueries.increment_attempts("NO-SUCH-TEST", temp_db) == 0
+
     def test_get_summary(self, temp_db, sample_loop):
         """Verify summary generation."""
         LoopQueries.register(sample_loop, temp_db)
@@ -417,6 +576,29 @@ class TestTestQueries:
         assert summary.get("passed", 0) == 1
         assert summary.get("pending", 0) == 2
 
+    def test_get_summary_empty(self, temp_db):
+        """Verify summary of an empty table still reports a total."""
+        assert TestQueries.get_summary(db_path=temp_db) == {"total": 0}
+
+    def test_get_summary_all_loops(self, temp_db):
+        """Verify per-loop summaries match individual get_summary calls."""
+        LoopQueries.register(Loop(id="loop-1", name="Loop 1"), temp_db)
+        LoopQueries.register(Loop(id="loop-2", name="Loop 2"), temp_db)
+        tests = [
+            Test(id="TEST-001", loop_id="loop-1", category="unit", status=TestStatus.PASSED.value),
+            Test(id="TEST-002", loop_id="loop-1", category="unit"),
+            Test(id="TEST-003", loop_id="loop-2", category="unit", status=TestStatus.FAILED.value),
+        ]
+        for test in tests:
+            TestQueries.register(test, temp_db)
+
+        summaries = TestQueries.get_summary_all_loops(temp_db)
+        assert summaries == {
+            "loop-1": TestQueries.get_summary("loop-1", temp_db),
+            "loop-2": TestQueries.get_summary("loop-2", temp_db),
+        }
+        assert summaries["loop-1"] == {"total": 2, "passed": 1, "pending": 1}
+
 
 # ============================================================================
 # Query Tests - Events
@@ -466,6 +648,52 @@ class TestEventQueries:
         assert len(events) == 1
         assert events[0].event_type == "test_started"
 
+    def test_poll_applies_source_filter_per_subscription(self, temp_db):
+        """Verify each subscription's source filter only applies to its own types."""
+        SubscriptionQueries.subscribe(
+            subscriber="monitor",
+            event_types=["test_started"],
+            filter_sources=["loop-1"],
+            db_path=temp_db
+        )
+        SubscriptionQueries.subscribe(
+            subscriber="monitor",
+            event_types=["test_passed"],
+            db_path=temp_db
+        )
+
+        EventQueries.publish("loop-1", "test_started", {}, db_path=temp_db)
+        EventQueries.publish("loop-2", "test_started", {}, db_path=temp_db)
+        EventQueries.publish("loop-2", "test_passed", {}, db_path=temp_db)
+
+        events = EventQueries.poll("monitor", db_path=temp_db)
+        assert sorted((e.source, e.event_type) for e in events) == [
+            ("loop-1", "test_started"),
+            ("loop-2", "test_passed"),
+        ]
+
+    def test_poll_batches_last_poll_at(self, temp_db):
+        """Verify last_poll_at is written on first poll, then batched until flushed."""
+        sub_id = SubscriptionQueries.subscribe(
+            subscriber="monitor", event_types=["test_started"], db_path=temp_db
+        )
+
+        def last_poll_at():
+            with get_connection(temp_db) as conn:
+                return conn.execute(
+                    "SELECT last_poll_at FROM subscriptions WHERE id = ?", (sub_id,)
+                ).fetchone()[0]
+
+        EventQueries.poll("monitor", db_path=temp_db)
+        first = last_poll_at()
+        assert first is not None
+
+        EventQueries.poll("monitor", db_path=temp_db)
+        assert last_poll_at() == first
+
+        assert EventQueries.flush_poll_times(temp_db) == 1
+        assert last_poll_at() > first
+
     def test_acknowledge_event(self, temp_db):
         """Verify event acknowledgement."""
         # Subscribe and publish
@@ -506,6 +734,21 @@ class TestEventQueries:
         timeline = EventQueries.get_timeline(types=["test_passed"], db_path=temp_db)
         assert len(timeline) == 1
 
+        # Filter by both
+        timeline = EventQueries.get_timeline(
+            sources=["loop-1"], types=["test_failed"], db_path=temp_db
+        )
+        assert [e.payload["id"] for e in timeline] == [3]
+
+    def test_get_timeline_long_filter_list(self, temp_db):
+        """Verify filters longer than the inline limit are still applied."""
+        EventQueries.publish("loop-1", "test_started", {}, db_path=temp_db)
+        EventQueries.publish("loop-2", "test_started", {}, db_path=temp_db)
+
+        sources = ["loop-1"] + [f"other-{i}" for i in range(20)]
+        timeline = EventQueries.get_timeline(sources=sources, db_path=temp_db)
+        assert [e.source for e in timeline] == ["loop-1"]
+
 
 # ============================================================================
 # Query Tests - File Locks
@@ -540,6 +783,37 @@ class TestFileLockQueries:
         acquired = FileLockQueries.acquire("/test/file.ts", "loop-1", db_path=temp_db)
         assert acquired is True
 
+    def test_expiry_formatted_like_now_iso(self, temp_db, monkeypatch):
+        """Verify expires_at keeps microseconds on a whole second, like now_iso."""
+        import time
+        monkeypatch.setattr(time, "time_ns", lambda: 1_800_000_000 * 1_000_000_000)
+
+        FileLockQueries.acquire("/test/file.ts", "loop-1", ttl_seconds=60, db_path=temp_db)
+
+        lock = FileLockQueries.check("/test/file.ts", temp_db)
+        assert lock.locked_at == "2027-01-15T08:00:00.000000+00:00"
+        assert lock.expires_at == "2027-01-15T08:01:00.000000+00:00"
+        assert now_iso(-1) == "2027-01-15T07:59:59.000000+00:00"
+
+    def test_acquire_expired_lock(self, temp_db):
+        """Verify an expired lock can be taken over by another owner."""
+        with transaction(temp_db) as conn:
+            expired_at = (datetime.utcnow() - timedelta(seconds=1)).isoformat()
+            conn.execute(
+                """INSERT INTO file_locks (file_path, locked_by, locked_at, expires_at)
+                   VALUES (?, ?, ?, ?)""",
+                ("/test/file.ts", "loop-1", now_iso(), expired_at)
+            )
+
+        acquired = FileLockQueries.acquire(
+            "/test/file.ts", "loop-2", reason="Takeover", db_path=temp_db
+        )
+        assert acquired is True
+
+        lock = FileLockQueries.check("/test/file.ts", temp_db)
+        assert lock.locked_by == "loop-2"
+        assert lock.lock_reason == "Takeover"
+
     def test_release_lock(self, temp_db):
         """Verify lock release."""
         FileLockQueries.acquire("/test/file.ts", "loop-1", db_path=temp_db)
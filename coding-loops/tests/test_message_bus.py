@@ -140,6 +140,19 @@ class TestBUS001PublishEvent:
             event = bus.get_event(event_id)
             assert event is not None
 
+    def test_publish_batch_optional_fields(self, bus):
+        """Verify batch publishing keeps priority, correlation and defaults."""
+        event_ids = bus.publish_batch([
+            {"source": "loop-1", "event_type": "a", "payload": {"n": 1},
+             "priority": 1, "correlation_id": "corr-1"},
+            {"source": "loop-1", "event_type": "b", "payload": {}},
+        ])
+
+        first, second = (bus.get_event(i) for i in event_ids)
+        assert (first.priority, first.correlation_id, first.payload) == (1, "corr-1", {"n": 1})
+        assert (second.priority, second.correlation_id) == (5, None)
+        assert second.acknowledged is False
+
 
 # ============================================================================
 # BUS-002: Subscribe to Events
@@ -181,6 +194,41 @@ class TestBUS002SubscribeToEvents:
         assert len(events) == 2
         assert all(e.event_type == "test_started" for e in events)
 
+    def test_poll_event_types_filter_applies_before_limit(self, bus):
+        """Verify event_types narrows the query, so limit counts matches only."""
+        bus.subscribe("monitor", ["test_started", "test_passed"])
+
+        for i in range(3):
+            bus.publish("loop-1", "test_started", {"id": i})
+        bus.publish("loop-1", "test_passed", {"id": 3})
+
+        events = bus.poll("monitor", limit=1, event_types=["test_passed"])
+
+        assert [e.payload["id"] for e in events] == [3]
+
+    def test_poll_blocking_wakes_on_publish(self, bus):
+        """Verify poll_blocking returns as soon as another thread publishes."""
+        bus.subscribe("monitor", ["test_started"])
+
+        timer = threading.Timer(
+            0.1, bus.publish, args=("loop-1", "test_started", {"id": 1})
+        )
+        timer.start()
+        start = time.monotonic()
+        events = bus.poll_blocking("monitor", timeout=5.0)
+        timer.join()
+
+        assert [e.payload["id"] for e in events] == [1]
+        assert time.monotonic() - start < 2.0
+
+    def test_poll_blocking_times_out_empty(self, bus):
+        """Verify poll_blocking returns an empty list after the timeout."""
+        bus.subscribe("monitor", ["test_started"])
+
+        start = time.monotonic()
+        assert bus.poll_blocking("monitor", timeout=0.1) == []
+        assert time.monotonic() - start >= 0.1
+
     def test_poll_respects_source_filter(self, bus):
         """Verify source filtering works."""
         bus.subscribe("monitor", ["test_started"], filter_sources=["loop-1"])
@@ -191,9 +239,8 @@ class TestBUS002SubscribeToEvents:
 
         events = bus.poll("monitor")
 
-        # Note: Current implementation doesn't filter by source in poll
-        # This is acceptable - filtering can be done at application level
-        assert len(events) >= 2
+        assert len(events) == 2
+        assert all(e.source == "loop-1" for e in events)
 
     def test_unsubscribe_deactivates(self, bus, temp_db):
         """Verify unsubscribe deactivates the subscription."""
@@ -424,6 +471,35 @@ class TestBUS005FileLocking:
         assert len(locks) == 2
         assert all(l.locked_by == "loop-1" for l in locks)
 
+    def test_lock_publishes_event(self, bus):
+        """Verify taking or renewing a lock publishes one file_locked event."""
+        bus.lock_file("/test/file.ts", "loop-1", reason="edit", ttl_seconds=60, test_id="T-1")
+        bus.lock_file("/test/file.ts", "loop-2")  # denied, no event
+        bus.lock_file("/test/file.ts", "loop-1")  # renewed
+
+        events = bus.get_timeline(types=["file_locked"])
+
+        assert len(events) == 2
+        assert {e.source for e in events} == {"loop-1"}
+        assert {
+            "file_path": "/test/file.ts",
+            "reason": "edit",
+            "ttl_seconds": 60,
+            "test_id": "T-1",
+        } in [e.payload for e in events]
+
+    def test_lock_update_does_not_publish(self, bus, temp_db):
+        """Verify changing a held lock's reason or expiry publishes nothing."""
+        bus.lock_file("/test/file.ts", "loop-1", reason="edit")
+        with transaction(temp_db) as conn:
+            conn.execute(
+                """UPDATE file_locks SET lock_reason = 'review', expires_at = ?
+                   WHERE file_path = '/test/file.ts'""",
+                ((datetime.now(timezone.utc) + timedelta(hours=1)).isoformat(),)
+            )
+
+        assert len(bus.get_timeline(types=["file_locked"])) == 1
+
 
 # ============================================================================
 # BUS-006: Lock Expiry
@@ -492,6 +568,47 @@ class TestBUS006LockExpiry:
 
         assert count == 3
 
+    def test_expired_locks_hidden_before_cleanup(self, bus, temp_db):
+        """Verify get_locks and get_stats skip expired locks not yet released."""
+        bus.lock_file("/test/live.ts", "loop-1")
+        with transaction(temp_db) as conn:
+            expired_at = (
+                datetime.now(timezone.utc) - timedelta(seconds=10)
+            ).isoformat()
+            conn.execute(
+                """INSERT INTO file_locks
+                   (file_path, locked_by, locked_at, expires_at)
+                   VALUES (?, ?, ?, ?)""",
+                ("/test/stale.ts", "loop-1", expired_at, expired_at)
+            )
+
+        assert [l.file_path for l in bus.get_locks()] == ["/test/live.ts"]
+        assert [l.file_path for l in bus.get_locks(locked_by="loop-1")] == ["/test/live.ts"]
+        assert bus.get_stats()["locks"]["active"] == 1
+
+    def test_cleanup_removes_expired_locks_and_old_events(self, bus, temp_db):
+        """Verify cleanup releases expired locks in its own transaction."""
+        bus.lock_file("/test/live.ts", "loop-1")
+        bus.subscribe("test", ["event"])
+        bus.acknowledge(bus.publish("source", "event", {}), "test")
+        with transaction(temp_db) as conn:
+            long_ago = (
+                datetime.now(timezone.utc) - timedelta(hours=48)
+            ).isoformat()
+            conn.execute("UPDATE events SET timestamp = ?", (long_ago,))
+            conn.execute(
+                """INSERT INTO file_locks
+                   (file_path, locked_by, locked_at, expires_at)
+                   VALUES (?, ?, ?, ?)""",
+                ("/test/stale.ts", "loop-1", long_ago, long_ago)
+            )
+
+        result = bus.cleanup(older_than_hours=24)
+
+        assert result["locks_removed"] == 1
+        assert result["events_removed"] == 1
+        assert [l.file_path for l in bus.get_locks()] == ["/test/live.ts"]
+
 
 # ============================================================================
 # BUS-007: Concurrent Access
@@ -696,6 +813,22 @@ class TestBUS008Integration:
         assert stats["events"]["pending"] == 5
         assert stats["subscriptions"]["active"] == 1
 
+    def test_stats_cache_invalidated_by_writes(self, bus, temp_db):
+        """Verify cached stats are refreshed by writes through the bus only."""
+        bus.publish("source", "event", {})
+        assert bus.get_stats()["events"]["total"] == 1
+
+        # Written behind the bus's back: served from cache until it expires
+        with transaction(temp_db) as conn:
+            conn.execute(
+                """INSERT INTO events (id, timestamp, source, event_type, payload)
+                   VALUES ('external', '2024-01-01T00:00:00+00:00', 'x', 'event', '{}')"""
+            )
+        assert bus.get_stats()["events"]["total"] == 1
+
+        bus.publish("source", "event", {})
+        assert bus.get_stats()["events"]["total"] == 3
+
 
 # ============================================================================
 # Additional Edge Cases
@@ -0,0 +1,133 @@
+# coding-loops/tests/test_observability_api.py
+"""
+Tests for heartbeat batching in the observability API client.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from shared import observability_api
+
+
+class FakeAPI:
+    """Records requests instead of sending them, or fails them."""
+
+    def __init__(self):
+        self.sent = []
+        self.fail = False
+
+    def request(self, method, path, json_data=None, **kwargs):
+        if self.fail:
+            raise ConnectionError("API down")
+        self.sent.append((method, path, json_data))
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """Fake API with fresh heartbeat state; tests flush explicitly."""
+    api = FakeAPI()
+    monkeypatch.setattr(observability_api, "_api_request", api.request)
+    monkeypatch.setattr(observability_api, "_pending_heartbeats", {})
+    monkeypatch.setattr(observability_api, "_last_heartbeats", {})
+    # Any non-None value stops record_heartbeat() starting the flusher
+    monkeypatch.setattr(observability_api, "_heartbeat_flusher", object())
+    return api
+
+
+class TestHeartbeats:
+    """Tests for queued heartbeats."""
+
+    def test_latest_pending_heartbeat_wins(self, api):
+        observability_api.record_heartbeat("exec-1", "agent-1", metadata={"step": 1})
+        observability_api.record_heartbeat("exec-1", "agent-1", metadata={"step": 2})
+        observability_api.record_heartbeat("exec-1", "agent-2", status="idle")
+        observability_api.flush_heartbeats()
+
+        assert len(api.sent) == 2
+        by_instance = {body["instanceId"]: body for _, _, body in api.sent}
+        assert by_instance["agent-1"]["metadata"] == {"step": 2}
+        assert by_instance["agent-2"]["status"] == "idle"
+        assert {path for _, path, _ in api.sent} == {"/executions/exec-1/heartbeat"}
+
+    def test_unchanged_heartbeat_skipped_until_keepalive(self, api, monkeypatch):
+        observability_api.record_heartbeat("exec-1", "agent-1", metadata={"step": 1})
+        observability_api.flush_heartbeats()
+        observability_api.record_heartbeat("exec-1", "agent-1", metadata={"step": 1})
+        observability_api.flush_heartbeats()
+        assert len(api.sent) == 1
+
+        # A change is sent at once
+        observability_api.record_heartbeat("exec-1", "agent-1", metadata={"step": 2})
+        observability_api.flush_heartbeats()
+        assert len(api.sent) == 2
+
+        # An unchanged one once HEARTBEAT_MAX_INTERVAL has passed
+        monkeypatch.setattr(observability_api, "HEARTBEAT_MAX_INTERVAL", 0)
+        observability_api.record_heartbeat("exec-1", "agent-1", metadata={"step": 2})
+        observability_api.flush_heartbeats()
+        assert len(api.sent) == 3
+
+    def test_failed_heartbeat_resent(self, api):
+        api.fail = True
+        observability_api.record_heartbeat("exec-1", "agent-1", metadata={"step": 1})
+        observability_api.flush_heartbeats()
+        assert api.sent == []
+
+        # Not recorded as sent, so the same heartbeat is not skipped
+        api.fail = False
+        observability_api.record_heartbeat("exec-1", "agent-1", metadata={"step": 1})
+        observability_api.flush_heartbeats()
+        assert len(api.sent) == 1
+
+    def test_pending_heartbeat_sent_at_exit(self):
+        script = """
+from shared import observability_api
+
+def fake_api_request(method, path, json_data=None, **kwargs):
+    print(method, path, json_data["metadata"]["step"])
+
+observability_api._api_request = fake_api_request
+observability_api.record_heartbeat("exec-1", "agent-1", metadata={"step": 7})
+"""
+        env = dict(os.environ, OBSERVABILITY_HEARTBEAT_INTERVAL="3600")
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=Path(__file__).parent.parent,
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=30,
+            check=True
+        )
+
+        assert result.stdout.splitlines() == ["POST /executions/exec-1/heartbeat 7"]
+
+    def test_idle_flusher_does_not_poll(self):
+        script = """
+import time
+from shared import observability_api
+
+flushes = []
+send = observability_api.flush_heartbeats
+observability_api.flush_heartbeats = lambda: (flushes.append(1), send())
+observability_api._api_request = lambda *args, **kwargs: None
+observability_api.record_heartbeat("exec-1", "agent-1")
+time.sleep(1)
+print(len(flushes))
+"""
+        env = dict(os.environ, OBSERVABILITY_HEARTBEAT_INTERVAL="0.05")
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=Path(__file__).parent.parent,
+            env=env,
+            capture_output=True,
+            text=True,
+            timeout=30,
+            check=True
+        )
+
+        assert result.stdout.splitlines() == ["1"]
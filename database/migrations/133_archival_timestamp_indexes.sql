@@ -0,0 +1,8 @@
+-- 133_archival_timestamp_indexes.sql
+-- Index the timestamp column each archival retention policy filters on.
+-- The other observability tables already index theirs in 087; assertion_chains
+-- is archived by created_at, which had no index.
+
+CREATE INDEX IF NOT EXISTS idx_chain_created ON assertion_chains(created_at);
+
+ANALYZE assertion_chains;